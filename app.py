@@ -1,7 +1,28 @@
+import importlib
+import base64
 import streamlit as st
 from streamlit_option_menu import option_menu
-from views import upload_process, roi_summary, visualizations, roi_explorer, business_roi, forecast, home, settings
-import base64
+
+# View registry: module name -> (sidebar label, icon). Each view module is
+# imported on first navigation, so the login page never loads chart or PDF libraries.
+VIEWS = {
+    "home": ("Home", "house"),
+    "settings": ("Settings", "gear"),
+    "upload_process": ("Upload & Process", "cloud-upload"),
+    "roi_summary": ("ROI Summary", "bar-chart-line"),
+    "visualizations": ("Visualizations", "pie-chart"),
+    "roi_explorer": ("ROI Explorer", "table"),
+    "business_roi": ("Business ROI", "briefcase"),
+    "forecast": ("Forecast", "graph-up"),
+    "history": ("History", "clock-history"),
+    "compare": ("Compare Runs", "arrow-left-right"),
+}
+
+def load_view(name):
+    """Import a view module on first use; later reruns get it from the module cache."""
+    if name not in VIEWS:
+        name = "home"  # Default to home if view not recognized
+    return importlib.import_module(f"views.{name}")
 
 # First, check if session_state exists before trying to access it
 if 'is_logged_in' not in st.session_state:
@@ -19,406 +40,22 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Always expanded
 )
 
-# ✅ Define the SVG logo
-def get_svg_base64():
-    svg_code = '''<svg viewBox="0 0 120 80" xmlns="http://www.w3.org/2000/svg">
-  <!-- Background (transparent) -->
-  <rect x="0" y="0" width="120" height="80" fill="white" opacity="0" />
-  
-  <!-- Logo Group -->
-  <g transform="translate(10, 10)">
-    <!-- Graphs with gradient fills -->
-    <defs>
-      <linearGradient id="greenGrad" x1="0%" y1="0%" x2="0%" y2="100%">
-        <stop offset="0%" stop-color="#4CAF50" />
-        <stop offset="100%" stop-color="#2E7D32" />
-      </linearGradient>
-      <linearGradient id="blueGrad" x1="0%" y1="0%" x2="0%" y2="100%">
-        <stop offset="0%" stop-color="#1976D2" />
-        <stop offset="100%" stop-color="#0D47A1" />
-      </linearGradient>
-      <linearGradient id="redGrad" x1="0%" y1="0%" x2="0%" y2="100%">
-        <stop offset="0%" stop-color="#E91E63" />
-        <stop offset="100%" stop-color="#AD1457" />
-      </linearGradient>
-    </defs>
-    
-    <!-- Bar Chart -->
-    <g>
-      <!-- Bar 1 (Green) -->
-      <rect x="0" y="25" width="14" height="35" rx="2" ry="2" fill="url(#greenGrad)" />
-      
-      <!-- Bar 2 (Red/Pink) -->
-      <rect x="20" y="40" width="14" height="20" rx="2" ry="2" fill="url(#redGrad)" />
-      
-      <!-- Bar 3 (Blue) -->
-      <rect x="40" y="15" width="14" height="45" rx="2" ry="2" fill="url(#blueGrad)" />
-      
-      <!-- Baseline -->
-      <line x1="0" y1="60" x2="54" y2="60" stroke="#444" stroke-width="2" />
-    </g>
-    
-    <!-- Turbo Effect (Speed Lines) -->
-    <g opacity="0.85">
-      <path d="M65,22 C72,22 72,15 79,15" stroke="#1976D2" stroke-width="2.5" stroke-linecap="round" fill="none" />
-      <path d="M65,32 C72,32 72,25 79,25" stroke="#1976D2" stroke-width="2.5" stroke-linecap="round" fill="none" />
-      <path d="M65,42 C72,42 72,35 79,35" stroke="#1976D2" stroke-width="2.5" stroke-linecap="round" fill="none" />
-    </g>
-    
-    <!-- Upward trending arrow -->
-    <g transform="translate(75, 30)">
-      <circle cx="0" cy="0" r="15" fill="#FFFFFF" opacity="0.5" />
-      <path d="M-8,8 L0,-8 L8,8 M0,-8 L0,15" stroke="#1976D2" stroke-width="3" stroke-linecap="round" stroke-linejoin="round" fill="none" />
-    </g>
-    
-    <!-- ROI text embedded in the design -->
-    <g transform="translate(85, 55)">
-      <rect x="-15" y="-12" width="30" height="24" rx="4" ry="4" fill="#1976D2" opacity="0.9" />
-      <text x="0" y="5" font-family="Arial, sans-serif" font-weight="bold" font-size="14" text-anchor="middle" fill="white">ROI</text>
-    </g>
-  </g>
-</svg>'''
-    
-    # Convert to base64
-    b64 = base64.b64encode(svg_code.encode("utf-8")).decode("utf-8")
+# ✅ Static assets, read and encoded once per process
+@st.cache_resource(show_spinner=False)
+def load_logo_data_uri(path="assets/logo.svg"):
+    with open(path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode("utf-8")
     return f"data:image/svg+xml;base64,{b64}"
 
-# Get the base64 encoded SVG
-logo_b64 = get_svg_base64()
-
-# ✅ Load styles - Add custom CSS directly
-st.markdown("""
-<style>
-/* Hide Streamlit defaults */
-header {visibility: hidden;}
-footer {visibility: hidden;}
-#MainMenu {visibility: hidden;}
-
-/* Remove extra whitespace */
-.block-container {
-    padding-top: 1rem !important;
-    max-width: 1200px !important;
-}
-
-/* Remove extra padding in Streamlit elements */
-.stHorizontalBlock {
-    padding-top: 0 !important;
-    gap: 1.5rem !important;
-}
-
-/* Fix title duplication */
-h1:first-of-type {
-    visibility: hidden;
-    height: 0;
-    margin: 0;
-    padding: 0;
-}
-
-/* Custom page title */
-.page-title {
-    font-size: 2rem;
-    font-weight: 600;
-    color: #333;
-    margin-bottom: 1.5rem;
-    padding-top: 1rem;
-}
-
-/* Main headers */
-.main-header {
-    color: #333;
-    font-size: 2.2rem;
-    font-weight: 600;
-    margin-bottom: 0.2rem;
-    margin-top: 0.5rem;
-    display: inline-block;
-    vertical-align: middle;
-}
-
-.sub-header {
-    color: #546E7A;
-    font-size: 1rem;
-    margin-bottom: 2.5rem;
-}
-
-/* Benefits Cards */
-.benefits-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fill, minmax(180px, 1fr));
-    gap: 1rem;
-    margin-top: 1.5rem;
-}
-
-.benefit-card {
-    background: white;
-    padding: 1.2rem;
-    border-radius: 8px;
-    border: 1px solid #e0e0e0;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    transition: transform 0.2s ease, box-shadow 0.2s ease;
-    height: 100%;
-}
-
-.benefit-card:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-}
-
-.benefit-card h3 {
-    font-size: 1.1rem;
-    margin-bottom: 0.7rem;
-    color: #333;
-    font-weight: 500;
-}
-
-.benefit-card p {
-    font-size: 0.9rem;
-    color: #546E7A;
-    line-height: 1.4;
-}
-
-/* Card styling */
-.intro-card, .step-card, .insight-card {
-    background: white;
-    padding: 1.2rem;
-    border-radius: 8px;
-    border: 1px solid #e0e0e0;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    margin-bottom: 1rem;
-}
-
-.section-header {
-    font-size: 1.3rem;
-    font-weight: 600;
-    color: #1976D2;
-    margin: 1.5rem 0 1rem;
-    padding-bottom: 0.5rem;
-    border-bottom: 1px solid #e0e0e0;
-}
-
-/* Step cards for homepage */
-.step-card {
-    height: 100%;
-    position: relative;
-    padding-bottom: 4rem;
-}
-
-.step-number {
-    display: inline-block;
-    width: 30px;
-    height: 30px;
-    background-color: #1976D2;
-    color: white;
-    border-radius: 50%;
-    text-align: center;
-    line-height: 30px;
-    font-weight: bold;
-    margin-bottom: 0.5rem;
-}
-
-.card-button {
-    position: absolute;
-    bottom: 1.2rem;
-    left: 1.2rem;
-    right: 1.2rem;
-    background-color: #E3F2FD;
-    color: #1976D2;
-    padding: 0.5rem 1rem;
-    border-radius: 6px;
-    text-align: center;
-    cursor: pointer;
-    font-weight: 500;
-    transition: all 0.2s;
-}
-
-.card-button:hover {
-    background-color: #1976D2;
-    color: white;
-}
-
-.card-link {
-    text-decoration: none;
-}
-
-/* Settings summary */
-.settings-summary {
-    background: #f8f9fa;
-    border-radius: 8px;
-    padding: 1rem;
-    margin-bottom: 1rem;
-}
-
-.summary-item {
-    display: flex;
-    justify-content: space-between;
-    padding: 0.3rem 0;
-    border-bottom: 1px solid #e0e0e0;
-}
-
-.summary-item:last-child {
-    border-bottom: none;
-}
-
-/* Action buttons */
-.action-button {
-    background-color: #1976D2;
-    color: white;
-    padding: 0.8rem 1.2rem;
-    border-radius: 6px;
-    text-align: center;
-    font-weight: 500;
-    margin-bottom: 1rem;
-    cursor: pointer;
-    transition: all 0.2s;
-}
-
-.action-button:hover {
-    background-color: #1565C0;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.2);
-}
-
-.action-button.secondary {
-    background-color: #E3F2FD;
-    color: #1976D2;
-}
-
-.action-button.secondary:hover {
-    background-color: #BBDEFB;
-}
-
-.button-link {
-    text-decoration: none;
-    display: block;
-}
-
-/* Navigation button */
-.navigate-button {
-    display: inline-block;
-    background-color: #1976D2;
-    color: white;
-    padding: 0.5rem 1rem;
-    border-radius: 6px;
-    font-weight: 500;
-    cursor: pointer;
-}
-
-/* Welcome banner */
-.welcome-banner {
-    background: linear-gradient(to right, #E3F2FD, #BBDEFB);
-    padding: 1.5rem;
-    border-radius: 8px;
-    margin-bottom: 1.5rem;
-    border-left: 4px solid #1976D2;
-}
-
-.welcome-banner h2 {
-    color: #1976D2;
-    margin-top: 0;
-}
-
-/* Upload instruction */
-.upload-instruction {
-    background: #f8f9fa;
-    padding: 1rem;
-    border-radius: 8px;
-    margin-bottom: 1rem;
-}
+@st.cache_resource(show_spinner=False)
+def load_css(path="assets/app.css"):
+    with open(path, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
 
-/* Sign in section */
-.sign-in-header {
-    font-size: 1.3rem;
-    font-weight: 500;
-    margin-bottom: 1.5rem;
-    color: #1976D2;
-}
+logo_b64 = load_logo_data_uri()
 
-/* Blue separator */
-.blue-separator {
-    background-color: #1976D2;
-    width: 4px;
-    border-radius: 2px;
-    margin: 0 auto;
-}
-
-/* Footer */
-.custom-footer {
-    position: fixed;
-    bottom: 0;
-    left: 0;
-    right: 0;
-    text-align: center;
-    font-size: 0.85rem;
-    color: #90a4ae;
-    padding: 1rem 0;
-    background-color: white;
-    border-top: 1px solid #f0f0f0;
-}
-
-/* Main content area needs padding to avoid footer overlap */
-.main-content-area {
-    padding-bottom: 60px;
-}
-
-/* Logo styling */
-.logo-container {
-    display: flex;
-    align-items: center;
-    margin-bottom: 0.5rem;
-}
-
-.logo-img {
-    width: 75px;
-    height: 50px;
-    margin-right: 15px;
-}
-
-/* Sidebar logo styling */
-.sidebar-logo {
-    width: 70px;
-    margin: 1rem auto 1.5rem;
-    display: block;
-}
-
-/* Metrics styling */
-[data-testid="stMetricValue"] {
-    font-size: 1.5rem !important;
-    font-weight: 600 !important;
-    color: #1976D2 !important;
-}
-
-[data-testid="stMetricLabel"] {
-    font-size: 0.9rem !important;
-    font-weight: 500 !important;
-}
-
-/* Logout button styling */
-.logout-container {
-    padding: 1rem;
-    margin-top: 2rem;
-    border-top: 1px solid #e0e0e0;
-}
-
-.user-info {
-    font-size: 0.9rem;
-    color: #546E7A;
-    margin-bottom: 0.8rem;
-    display: flex;
-    align-items: center;
-}
-
-.user-avatar {
-    display: inline-flex;
-    width: 28px;
-    height: 28px;
-    background-color: #1976D2;
-    color: white;
-    border-radius: 50%;
-    align-items: center;
-    justify-content: center;
-    font-weight: 500;
-    margin-right: 0.7rem;
-}
-</style>
-""", unsafe_allow_html=True)
+# ✅ Load styles
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # ✅ Basic login check
 def check_login(username, password):
@@ -480,6 +117,7 @@ def render_login():
         if sign_in_button:
             if check_login(username, password):
                 st.session_state["is_logged_in"] = True
+                st.session_state["username"] = username
                 st.rerun()
             else:
                 st.error("❌ Invalid username or password")
@@ -498,38 +136,14 @@ def render_login():
 
 # ✅ App view after login with sidebar menu
 def render_logged_in_app():
-    # Map view names to their display names for the sidebar
-    view_display_names = {
-        "home": "Home",
-        "settings": "Settings",
-        "upload_process": "Upload & Process",
-        "roi_summary": "ROI Summary",
-        "visualizations": "Visualizations",
-        "roi_explorer": "ROI Explorer",
-        "business_roi": "Business ROI",
-        "forecast": "Forecast",
-    }
-    
-    # Map view names to their icons
-    view_icons = {
-        "home": "house",
-        "settings": "gear",
-        "upload_process": "cloud-upload",
-        "roi_summary": "bar-chart-line",
-        "visualizations": "pie-chart",
-        "roi_explorer": "table",
-        "business_roi": "briefcase",
-        "forecast": "graph-up",
-    }
-    
     with st.sidebar:
         # Add logo to sidebar
         st.markdown(f'<img src="{logo_b64}" alt="Turbo ROI Logo" class="sidebar-logo">', unsafe_allow_html=True)
         
         # Get all view names and their display names
-        view_names = list(view_display_names.keys())
-        display_names = [view_display_names[view] for view in view_names]
-        icons = [view_icons[view] for view in view_names]
+        view_names = list(VIEWS)
+        display_names = [VIEWS[view][0] for view in view_names]
+        icons = [VIEWS[view][1] for view in view_names]
         
         # Find index of current view
         try:
@@ -574,6 +188,10 @@ def render_logged_in_app():
             st.session_state['current_view'] = selected_view
             st.rerun()
         
+        # Dataset and version this session reads; imported here so the login page doesn't load pandas
+        from views.helpers import render_dataset_selector
+        render_dataset_selector()
+        
         # Add logout section to the bottom of the sidebar
         st.markdown("""
         <div class="logout-container">
@@ -593,26 +211,7 @@ def render_logged_in_app():
     st.markdown("<div class='main-content-area'>", unsafe_allow_html=True)
     
     # Route to the appropriate view
-    current_view = st.session_state['current_view']
-    if current_view == "home":
-        home.render()
-    elif current_view == "settings":
-        settings.render()
-    elif current_view == "upload_process":
-        upload_process.render()
-    elif current_view == "roi_summary":
-        roi_summary.render()
-    elif current_view == "visualizations":
-        visualizations.render()
-    elif current_view == "roi_explorer":
-        roi_explorer.render()
-    elif current_view == "business_roi":
-        business_roi.render()
-    elif current_view == "forecast":
-        forecast.render()
-    else:
-        # Default to home if view not recognized
-        home.render()
+    load_view(st.session_state['current_view']).render()
     
     st.markdown("</div>", unsafe_allow_html=True)
     
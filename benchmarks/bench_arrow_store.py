@@ -0,0 +1,68 @@
+"""Benchmark opening the processed dataset at 1M rows: CSV parse vs memory-mapped Arrow.
+
+Each reader runs in a fresh process, as a separate server process would, and
+reports the open time and resident memory after summing every numeric column
+and measuring every string column. For the Arrow file, most of that memory is
+file-backed page cache that all processes mapping the file share.
+
+    python benchmarks/bench_arrow_store.py [n_rows]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+
+from bench_exports import make_frame
+from views.arrow_store import read_arrow, write_arrow
+
+N_ROWS = 1_000_000
+
+def memory_mb():
+    """(resident, file-backed shared) memory of this process in MB."""
+    with open('/proc/self/statm') as f:
+        fields = f.read().split()
+    page = os.sysconf('SC_PAGE_SIZE') / 2**20
+    return int(fields[1]) * page, int(fields[2]) * page
+
+def touch(df):
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col].dtype):
+            df[col].sum()
+        else:
+            df[col].str.len().sum()
+
+def read(kind, path):
+    base, _ = memory_mb()
+    start = time.perf_counter()
+    df = pd.read_csv(path) if kind == 'csv' else read_arrow(path)
+    seconds = time.perf_counter() - start
+    touch(df)
+    resident, shared = memory_mb()
+    print(f"  {kind:6} open {seconds * 1000:9,.1f} ms   +{resident - base:5,.0f} MB resident ({shared:,.0f} MB file-backed)")
+
+def main():
+    if len(sys.argv) > 2:
+        read(sys.argv[1], sys.argv[2])
+        return
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    df = make_frame(n_rows)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'processed_data.csv')
+        arrow_file = os.path.join(directory, 'processed_data.arrow')
+        df.to_csv(csv_path, index=False)
+        start = time.perf_counter()
+        write_arrow(pd.read_csv(csv_path), arrow_file)
+        print(f"{n_rows:,} rows; one-off conversion {time.perf_counter() - start:.2f}s, "
+              f"CSV {os.path.getsize(csv_path) / 2**20:,.0f} MB, Arrow {os.path.getsize(arrow_file) / 2**20:,.0f} MB")
+        for kind, path in [('csv', csv_path), ('arrow', arrow_file)]:
+            subprocess.run([sys.executable, __file__, kind, path], check=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark the run-to-run diff of two 2M-row processed datasets.
+
+The later dataset drops a tenth of the earlier one's recommendations (resolved)
+and adds new ones, as consecutive exports do.
+
+    python benchmarks/bench_dataset_diff.py [n_rows]
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views.dataset_diff import diff_datasets, recommendation_keys
+
+N_ROWS = 2_000_000
+RESOLVED_SHARE = 0.10
+ADDED_SHARE = 0.05
+
+def make_frame(ids, seed):
+    rng = np.random.default_rng(seed)
+    locations = np.array(['AUH', 'DXB', 'AJM'] + [f'BD{i:02d}' for i in range(40)])
+    size = rng.gamma(2.0, 0.5, len(ids))
+    return pd.DataFrame({
+        'name': pd.array([f"vm-{i // 20:07d}" for i in ids], dtype='str'),
+        'file_name': pd.array([f"/datastore/{i % 20}/disk-{i:09d}.vmdk" for i in ids], dtype='str'),
+        'inferred_location': locations[ids % len(locations)],
+        'file_size_(gb)': size,
+        'storage_cost_usd': size * 1.8,
+        'net_savings_usd': size * 3.4
+    })
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    rng = np.random.default_rng(0)
+    old_ids = np.arange(n_rows)
+    kept = old_ids[rng.random(n_rows) >= RESOLVED_SHARE]
+    new_ids = np.concatenate([kept, np.arange(n_rows, n_rows + int(n_rows * ADDED_SHARE))])
+    old, new = make_frame(old_ids, 1), make_frame(rng.permutation(new_ids), 2)
+    print(f"{len(old):,} earlier rows, {len(new):,} later rows")
+
+    start = time.perf_counter()
+    recommendation_keys(old, new)
+    print(f"  keys                 {time.perf_counter() - start:6.2f}s")
+    start = time.perf_counter()
+    diff = diff_datasets(old, new)
+    print(f"  full diff            {time.perf_counter() - start:6.2f}s")
+    for status, totals in diff['totals'].items():
+        print(f"  {status:10} {totals['actions']:>12,} rows {totals['gb']:>14,.0f} GB")
+    assert diff['totals']['removed']['actions'] == n_rows - len(kept)
+    assert diff['totals']['added']['actions'] == len(new_ids) - len(kept)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark memory for many sessions on one dataset at 500k rows.
+
+Compares each session holding its own copy of the processed frame (what a
+`st.cache_data` result stored in session state amounts to) with sessions
+holding views of one frame in the dataset registry. Each session then adds
+a derived column, as the visualizations view does. Reports the RSS growth
+of a fresh process per mode.
+
+    python benchmarks/bench_dataset_registry.py [n_sessions]
+"""
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_exports import make_frame
+from views.dataset_registry import DatasetRegistry, DatasetHandle, frame_nbytes
+
+N_ROWS = 500_000
+N_SESSIONS = 30
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def open_session(df):
+    df['location_label'] = df['inferred_location'] + ' (DC)'
+    return df
+
+def run_copies(source, n_sessions):
+    return [open_session(source.copy()) for _ in range(n_sessions)]
+
+def run_registry(source, n_sessions):
+    registry = DatasetRegistry()
+    sessions = []
+    for _ in range(n_sessions):
+        registry.get('processed', 'v1', source.copy, acquire=True)
+        sessions.append((DatasetHandle(registry, 'v1'), open_session(registry.share('v1'))))
+    return registry, sessions
+
+MODES = {'copy per session': run_copies, 'shared registry': run_registry}
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else N_SESSIONS
+    if len(sys.argv) > 2:
+        # One mode per process, so freed pages from the other can't blur RSS
+        source = make_frame(N_ROWS)
+        base = rss_mb()
+        start = time.perf_counter()
+        result = MODES[sys.argv[2]](source, n_sessions)
+        seconds = time.perf_counter() - start
+        print(f"  {sys.argv[2]:17} +{rss_mb() - base:7,.0f} MB RSS  {seconds:5.2f}s")
+        return
+
+    print(f"{N_ROWS:,} rows, {frame_nbytes(make_frame(N_ROWS)) / 2**20:,.0f} MB per copy, {n_sessions} sessions")
+    for mode in MODES:
+        subprocess.run([sys.executable, __file__, str(n_sessions), mode], check=True)
+
+if __name__ == '__main__':
+    main()
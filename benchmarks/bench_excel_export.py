@@ -0,0 +1,69 @@
+"""Benchmark the multi-sheet Excel export at 100k rows.
+
+Compares pandas `to_excel` (a full in-memory openpyxl workbook, numbers
+formatted per cell afterwards) with the streaming write-only exporter:
+time and peak Python memory traced during the export (a second run).
+
+    python benchmarks/bench_excel_export.py [n_rows]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+
+from bench_exports import make_frame
+from views.exports import excel_number_format, format_size, iter_chunks, write_export
+
+N_ROWS = 100_000
+
+def legacy_excel(df, sheets):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Data', index=False)
+        ws = writer.sheets['Data']
+        for i, col in enumerate(df.columns, 1):
+            fmt = excel_number_format(col, df[col].dtype)
+            if fmt is not None:
+                for (cell,) in ws.iter_rows(min_row=2, min_col=i, max_col=i):
+                    cell.number_format = fmt
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return buffer.getvalue()
+
+def streaming_excel(df, sheets):
+    buffer = io.BytesIO()
+    write_export(iter_chunks(df), 'Excel', buffer, sheets=sheets)
+    return buffer.getvalue()
+
+def measure(fn):
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    data = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return data, seconds, peak
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    df = make_frame(n_rows)
+    sheets = {
+        'Location Summary': df.groupby('inferred_location')[['file_size_(gb)', 'storage_cost_usd']].sum().reset_index(),
+        'Totals': pd.DataFrame({'Metric': ['storage_cost_usd'], 'Value': [df['storage_cost_usd'].sum()]})
+    }
+    cells = n_rows * len(df.columns)
+    print(f"{n_rows:,} rows x {len(df.columns)} columns ({cells:,} cells) plus summary sheets")
+    for label, fn in [('to_excel', legacy_excel), ('write-only', streaming_excel)]:
+        data, seconds, peak = measure(lambda: fn(df, sheets))
+        print(f"  {label:10} {format_size(len(data)):>9}  {seconds:6.1f}s ({cells / seconds:,.0f} cells/s)"
+              f"  peak {format_size(peak)}")
+
+if __name__ == '__main__':
+    main()
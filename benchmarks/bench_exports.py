@@ -0,0 +1,66 @@
+"""Benchmark explorer/upload exports at 500k rows.
+
+Compares the former export (the whole CSV as one string, then encoded) with
+chunked streaming writers for plain, gzip and zip CSV and Parquet: time,
+file size and peak Python memory traced during the export (a second run).
+
+    python benchmarks/bench_exports.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views.exports import FILE_FORMATS, build_export, iter_chunks, format_size
+
+N_ROWS = 500_000
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    locations = np.array(['AUH', 'DXB', 'AJM'] + [f'BD{i:02d}' for i in range(40)])
+    return pd.DataFrame({
+        'name': 'vra-fal-x70-1-rp' + pd.Series(rng.integers(1, 6, n_rows)).astype(str),
+        'file_name': '/veeamproxy_0' + pd.Series(rng.integers(10, 99, n_rows)).astype(str)
+                     + '/au' + pd.Series(rng.integers(10000, 99999, n_rows)).astype(str) + '_1.vmdk',
+        'inferred_location': locations[rng.integers(0, len(locations), n_rows)],
+        'file_size_(gb)': rng.lognormal(-1, 2, n_rows),
+        'storage_cost_usd': rng.lognormal(1, 1, n_rows),
+        'storage_cost_aed': rng.lognormal(2, 1, n_rows),
+        'carbon_savings': rng.lognormal(0, 1, n_rows),
+        'confidence_score': rng.random(n_rows),
+        'roi_score': rng.lognormal(2, 1, n_rows),
+        'created_date': (pd.Timestamp('2023-01-01')
+                         + pd.to_timedelta(rng.integers(0, 700, n_rows), unit='D')).strftime('%Y-%m-%d')
+    })
+
+def measure(fn):
+    # Timed without tracing (tracemalloc slows to_csv down many times), then traced for the peak
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def main():
+    df = make_frame(N_ROWS)
+    positions = np.random.default_rng(1).permutation(N_ROWS)
+
+    legacy, seconds, peak = measure(lambda: df.iloc[positions].to_csv(index=False).encode("utf-8"))
+    print(f"{N_ROWS:,} rows, {len(df.columns)} columns")
+    print(f"  legacy CSV   {format_size(len(legacy)):>10}  {seconds:5.2f}s  peak {format_size(peak)}")
+    for file_format in FILE_FORMATS:
+        export, seconds, peak = measure(lambda: build_export(iter_chunks(df, positions), file_format, 'export'))
+        print(f"  {file_format:12} {format_size(export['size']):>10}  {seconds:5.2f}s  peak {format_size(peak)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark ROI Explorer filter resolution at 1M rows.
+
+Compares the former per-rerun work (unique option lists, date parsing and
+full-frame boolean filters) with the filter index: a one-off build, then
+bitmap lookups per filter combination.
+
+    python benchmarks/bench_filter_index.py
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views.filter_index import FilterIndex
+
+N_ROWS = 1_000_000
+N_QUERIES = 20
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    locations = np.array(['AUH', 'DXB', 'AJM'] + [f'BD{i:02d}' for i in range(40)])
+    location = locations[rng.integers(0, len(locations), n_rows)]
+    return pd.DataFrame({
+        'inferred_location': location,
+        'location_type': np.where(np.isin(location, ['AUH', 'DXB', 'AJM']), 'Data Center', 'Business Domain'),
+        'created_date': (pd.Timestamp('2023-01-01')
+                         + pd.to_timedelta(rng.integers(0, 700, n_rows), unit='D')).strftime('%Y-%m-%d')
+    })
+
+def random_query(rng, locations):
+    start = pd.Timestamp('2023-01-01') + pd.Timedelta(days=int(rng.integers(0, 350)))
+    return (
+        rng.choice(['All', 'Data Center', 'Business Domain']),
+        list(rng.choice(locations, size=int(rng.integers(1, len(locations))), replace=False)),
+        start, start + pd.Timedelta(days=int(rng.integers(1, 350)))
+    )
+
+def legacy_query(df, query):
+    selected_type, selected_locations, start, end = query
+    df['location_type'].unique()
+    df['inferred_location'].dropna().unique()
+    dates = pd.to_datetime(df['created_date'], errors='coerce')
+    frame = df[(dates >= start) & (dates <= end)]
+    if selected_type != 'All':
+        frame = frame[frame['location_type'] == selected_type]
+    return len(frame[frame['inferred_location'].isin(selected_locations)])
+
+def index_query(index, query):
+    selected_type, selected_locations, start, end = query
+    index.options('location_type')
+    index.options('inferred_location')
+    mask = index.value_mask('inferred_location', selected_locations) & index.date_mask(start, end)
+    if selected_type != 'All':
+        type_mask = np.zeros(index.n_rows, dtype=bool)
+        type_mask[index.value_positions('location_type', selected_type)] = True
+        mask &= type_mask
+    return int(mask.sum())
+
+def main():
+    df = make_frame(N_ROWS)
+    rng = np.random.default_rng(1)
+    locations = sorted(df['inferred_location'].unique())
+    queries = [random_query(rng, locations) for _ in range(N_QUERIES)]
+
+    start = time.perf_counter()
+    index = FilterIndex(df)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_counts = [legacy_query(df, q) for q in queries]
+    legacy = (time.perf_counter() - start) / N_QUERIES
+    start = time.perf_counter()
+    index_counts = [index_query(index, q) for q in queries]
+    indexed = (time.perf_counter() - start) / N_QUERIES
+    assert legacy_counts == index_counts
+
+    print(f"{N_ROWS:,} rows, {N_QUERIES} random filter combinations (results match)")
+    print(f"  legacy per rerun: {legacy * 1000:,.0f} ms")
+    print(f"  filter index: {indexed * 1000:,.1f} ms per rerun after a one-off {build:.2f}s build")
+
+if __name__ == '__main__':
+    main()
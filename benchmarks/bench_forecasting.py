@@ -0,0 +1,67 @@
+"""Benchmark the statistical forecast on a 1M-row dataset with three years of history.
+
+Recommendations are spread over 36 months with a trend and a yearly season,
+across 500 locations; prints the time of each step and the backtest. First
+checks that short histories (12-14 months, where seasonal naive can forecast
+but not yet be backtested) only offer backtested models.
+
+    python benchmarks/bench_forecasting.py [n_rows] [n_locations]
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views import forecasting
+
+N_ROWS = 1_000_000
+N_LOCATIONS = 500
+N_MONTHS = 36
+
+def make_frame(n_rows, n_locations, n_months=N_MONTHS, seed=0):
+    rng = np.random.default_rng(seed)
+    month = np.arange(n_months)
+    weights = 1 + 0.02 * month + 0.4 * np.sin(2 * np.pi * month / 12)
+    months = pd.period_range('2022-01', periods=n_months, freq='M').strftime('%Y-%m')
+    locations = np.array([f"LOC{i:03d}" for i in range(n_locations)])
+    return pd.DataFrame({
+        'roi_month': months[rng.choice(n_months, size=n_rows, p=weights / weights.sum())],
+        'inferred_location': locations[rng.zipf(1.5, n_rows) % n_locations],
+        'file_size_(gb)': rng.gamma(2.0, 0.5, n_rows)
+    })
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:22} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+def check_short_histories():
+    for n_months in (12, 13, 14):
+        result = forecasting.forecast_dataset(make_frame(20_000, 20, n_months))
+        for name, scores in result['backtest'].items():
+            assert list(result['forecasts'][name]) == list(scores['model']), (n_months, name)
+            assert 'Seasonal naive' not in result['forecasts'][name], (n_months, name)
+    print("short histories: every offered model has backtest scores")
+
+def main():
+    check_short_histories()
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    n_locations = int(sys.argv[2]) if len(sys.argv) > 2 else N_LOCATIONS
+    df = make_frame(n_rows, n_locations)
+    print(f"{n_rows:,} rows, {n_locations:,} locations, {N_MONTHS} months")
+
+    series = timed('monthly series', lambda: forecasting.monthly_series(df))
+    timed('backtest (actions)', lambda: forecasting.backtest(series['actions']))
+    result = timed('forecast_dataset', lambda: forecasting.forecast_dataset(df))
+    for name, scores in result['backtest'].items():
+        print(f"\n{name}: best {result['best'][name]}")
+        print(scores.to_string(index=False, float_format='{:,.3f}'.format))
+
+if __name__ == '__main__':
+    main()
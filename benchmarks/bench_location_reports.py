@@ -0,0 +1,54 @@
+"""Benchmark batch per-location showback PDF generation.
+
+Builds one PDF per location, serially and in the worker pool, and reports
+the time per report, the ZIP size and the projected time for 500 locations.
+Location counts default to 20 and 100; pass others as arguments:
+
+    python benchmarks/bench_location_reports.py [N_LOCATIONS ...]
+
+The serial run is skipped above 100 locations to keep the benchmark short.
+"""
+import os
+import sys
+import time
+import warnings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_report_charts import make_dataset
+from views.roi_report import generate_location_reports
+from views import report_charts
+
+MAX_SERIAL_LOCATIONS = 100
+PROJECTED_LOCATIONS = 500
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main():
+    # Fonts are resolved relative to the repo root, as in the app
+    os.chdir(REPO_ROOT)
+    warnings.filterwarnings('ignore')
+    counts = [int(arg) for arg in sys.argv[1:]] or [20, 100]
+    # Start the workers so process start-up is not attributed to the first size
+    generate_location_reports(make_dataset(2))
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'locations':>10} {'serial (s)':>11} {'parallel (s)':>13} {'per report (ms)':>16} "
+          f"{'zip size':>10} {f'{PROJECTED_LOCATIONS} est. (s)':>14}")
+    for n_locations in counts:
+        df = make_dataset(n_locations)
+        serial = '-'
+        if n_locations <= MAX_SERIAL_LOCATIONS:
+            serial = f"{timed(lambda: generate_location_reports(df, max_workers=1))[0]:.1f}"
+        parallel, archive = timed(lambda: generate_location_reports(df))
+        per_report = parallel / n_locations
+        print(f"{n_locations:>10} {serial:>11} {parallel:>13.1f} {per_report * 1000:>16.0f} "
+              f"{len(archive) / 1024 / 1024:>8.1f} MB {per_report * PROJECTED_LOCATIONS:>14.0f}")
+    report_charts.shutdown_executor()
+
+if __name__ == '__main__':
+    main()
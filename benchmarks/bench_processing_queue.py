@@ -0,0 +1,121 @@
+"""Benchmark page rendering while uploads are processed.
+
+Three users process the sample export at the same time. Compares processing
+in the sessions' script threads, as before, with the processing queue's
+worker processes, reporting how long a typical page computation (the location
+summary of a 200k-row frame, run every 0.2s) takes meanwhile, and when
+the uploads finish. First checks that jobs start in per-user fair order and
+that a job the pool refuses fails without holding a worker slot.
+
+    python benchmarks/bench_processing_queue.py
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+
+from bench_exports import make_frame
+from views.processing import process_recommendations
+from views.processing_queue import ProcessingQueue
+from views.roi_report import summarize_by_location
+
+SAMPLE = os.path.join(REPO_ROOT, 'inputs', 'Recommendations_Delete_Storage_Devices.xlsx')
+USERS = ['alice', 'bob', 'carol']
+# Pause between page computations, as between a user's interactions
+THINK_SECONDS = 0.2
+
+def load_settings():
+    # As views.helpers.initialize_settings builds them
+    with open(os.path.join(REPO_ROOT, 'config', 'config.json')) as f:
+        config = json.load(f)
+    return {
+        'cost_per_gb': config['cost_per_gb_per_month_usd'],
+        'retention': config['retention_months'],
+        'conversion_rate': config['currency_conversion_rate'],
+        'energy_kwh': config['energy_per_gb_kwh'],
+        'cooling': config['cooling_multiplier'],
+        'co2_rate': config['co2_per_kwh'],
+        'min_minutes': 13, 'max_minutes': 33, 'min_rate_aed': 100, 'max_rate_aed': 250,
+        'turbo_pct': 70, 'turbo_unit_cost_usd': 0.25, 'aap_unit_cost_usd': 0.15
+    }
+
+def render_latencies(df, done):
+    latencies = []
+    while not done():
+        start = time.perf_counter()
+        summarize_by_location(df)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(THINK_SECONDS)
+    return latencies
+
+def run(mode, df, file_bytes, settings, root):
+    start = time.perf_counter()
+    if mode == 'threads':
+        threads = [threading.Thread(target=process_recommendations,
+                                    args=(file_bytes, 'sample', settings, user, root)) for user in USERS]
+        for thread in threads:
+            thread.start()
+        latencies = render_latencies(df, lambda: not any(t.is_alive() for t in threads))
+    else:
+        queue = ProcessingQueue()
+        jobs = [queue.submit(user, 'sample', process_recommendations, file_bytes, 'sample', settings, user, root)
+                for user in USERS]
+        latencies = render_latencies(df, lambda: all(queue.status(j)['finished'] is not None for j in jobs))
+        assert all(queue.status(j)['status'] == 'done' for j in jobs)
+        queue.shutdown()
+    total = time.perf_counter() - start
+    print(f"{mode:>8} {np.median(latencies) * 1000:>10.0f} {np.percentile(latencies, 95) * 1000:>9.0f} {total:>10.1f}")
+
+def wait(queue, jobs):
+    while any(queue.status(j)['finished'] is None for j in jobs):
+        time.sleep(0.05)
+
+def check_fairness():
+    queue = ProcessingQueue(max_workers=1)
+    jobs = [(user, queue.submit(user, 'check', os.getpid)) for user in ['alice', 'alice', 'alice', 'bob', 'carol']]
+    # alice's first job starts at once; the others wait in fair order
+    assert [queue.status(j)['position'] for _, j in jobs] == [0, 3, 4, 1, 2]
+    wait(queue, [j for _, j in jobs])
+    started = sorted(jobs, key=lambda job: queue.status(job[1])['started'])
+    assert [user for user, _ in started] == ['alice', 'bob', 'carol', 'alice', 'alice'], started
+    queue.shutdown()
+
+def check_refused_submit():
+    queue = ProcessingQueue(max_workers=1)
+    # A pool that was shut down refuses new work when the job is handed to it
+    queue._get_executor().shutdown()
+    job = queue.submit('alice', 'check', os.getpid)
+    status = queue.status(job)
+    assert status['status'] == 'failed' and status['finished'] is not None, status
+    assert queue.stats()['running'] == 0
+    queue._executor = None
+    wait(queue, [queue.submit('alice', 'check', os.getpid)])
+    queue.shutdown()
+
+def main():
+    check_fairness()
+    check_refused_submit()
+    print("queue: fair start order, refused jobs fail and free their slot")
+    df = make_frame(200_000)
+    df['location_type'] = np.where(df['inferred_location'].str.startswith('BD'), 'Business Domain', 'Data Center')
+    settings = load_settings()
+    with open(SAMPLE, 'rb') as f:
+        file_bytes = f.read()
+    start = time.perf_counter()
+    render_latencies(df, lambda: time.perf_counter() - start > 1)
+    idle = render_latencies(df, lambda: time.perf_counter() - start > 3)
+    print(f"{len(USERS)} uploads, {os.cpu_count()} CPUs; idle render {np.median(idle) * 1000:.0f} ms")
+    print(f"{'mode':>8} {'p50 (ms)':>10} {'p95 (ms)':>9} {'done (s)':>10}")
+    with tempfile.TemporaryDirectory() as root:
+        for mode in ('threads', 'queue'):
+            run(mode, df, file_bytes, settings, root)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark Business ROI report chart rendering for 10, 100 and 1000 locations.
+
+Compares serial rendering, parallel rendering in the worker pool, and a
+warm image cache.
+
+    python benchmarks/bench_report_charts.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from views.business_roi import summarize_by_location
+from views import report_charts
+
+ROWS_PER_LOCATION = 200
+
+def make_dataset(n_locations, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rows = n_locations * ROWS_PER_LOCATION
+    locations = np.array([f"LOC{i:04d}" for i in range(n_locations)])
+    codes = rng.integers(0, n_locations, n_rows)
+    size = rng.gamma(2.0, 20.0, n_rows)
+    return pd.DataFrame({
+        'inferred_location': locations[codes],
+        'location_type': np.where(codes % 5 == 0, 'Data Center', 'Business Domain'),
+        'file_size_(gb)': size,
+        'storage_cost_usd': size * 0.9,
+        'storage_cost_aed': size * 0.9 * 3.67,
+        'carbon_savings': size * 0.002,
+        'created_date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D')
+    })
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    print(f"{'locations':>10} {'serial (s)':>12} {'parallel (s)':>13} {'cached (s)':>11}")
+    # Warm up the worker pool so process start-up is not attributed to the first size
+    report_charts.render_charts(report_charts.build_chart_specs(make_dataset(2), summarize_by_location(make_dataset(2))))
+    for n_locations in (10, 100, 1000):
+        df = make_dataset(n_locations)
+        specs = report_charts.build_chart_specs(df, summarize_by_location(df))
+
+        report_charts.clear_image_cache()
+        serial = timed(lambda: report_charts.render_charts(specs, max_workers=1))
+        report_charts.clear_image_cache()
+        parallel = timed(lambda: report_charts.render_charts(specs))
+        cached = timed(lambda: report_charts.render_charts(specs))
+        print(f"{n_locations:>10} {serial:>12.2f} {parallel:>13.2f} {cached:>11.4f}")
+    report_charts.shutdown_executor()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark bytes written to disk per Business ROI report bundle.
+
+Compares the former disk round-trip (chart PNGs and CSV in assets/, PDF in
+the working directory, all read back into the ZIP) with the in-memory
+pipeline. Disk writes are read from /proc/self/io (Linux only), with chart
+images pre-rendered so only report assembly is measured.
+
+    python benchmarks/bench_report_io.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_report_charts import make_dataset
+from views.business_roi import build_report_bundle, generate_business_roi_pdf, summarize_by_location
+from views.helpers import dataset_fingerprint
+from views import report_charts
+
+STATIC_ASSETS = ['NotoSans-Regular.ttf', 'NotoSans-Bold.ttf', 'logo.png']
+
+def bytes_written():
+    with open('/proc/self/io') as f:
+        for line in f:
+            if line.startswith('wchar:'):
+                return int(line.split()[1])
+    return 0
+
+def legacy_bundle(df):
+    """The previous pipeline: every artifact goes through a file before reaching the ZIP."""
+    summary_df = summarize_by_location(df)
+    charts = report_charts.render_charts(report_charts.build_chart_specs(df, summary_df))
+    for name, png in charts.items():
+        with open(f"assets/{name}.png", "wb") as f:
+            f.write(png)
+    with open("business_roi_report.pdf", "wb") as f:
+        f.write(generate_business_roi_pdf(df, charts))
+    summary_df.to_csv("assets/business_roi_summary.csv", index=False)
+
+    with zipfile.ZipFile("business_roi_bundle.zip", "w") as zipf:
+        zipf.write("business_roi_report.pdf")
+        zipf.write("assets/business_roi_summary.csv", arcname="business_roi_summary.csv")
+        for name in charts:
+            zipf.write(f"assets/{name}.png", arcname=f"{name}.png")
+    with open("business_roi_bundle.zip", "rb") as f:
+        return f.read()
+
+def in_memory_bundle(df):
+    return build_report_bundle.__wrapped__(dataset_fingerprint(df), df)['zip']
+
+def measure(fn, df):
+    start_bytes, start = bytes_written(), time.perf_counter()
+    fn(df)
+    return bytes_written() - start_bytes, time.perf_counter() - start
+
+def leftover_files(root):
+    return sum(len(files) for _, _, files in os.walk(root)) - len(STATIC_ASSETS)
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='roi_report_io_')
+    os.makedirs(os.path.join(workdir, 'assets'))
+    for name in STATIC_ASSETS:
+        shutil.copy(os.path.join(REPO_ROOT, 'assets', name), os.path.join(workdir, 'assets', name))
+    os.chdir(workdir)
+
+    rows = []
+    try:
+        for n_locations in (10, 100):
+            df = make_dataset(n_locations)
+            # Render and cache charts up front so both pipelines reuse the same images
+            report_charts.render_charts(report_charts.build_chart_specs(df, summarize_by_location(df)))
+            legacy_written, legacy_time = measure(legacy_bundle, df)
+            legacy_files = leftover_files(workdir)
+            for name in os.listdir(workdir):
+                if name != 'assets':
+                    os.remove(name)
+            for name in os.listdir('assets'):
+                if name not in STATIC_ASSETS:
+                    os.remove(os.path.join('assets', name))
+            memory_written, memory_time = measure(in_memory_bundle, df)
+            rows.append((n_locations, legacy_written, legacy_files, legacy_time,
+                         memory_written, leftover_files(workdir), memory_time))
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir)
+        report_charts.shutdown_executor()
+
+    print(f"{'locations':>10} {'disk written':>14} {'files left':>11} {'time (s)':>9} "
+          f"{'in-memory written':>18} {'files left':>11} {'time (s)':>9}")
+    for n, lw, lf, lt, mw, mf, mt in rows:
+        print(f"{n:>10} {lw:>14,} {lf:>11} {lt:>9.2f} {mw:>18,} {mf:>11} {mt:>9.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the run history with thousands of recorded runs.
+
+Records runs of synthetic datasets (100 locations and 24 months each),
+then times the History view's queries.
+
+    python benchmarks/bench_run_history.py [n_runs] [history_path]
+
+Pass a history path to keep the filled file, e.g. to try the History view.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from views import run_history
+
+N_RUNS = 5000
+N_DATASETS = 5
+N_LOCATIONS = 100
+N_MONTHS = 24
+
+def make_run(rng, i):
+    dataset = {'id': f"dataset-{i % N_DATASETS}", 'name': f"Dataset {i % N_DATASETS}", 'owner': 'admin'}
+    version = {'version': i // N_DATASETS + 1}
+    storage = rng.gamma(2.0, 500.0, N_LOCATIONS)
+    locations = pd.DataFrame({
+        'location': [f"LOC{j:03d}" for j in range(N_LOCATIONS)],
+        'location_type': np.where(np.arange(N_LOCATIONS) % 5 == 0, 'Data Center', 'Business Domain'),
+        'actions': rng.integers(10, 1000, N_LOCATIONS),
+        'storage_gb': storage,
+        'storage_cost_usd': storage * 1.8,
+        'storage_cost_aed': storage * 6.6,
+        'carbon_savings_kg': storage * 0.02,
+        'net_savings_usd': storage * 3.4
+    })
+    months = pd.DataFrame({'roi_month': [f"{2023 + m // 12}-{m % 12 + 1:02d}" for m in range(N_MONTHS)]})
+    for key in run_history.MONTHLY_COLUMNS:
+        months[key] = rng.gamma(2.0, 1000.0, N_MONTHS)
+    totals = {key: float(locations['net_savings_usd'].sum()) for key in run_history.TOTAL_COLUMNS}
+    metrics = {'total_actions': int(locations['actions'].sum()), 'total_storage_gb': float(storage.sum())}
+    return dataset, version, metrics, totals, months, locations
+
+def timed(label, fn, repeat=20):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"  {label:32} {(time.perf_counter() - start) / repeat * 1000:8.2f} ms  ({len(result):,} rows)")
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else N_RUNS
+    directory = None if len(sys.argv) > 2 else tempfile.TemporaryDirectory()
+    path = sys.argv[2] if directory is None else os.path.join(directory.name, 'run_history.sqlite')
+
+    rng = np.random.default_rng(0)
+    start_date = datetime(2022, 1, 1)
+    start = time.perf_counter()
+    for i in range(n_runs):
+        run_at = (start_date + timedelta(hours=6 * i)).isoformat(timespec='seconds')
+        run_history.record_run(*make_run(rng, i), run_at=run_at, path=path)
+    seconds = time.perf_counter() - start
+    print(f"{n_runs:,} runs recorded in {seconds:.1f}s ({seconds / n_runs * 1000:.1f} ms per run), "
+          f"{os.path.getsize(path) / 2**20:,.0f} MB")
+
+    timed('list_datasets', lambda: run_history.list_datasets(path=path))
+    timed('list_runs (200)', lambda: run_history.list_runs(limit=200, path=path))
+    timed('quarterly_trend', lambda: run_history.quarterly_trend(path=path))
+    timed('quarterly_trend (one dataset)', lambda: run_history.quarterly_trend('dataset-3', path=path))
+    timed('list_locations', lambda: run_history.list_locations(path=path))
+    timed('location_trend', lambda: run_history.location_trend('LOC042', path=path))
+    timed('location_trend (one dataset)', lambda: run_history.location_trend('LOC042', 'dataset-3', path=path))
+    timed('run_months', lambda: run_history.run_months(n_runs // 2, path=path))
+    if directory is not None:
+        directory.cleanup()
+
+if __name__ == '__main__':
+    main()
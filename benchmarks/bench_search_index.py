@@ -0,0 +1,68 @@
+"""Benchmark ROI Explorer name/path search at 5M rows.
+
+Compares a full scan with pandas `str.contains` over both searched columns
+against the trigram search index: a one-off build, then per-query latency
+for selective and broad queries. Paths repeat across rows (1M distinct paths),
+as they do across inventory snapshots.
+
+    python benchmarks/bench_search_index.py [n_rows] [n_paths]
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views.search_index import SearchIndex, NO_MATCH
+
+N_ROWS = 5_000_000
+N_PATHS = 1_000_000
+QUERIES = ['au12345', 'au123', 'rp4-16', 'vcls-', 'veeamproxy_01', 'flat.vm', 'vmdk', 'zzzq']
+
+def make_frame(n_rows, n_paths, seed=0):
+    rng = np.random.default_rng(seed)
+    hosts = np.array([f'veeamproxy_{i:03d}' for i in range(60)]
+                     + [f'vcls-{h:08x}' for h in rng.integers(0, 1 << 31, 200)])
+    extensions = np.array(['.vmdk', '-flat.vmdk', '.vmx', '.log', '.nvram'])
+    paths = pd.Series(hosts[rng.integers(0, len(hosts), n_paths)]).radd('/') + '/au' \
+        + pd.Series(rng.integers(10000, 99999, n_paths)).astype(str) + '_' \
+        + pd.Series(rng.integers(0, 9, n_paths)).astype(str) \
+        + pd.Series(extensions[rng.integers(0, len(extensions), n_paths)])
+    names = 'vra-fal-x70-1-rp' + pd.Series(rng.integers(1, 6, n_rows)).astype(str) + '-' \
+        + pd.Series(rng.integers(1, 30, n_rows)).astype(str)
+    return pd.DataFrame({'name': names, 'file_name': paths.to_numpy()[rng.integers(0, n_paths, n_rows)]})
+
+def legacy_search(df, query):
+    mask = np.zeros(len(df), dtype=bool)
+    for col in ['name', 'file_name']:
+        mask |= df[col].str.lower().str.contains(query, regex=False, na=False).to_numpy()
+    return mask
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    n_paths = int(sys.argv[2]) if len(sys.argv) > 2 else N_PATHS
+    df = make_frame(n_rows, n_paths)
+
+    start = time.perf_counter()
+    index = SearchIndex(df)
+    build = time.perf_counter() - start
+    postings = sum(i.trigrams.nbytes + i.postings.nbytes + i.docs.nbytes for i in index.indexes.values())
+
+    print(f"{n_rows:,} rows, {df['file_name'].nunique():,} distinct paths")
+    print(f"  index build: {build:.2f}s, {postings / 1e6:,.0f} MB")
+    for query in QUERIES:
+        start = time.perf_counter()
+        expected = legacy_search(df, query)
+        legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        found = index.search(query) < NO_MATCH
+        indexed = time.perf_counter() - start
+        assert np.array_equal(found, expected), query
+        print(f"  {query!r:16} {int(found.sum()):>10,} rows  scan {legacy * 1000:>7,.0f} ms  index {indexed * 1000:>6,.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the Explorer's SQLite copy of a 1M-row processed dataset.
+
+Times the one-off copy, an indexed filter, a full-table group-by (against the
+same group-by in pandas) and streaming every row of a result for an export.
+First checks that the copy can only be read: ATTACH, PRAGMA and writes are
+refused, and a slow export stops at its deadline.
+
+    python benchmarks/bench_sql_engine.py [n_rows]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views import sql_engine
+
+N_ROWS = 1_000_000
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    locations = np.array(['AUH', 'DXB', 'AJM'] + [f'BD{i:02d}' for i in range(40)])
+    location = locations[rng.integers(0, len(locations), n_rows)]
+    created = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 700, n_rows), unit='D')
+    size = rng.gamma(2.0, 0.5, n_rows)
+    return pd.DataFrame({
+        'name': [f"file_{i}.dat" for i in range(n_rows)],
+        'inferred_location': location,
+        'location_type': np.where(np.isin(location, ['AUH', 'DXB', 'AJM']), 'Data Center', 'Business Domain'),
+        'created_date': created.strftime('%Y-%m-%d'),
+        'roi_month': created.strftime('%Y-%m'),
+        'file_size_(gb)': size,
+        'storage_cost_usd': size * 1.8,
+        'net_savings_usd': size * 3.4
+    })
+
+GROUP_SQL = ('SELECT inferred_location, COUNT(*) AS actions, SUM("file_size_(gb)") AS storage_gb, '
+             'SUM(net_savings_usd) AS net_savings_usd FROM recommendations GROUP BY inferred_location')
+FILTER_SQL = ("SELECT * FROM recommendations WHERE inferred_location = 'DXB' "
+              "AND created_date BETWEEN '2023-03-01' AND '2023-06-30'")
+
+def timed(label, fn, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"  {label:36} {(time.perf_counter() - start) / repeat * 1000:9.1f} ms")
+    return result
+
+REFUSED_SQL = ["ATTACH DATABASE '{attached}' AS other", 'PRAGMA query_only=OFF', 'PRAGMA table_info(recommendations)',
+               'DELETE FROM recommendations', "CREATE TABLE copy AS SELECT * FROM recommendations"]
+SLOW_SQL = ('WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) '
+            'SELECT i FROM n WHERE i % 100000000 = 0')
+
+def check_sandbox(directory):
+    path = os.path.join(directory, 'sandbox.sqlite')
+    sql_engine.write_sqlite(make_frame(1000), path)
+    attached = os.path.join(directory, 'attached.db')
+    for sql in REFUSED_SQL:
+        try:
+            sql_engine.run_query(path, sql.format(attached=attached))
+        except sqlite3.DatabaseError:
+            pass
+        else:
+            raise AssertionError(f"not refused: {sql}")
+    assert not os.path.exists(attached)
+    assert len(sql_engine.run_query(path, 'SELECT * FROM recommendations')['frame']) == 1000
+    try:
+        list(sql_engine.iter_query_chunks(path, SLOW_SQL, timeout=0.2))
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("export ran past its deadline")
+    print("sandbox: ATTACH, PRAGMA and writes refused, exports stop at the deadline")
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    df = make_frame(n_rows)
+    with tempfile.TemporaryDirectory() as directory:
+        check_sandbox(directory)
+        path = os.path.join(directory, sql_engine.SQL_NAME)
+        start = time.perf_counter()
+        sql_engine.write_sqlite(df, path)
+        print(f"{n_rows:,} rows copied in {time.perf_counter() - start:.1f}s, "
+              f"{os.path.getsize(path) / 2**20:,.0f} MB")
+
+        timed('indexed filter (1,000-row limit)', lambda: sql_engine.run_query(path, FILTER_SQL))
+        timed('group by location (SQLite)', lambda: sql_engine.run_query(path, GROUP_SQL))
+        timed('group by location (pandas)', lambda: df.groupby('inferred_location').agg(
+            actions=('name', 'size'), storage_gb=('file_size_(gb)', 'sum'), net_savings_usd=('net_savings_usd', 'sum')))
+        rows = timed('stream every row', lambda: sum(
+            len(chunk) for chunk in sql_engine.iter_query_chunks(path, 'SELECT * FROM recommendations')), repeat=1)
+        print(f"  streamed {rows:,} rows, {sql_engine.FETCH_CHUNK_ROWS:,} at a time")
+
+if __name__ == '__main__':
+    main()
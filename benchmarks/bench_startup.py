@@ -0,0 +1,47 @@
+"""Benchmark app cold start: time to first paint of the login page and of Home.
+
+Each measurement runs app.py once in a fresh interpreter (so no view module or
+chart library is imported yet) through Streamlit's AppTest, and also reports
+which heavy libraries that first run imported.
+
+    python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+HEAVY_MODULES = ['plotly.express', 'plotly.graph_objects', 'matplotlib.pyplot', 'fpdf', 'numpy', 'pandas']
+
+# Runs in the child interpreter; AppTest itself is imported before the clock starts
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+at = AppTest.from_file('app.py', default_timeout=120)
+at.session_state['is_logged_in'] = {logged_in}
+at.session_state['current_view'] = 'home'
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules and m not in before]
+print(json.dumps({{'seconds': elapsed, 'errors': [e.value for e in at.exception], 'loaded': loaded}}))
+"""
+
+def first_paint(logged_in):
+    code = CHILD.format(logged_in=logged_in, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    for label, logged_in in [('login page', False), ('home', True)]:
+        results = [first_paint(logged_in) for _ in range(RUNS)]
+        best = min(r['seconds'] for r in results)
+        errors = results[0]['errors']
+        print(f"  {label:10} first paint {best:.2f}s (best of {RUNS})"
+              f"  imported: {', '.join(results[0]['loaded']) or '-'}{'  ERRORS: ' + str(errors) if errors else ''}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark top-N queries at 1M rows.
+
+Compares sorting the whole filtered frame (overall, and per location via
+sort + groupby head) with partial selection: argpartition for the overall
+top N, and per-location rankings built once per dataset.
+
+    python benchmarks/bench_top_n.py
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from views.top_n import GroupRankings, top_n_positions
+
+N_ROWS = 1_000_000
+TOP_N = 100
+N_QUERIES = 10
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    locations = np.array(['AUH', 'DXB', 'AJM'] + [f'BD{i:02d}' for i in range(40)])
+    return pd.DataFrame({
+        'inferred_location': locations[rng.integers(0, len(locations), n_rows)],
+        'roi_score': rng.lognormal(2, 1, n_rows),
+        'file_size_(gb)': rng.lognormal(-1, 2, n_rows)
+    })
+
+def legacy_overall(df, mask, column):
+    return df[mask].sort_values(by=column, ascending=False).head(TOP_N)
+
+def legacy_per_location(df, mask, column):
+    return df[mask].sort_values(by=column, ascending=False).groupby('inferred_location', sort=True).head(TOP_N)
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*query) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+def main():
+    df = make_frame(N_ROWS)
+    rng = np.random.default_rng(1)
+    queries = [(rng.random(N_ROWS) < rng.uniform(0.05, 1), col)
+               for col in ['roi_score', 'file_size_(gb)'] for _ in range(N_QUERIES // 2)]
+
+    start = time.perf_counter()
+    rankings = GroupRankings(df)
+    build = time.perf_counter() - start
+
+    legacy, legacy_overall_time = timed(lambda mask, col: legacy_overall(df, mask, col), queries)
+    fast, fast_overall_time = timed(lambda mask, col: top_n_positions(df[col].to_numpy(), mask, TOP_N), queries)
+    for frame, positions, (_, col) in zip(legacy, fast, queries):
+        assert np.array_equal(frame[col].to_numpy(), df[col].to_numpy()[positions])
+
+    legacy, legacy_group_time = timed(lambda mask, col: legacy_per_location(df, mask, col), queries)
+    fast, fast_group_time = timed(lambda mask, col: rankings.top_n(col, mask, TOP_N)[0], queries)
+    for frame, positions, (_, col) in zip(legacy, fast, queries):
+        assert np.array_equal(np.sort(frame[col].to_numpy()), np.sort(df[col].to_numpy()[positions]))
+
+    print(f"{N_ROWS:,} rows, top {TOP_N}, {len(queries)} random filters (results match)")
+    print(f"  overall:      sort {legacy_overall_time * 1000:,.0f} ms  argpartition {fast_overall_time * 1000:,.1f} ms")
+    print(f"  per location: sort {legacy_group_time * 1000:,.0f} ms  rankings {fast_group_time * 1000:,.1f} ms"
+          f" after a one-off {build:.2f}s build")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import pandas as pd
+import pyarrow as pa
+
+# Arrow IPC (Feather v2) files are written uncompressed in a single record batch,
+# so readers can memory-map them and wrap the columns without copying or parsing.
+
+def _to_table(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if pd.api.types.is_float_dtype(df[col].dtype):
+            # Keep NaN as NaN rather than null: columns with nulls must be copied to fill them back in
+            table = table.set_column(i, table.field(i), pa.array(df[col].to_numpy(), type=table.field(i).type))
+    return table
+
+def write_arrow(df, path):
+    """Write `df` as an Arrow IPC file, replacing `path` atomically.
+
+    The file is written next to its destination and renamed into place, so a
+    process opening `path` sees either the old or the new file, never a partial one.
+    Processes that still have the old file mapped keep reading it until they reopen.
+    """
+    table = _to_table(df)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_arrow(path):
+    """Open an Arrow IPC file as a DataFrame backed by the memory-mapped file.
+
+    Numeric columns are read-only NumPy views of the mapping and string columns
+    wrap the Arrow arrays, so nothing is parsed or copied; pages are loaded
+    on first touch and shared through the OS page cache by every process
+    mapping the same file.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=False)
@@ -0,0 +1,148 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import base64
+
+# Default maximum number of points sent to the browser per chart trace
+DEFAULT_POINT_BUDGET = 2000
+
+def get_point_budget():
+    """Return the configured per-chart point budget."""
+    settings = st.session_state.get('settings', {})
+    return max(int(settings.get('chart_point_budget', DEFAULT_POINT_BUDGET)), 3)
+
+def bin_histogram(values, nbins=20, value_range=None):
+    """Bin values on the server with NumPy instead of shipping every row to Plotly.
+
+    Returns a DataFrame with one row per bin: bin_start, bin_end, bin_center and count.
+    """
+    arr = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    arr = arr[np.isfinite(arr)]
+    if arr.size == 0:
+        return pd.DataFrame(columns=['bin_start', 'bin_end', 'bin_center', 'count'])
+
+    if value_range is None:
+        lo, hi = float(arr.min()), float(arr.max())
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        value_range = (lo, hi)
+
+    counts, edges = np.histogram(arr, bins=nbins, range=value_range)
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'bin_center': (edges[:-1] + edges[1:]) / 2,
+        'count': counts
+    })
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the sorted positions of the points to keep so that the visual
+    shape of the (x, y) series is preserved with at most `threshold` points.
+    Series whose x or y isn't entirely numeric or datetime are sampled at an
+    even stride instead, as triangle areas can't be measured.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = pd.to_numeric(pd.Series(y), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    if not (np.isfinite(x).all() and np.isfinite(y).all()):
+        return np.unique(np.linspace(0, n - 1, threshold).astype(np.int64))
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    # Interior points are split into (threshold - 2) equally sized buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(edges):
+            nxt_start, nxt_end = edges[i + 1], edges[i + 2]
+        else:
+            nxt_start, nxt_end = n - 1, n
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+
+        # Pick the point forming the largest triangle with the previous pick and the next average
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area)) if len(area) else start
+        keep[i + 1] = prev
+
+    return np.unique(keep)
+
+def downsample_series(frame, x, y_cols, budget=None):
+    """Reduce a time-series frame to roughly `budget` rows using LTTB per y column."""
+    budget = budget or get_point_budget()
+    if len(frame) <= budget:
+        return frame
+
+    frame = frame.sort_values(x)
+    y_cols = [y_cols] if isinstance(y_cols, str) else list(y_cols)
+    per_col = max(budget // len(y_cols), 3)
+    keep = np.unique(np.concatenate([
+        lttb_indices(frame[x].to_numpy(), frame[col].fillna(0).to_numpy(), per_col)
+        for col in y_cols
+    ]))
+    return frame.iloc[keep]
+
+def figure_point_count(fig):
+    """Count the data points serialized across all traces of a figure."""
+    total = 0
+    for trace in fig.data:
+        lengths = [_array_length(getattr(trace, attr)) for attr in ('x', 'y', 'values', 'labels')
+                   if getattr(trace, attr, None) is not None]
+        total += max(lengths, default=0)
+    return total
+
+def _array_length(values):
+    """Length of a trace array, including Plotly's base64 typed-array encoding."""
+    if isinstance(values, dict) and 'bdata' in values:
+        return len(base64.b64decode(values['bdata'])) // np.dtype(values['dtype']).itemsize
+    return len(values)
+
+def remember_payload_bytes(fig, num_bytes):
+    """Record the size of a figure's JSON spec, e.g. measured when the figure cache stored it."""
+    fig._payload_bytes = num_bytes
+    return fig
+
+def figure_payload_bytes(fig):
+    """Size of the JSON spec that is sent to the browser for a figure.
+
+    Serialized only for figures whose size wasn't recorded with remember_payload_bytes.
+    """
+    num_bytes = getattr(fig, '_payload_bytes', None)
+    if num_bytes is None:
+        num_bytes = len(fig.to_json().encode('utf-8'))
+        remember_payload_bytes(fig, num_bytes)
+    return num_bytes
+
+def format_bytes(num_bytes):
+    """Human readable byte size."""
+    size = float(num_bytes)
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024 or unit == 'GB':
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
+
+def render_chart(fig, key):
+    """Render a Plotly figure with a payload-size readout below it."""
+    st.plotly_chart(fig, use_container_width=True, key=key)
+    st.caption(
+        f"Chart payload: {format_bytes(figure_payload_bytes(fig))} · "
+        f"{figure_point_count(fig):,} points (budget {get_point_budget():,})"
+    )
+
+def _as_float(values):
+    """Convert numeric or datetime-like values to a float array for area calculations; NaN where neither."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return np.where(np.isnat(values), np.nan, values.astype('datetime64[ns]').astype(np.int64).astype(float))
+    return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
@@ -0,0 +1,108 @@
+import time
+import streamlit as st
+import plotly.express as px
+from views.helpers import PINNED_VERSION_KEY, SELECTED_DATASET_KEY, available_datasets, checkout_version
+from views.dataset_index import list_versions
+from views.versioned_store import version_key
+from views.dataset_diff import ADDED, REMOVED, UNCHANGED, GROUPS, KEY_COLUMNS, diff_datasets, status_positions
+from views.exports import iter_chunks, render_export
+
+# Locations drawn in the chart; the table lists all of them
+CHART_LOCATIONS = 20
+STATUS_LABELS = {REMOVED: "Resolved", UNCHANGED: "Still pending", ADDED: "New"}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def compute_diff(old_key, new_key, _old, _new):
+    """Diff two dataset versions once per pair; published versions never change."""
+    start = time.perf_counter()
+    diff = diff_datasets(_old, _new)
+    diff['seconds'] = time.perf_counter() - start
+    return diff
+
+def version_options():
+    """Label -> (dataset, version) of every available dataset version, newest first."""
+    options = {}
+    for dataset in available_datasets():
+        for version in list_versions(dataset):
+            created = version['created'].replace('T', ' ')[:16]
+            options[f"{dataset['name']} ({dataset['owner']}) · v{version['version']} · {created}"] = (dataset, version)
+    return options
+
+def default_pair(options):
+    """Indexes of the earlier and later version compared by default: the version this
+    session reads and the one before it."""
+    labels = list(options)
+    selected = st.session_state.get(SELECTED_DATASET_KEY)
+    pinned = st.session_state.get(PINNED_VERSION_KEY)
+    later = next((i for i, (dataset, version) in enumerate(options.values())
+                  if dataset['id'] == selected and version['version'] == pinned), 0)
+    return min(later + 1, len(labels) - 1), later
+
+def render():
+    st.markdown('<div class="page-title">🔀 Compare Runs</div>', unsafe_allow_html=True)
+    st.caption(f"Matches the recommendations of two processed datasets on {' + '.join(KEY_COLUMNS)}: "
+               "those only in the earlier one were resolved, those in both are still pending "
+               "and those only in the later one are new.")
+
+    options = version_options()
+    if len(options) < 2:
+        st.info("Compare needs two processed datasets or versions. Process another export in **Upload & Process**.")
+        return
+
+    labels = list(options)
+    earlier_index, later_index = default_pair(options)
+    col1, col2 = st.columns(2)
+    with col1:
+        earlier = st.selectbox("Earlier export", labels, index=earlier_index, key="compare_earlier")
+    with col2:
+        later = st.selectbox("Later export", labels, index=later_index, key="compare_later")
+    if earlier == later:
+        st.info("Pick two different versions to compare.")
+        return
+
+    try:
+        with st.spinner("Comparing recommendations..."):
+            old = checkout_version(*options[earlier], slot='compare_earlier')
+            new = checkout_version(*options[later], slot='compare_later')
+            keys = tuple(f"{dataset['id']}/{version_key(version)}" for dataset, version in (options[earlier], options[later]))
+            diff = compute_diff(*keys, old, new)
+    except Exception as e:
+        st.error(f"Error comparing datasets: {str(e)}")
+        return
+    totals, locations = diff['totals'], diff['locations']
+
+    # Realized versus pending
+    realized_gb, pending_gb = totals[REMOVED]['gb'], totals[UNCHANGED]['gb']
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Resolved", f"{totals[REMOVED]['actions']:,}", f"{realized_gb:,.0f} GB reclaimed", delta_color="off")
+    col2.metric("Still Pending", f"{totals[UNCHANGED]['actions']:,}", f"{pending_gb:,.0f} GB", delta_color="off")
+    col3.metric("New", f"{totals[ADDED]['actions']:,}", f"{totals[ADDED]['gb']:,.0f} GB", delta_color="off")
+    share = realized_gb / (realized_gb + pending_gb) if realized_gb + pending_gb else 0
+    col4.metric("Realized Share", f"{share:.1%}", f"${totals[REMOVED]['net_savings_usd']:,.0f} realized", delta_color="off")
+    st.caption(f"{len(old):,} earlier and {len(new):,} later recommendations compared in {diff['seconds']:.2f}s.")
+
+    # Per-location progress
+    st.subheader("📍 Realized vs Pending by Location")
+    realized, pending = f"{GROUPS[REMOVED]}_gb", f"{GROUPS[UNCHANGED]}_gb"
+    chart = locations.assign(total=locations[realized] + locations[pending]).nlargest(CHART_LOCATIONS, 'total')
+    fig = px.bar(chart, x='location', y=[realized, pending], color_discrete_sequence=['#2ecc71', '#F57C00'],
+                 labels={'location': 'Location', 'value': 'Storage (GB)', 'variable': ''})
+    fig.for_each_trace(lambda trace: trace.update(name={realized: 'Realized', pending: 'Pending'}[trace.name]))
+    fig.update_layout(barmode='stack', legend=dict(orientation='h'))
+    st.plotly_chart(fig, use_container_width=True)
+    if len(locations) > CHART_LOCATIONS:
+        st.caption(f"Showing the {CHART_LOCATIONS} locations with the most storage; the table lists all {len(locations):,}.")
+
+    st.dataframe(locations, use_container_width=True, hide_index=True)
+
+    # Row-level exports
+    st.markdown("### 📥 Export Options")
+    sources = {"Location summary": ("location_diff", lambda: iter([locations]))}
+    for status, frame in ((REMOVED, old), (UNCHANGED, new), (ADDED, new)):
+        label = STATUS_LABELS[status]
+        positions = status_positions(diff, status)
+        sources[f"{label} recommendations ({len(positions):,})"] = (
+            f"{label.lower().replace(' ', '_')}_recommendations",
+            lambda frame=frame, positions=positions: iter_chunks(frame, positions)
+        )
+    render_export("compare", sources, state=keys)
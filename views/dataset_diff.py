@@ -0,0 +1,118 @@
+# Run-to-run diff of two processed datasets, e.g. consecutive exports of the same
+# environment. Recommendations are matched on a key: those only in the later
+# dataset were added, those only in the earlier one were resolved (their storage
+# reclaimed), and those in both are still pending.
+# Streamlit is not imported, so benchmarks and workers can use it directly.
+import numpy as np
+import pandas as pd
+
+# A recommendation is identified by the VM or datastore and the file it names
+KEY_COLUMNS = ['name', 'file_name']
+LOCATION_COLUMN = 'inferred_location'
+# Columns summed per location -> names in the location summary
+VALUE_COLUMNS = {
+    'file_size_(gb)': 'gb',
+    'storage_cost_usd': 'storage_cost_usd',
+    'net_savings_usd': 'net_savings_usd'
+}
+# Row statuses, named from the later dataset's point of view
+ADDED = 'added'
+REMOVED = 'removed'
+UNCHANGED = 'unchanged'
+# Location summary groups: status -> column prefix
+GROUPS = {REMOVED: 'realized', UNCHANGED: 'pending', ADDED: 'added'}
+
+# Combined codes are refactorized before they could overflow int64
+_MAX_CODE = 2 ** 62
+
+def _combine(codes, n_codes, other, n_other):
+    if n_codes * n_other >= _MAX_CODE:
+        codes, uniques = pd.factorize(codes)
+        n_codes = len(uniques)
+    return codes.astype(np.int64) * n_other + other, n_codes * n_other
+
+def recommendation_keys(old, new):
+    """Integer keys of the recommendations in both frames, equal exactly when the key columns are.
+
+    Each key column of both frames is factorized in one hash table, so keys of
+    the two frames are comparable. Repeated keys within a frame are told apart
+    by their occurrence, so the n-th copy in one frame matches the n-th in the other.
+    """
+    missing = [col for col in KEY_COLUMNS if col not in old.columns or col not in new.columns]
+    if missing:
+        raise ValueError(f"Both datasets need the recommendation key columns; missing: {', '.join(missing)}")
+
+    keys, n_keys = np.zeros(len(old) + len(new), dtype=np.int64), 1
+    for col in KEY_COLUMNS:
+        codes, uniques = pd.factorize(pd.concat([old[col], new[col]], ignore_index=True), use_na_sentinel=False)
+        keys, n_keys = _combine(keys, n_keys, codes, len(uniques))
+
+    occurrences = []
+    for frame_keys in (keys[:len(old)], keys[len(old):]):
+        if pd.Index(frame_keys).is_unique:
+            occurrences.append(np.zeros(len(frame_keys), dtype=np.int64))
+        else:
+            occurrences.append(pd.Series(frame_keys).groupby(frame_keys).cumcount().to_numpy())
+    occurrence = np.concatenate(occurrences)
+    if occurrence.any():
+        keys, _ = _combine(keys, n_keys, occurrence, int(occurrence.max()) + 1)
+    return keys[:len(old)], keys[len(old):]
+
+def _value_arrays(df):
+    return {col: df[col].to_numpy(dtype=float, na_value=0.0) if col in df.columns else np.zeros(len(df))
+            for col in VALUE_COLUMNS}
+
+def _location_totals(df, groups):
+    """Per-location actions and value sums of each boolean mask in `groups` (prefix -> mask)."""
+    if LOCATION_COLUMN in df.columns:
+        codes, locations = pd.factorize(df[LOCATION_COLUMN], use_na_sentinel=False)
+        locations = pd.Index(locations).astype(object).where(pd.notna(locations), 'Unknown')
+    else:
+        codes, locations = np.zeros(len(df), dtype=np.intp), pd.Index(['Unknown'], dtype=object)
+    values = _value_arrays(df)
+    totals = {}
+    for prefix, mask in groups.items():
+        group_codes = codes[mask]
+        totals[f"{prefix}_actions"] = np.bincount(group_codes, minlength=len(locations))
+        for col, name in VALUE_COLUMNS.items():
+            totals[f"{prefix}_{name}"] = np.bincount(group_codes, weights=values[col][mask], minlength=len(locations))
+    # One location can appear more than once when NaN and 'Unknown' are both present
+    return pd.DataFrame(totals, index=pd.Index(locations, name='location')).groupby(level=0).sum()
+
+def diff_datasets(old, new):
+    """Hash-join two processed frames on the recommendation key and summarize the changes.
+
+    Returns {'old_matched', 'new_matched', 'totals', 'locations'}: boolean arrays
+    marking rows of each frame that are in the other, the count and value sums
+    per status, and the same per location (realized, pending and added
+    actions, GB and savings), largest realized storage first.
+    """
+    old_keys, new_keys = recommendation_keys(old, new)
+    positions = pd.Index(old_keys).get_indexer(new_keys)
+    new_matched = positions >= 0
+    old_matched = np.zeros(len(old), dtype=bool)
+    old_matched[positions[new_matched]] = True
+
+    # Resolved rows are valued as they were; pending and added ones as they are now
+    locations = pd.concat([
+        _location_totals(old, {GROUPS[REMOVED]: ~old_matched}),
+        _location_totals(new, {GROUPS[UNCHANGED]: new_matched, GROUPS[ADDED]: ~new_matched})
+    ], axis=1).fillna(0)
+    action_columns = [col for col in locations.columns if col.endswith('_actions')]
+    locations[action_columns] = locations[action_columns].astype(np.int64)
+    locations = locations.sort_values(f"{GROUPS[REMOVED]}_gb", ascending=False).reset_index()
+
+    totals = {}
+    for status, prefix in GROUPS.items():
+        totals[status] = {'actions': int(locations[f"{prefix}_actions"].sum())}
+        totals[status].update({name: float(locations[f"{prefix}_{name}"].sum()) for name in VALUE_COLUMNS.values()})
+    return {'old_matched': old_matched, 'new_matched': new_matched, 'totals': totals, 'locations': locations}
+
+def status_positions(diff, status):
+    """Row positions of the recommendations with `status`, in the earlier frame for
+    REMOVED and in the later frame otherwise."""
+    if status == REMOVED:
+        return np.flatnonzero(~diff['old_matched'])
+    if status == ADDED:
+        return np.flatnonzero(~diff['new_matched'])
+    return np.flatnonzero(diff['new_matched'])
@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime
+from views.versioned_store import get_version, publish, read_manifest, store_lock, write_json_atomic
+
+# Every processed dataset lives in its own versioned store, <root>/<owner>/<dataset id>/.
+# A small index at <root>/index.json lists them all, so the UI can list and open
+# datasets without walking the directory tree:
+#   {"datasets": {"<id>": {"id", "name", "owner", "created", "updated", "current", "rows", "bytes"}}}
+DATASETS_ROOT = 'outputs/datasets'
+INDEX_NAME = 'index.json'
+# Least recently updated datasets are removed once all datasets together exceed this,
+# counting files derived from a version after it was published, like its SQLite copy.
+# Datasets that sessions are reading are passed in as `keep` and never removed.
+QUOTA_BYTES = 5 * 1024 ** 3
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')[:40] or 'dataset'
+
+def _directory_bytes(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+    return total
+
+def read_index(root=DATASETS_ROOT):
+    """The dataset index; an empty one if no dataset has been published yet."""
+    try:
+        with open(os.path.join(root, INDEX_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'datasets': {}}
+
+def dataset_store(entry, root=DATASETS_ROOT):
+    """Directory of a dataset's versioned store."""
+    return os.path.join(root, _slug(entry['owner']), entry['id'])
+
+def list_datasets(root=DATASETS_ROOT):
+    """Index entries, most recently updated first."""
+    return sorted(read_index(root)['datasets'].values(), key=lambda d: d['updated'], reverse=True)
+
+def _enforce_quota(root, index, keep, quota_bytes):
+    """Remove least recently updated datasets not in `keep` until the total fits the quota; returns their ids."""
+    removed = []
+    total = sum(d['bytes'] for d in index['datasets'].values())
+    for entry in sorted(index['datasets'].values(), key=lambda d: d['updated']):
+        if total <= quota_bytes:
+            break
+        if entry['id'] in keep:
+            continue
+        shutil.rmtree(dataset_store(entry, root), ignore_errors=True)
+        del index['datasets'][entry['id']]
+        total -= entry['bytes']
+        removed.append(entry['id'])
+    return removed
+
+def publish_dataset(owner, name, write_files, root=DATASETS_ROOT, if_empty=False,
+                    quota_bytes=QUOTA_BYTES, keep=(), **metadata):
+    """Publish a version of the dataset `name` owned by `owner`, creating the dataset if needed.
+
+    Returns (dataset entry, version entry), or None when `if_empty` is set and
+    the index already lists datasets. Files are written outside the index lock;
+    datasets over the quota are removed afterwards, never the one just published
+    or those in `keep`. With `quota_bytes` None the quota is left to a later
+    enforce_quota, e.g. from a process that knows which datasets are in use.
+    """
+    os.makedirs(root, exist_ok=True)
+    index_path = os.path.join(root, INDEX_NAME)
+    with store_lock(root):
+        index = read_index(root)
+        if if_empty and index['datasets']:
+            return None
+        entry = next((d for d in index['datasets'].values() if d['owner'] == owner and d['name'] == name), None)
+        if entry is None:
+            now = datetime.now().isoformat(timespec='seconds')
+            entry = {'id': f"{_slug(name)}-{uuid.uuid4().hex[:6]}", 'name': name, 'owner': owner,
+                     'created': now, 'updated': now, 'current': None, 'rows': None, 'bytes': 0}
+            index['datasets'][entry['id']] = entry
+            write_json_atomic(index_path, index)
+
+    store = dataset_store(entry, root)
+    version = publish(store, write_files, **metadata)
+
+    with store_lock(root):
+        index = read_index(root)
+        entry = index['datasets'].setdefault(entry['id'], entry)
+        if version['version'] >= (entry['current'] or 0):
+            entry.update(current=version['version'], rows=version.get('rows'),
+                         updated=version['created'])
+        entry['bytes'] = _directory_bytes(store)
+        if quota_bytes is not None:
+            _enforce_quota(root, index, {entry['id'], *keep}, quota_bytes)
+        write_json_atomic(index_path, index)
+    return entry, version
+
+def enforce_quota(root=DATASETS_ROOT, quota_bytes=QUOTA_BYTES, keep=()):
+    """Remove least recently updated datasets not in `keep` until all fit the quota; returns their ids."""
+    with store_lock(root):
+        index = read_index(root)
+        removed = _enforce_quota(root, index, set(keep), quota_bytes)
+        if removed:
+            write_json_atomic(os.path.join(root, INDEX_NAME), index)
+    return removed
+
+def recount_dataset(dataset_id, root=DATASETS_ROOT, quota_bytes=QUOTA_BYTES, keep=()):
+    """Recount a dataset's bytes after files were added to one of its versions and enforce the quota.
+
+    Like publish_dataset, this never removes the dataset itself or those in `keep`.
+    """
+    with store_lock(root):
+        index = read_index(root)
+        entry = index['datasets'].get(dataset_id)
+        if entry is None:
+            return
+        entry['bytes'] = _directory_bytes(dataset_store(entry, root))
+        _enforce_quota(root, index, {dataset_id, *keep}, quota_bytes)
+        write_json_atomic(os.path.join(root, INDEX_NAME), index)
+
+def delete_dataset(dataset_id, root=DATASETS_ROOT):
+    """Remove a dataset and its index entry."""
+    with store_lock(root):
+        index = read_index(root)
+        entry = index['datasets'].pop(dataset_id, None)
+        if entry is not None:
+            shutil.rmtree(dataset_store(entry, root), ignore_errors=True)
+            write_json_atomic(os.path.join(root, INDEX_NAME), index)
+
+def open_version(entry, number=None, root=DATASETS_ROOT):
+    """Manifest entry of a dataset version (the current one by default); None if unavailable."""
+    return get_version(dataset_store(entry, root), number)
+
+def list_versions(entry, root=DATASETS_ROOT):
+    """Manifest entries of a dataset's available versions, newest first."""
+    return sorted(read_manifest(dataset_store(entry, root))['versions'], key=lambda v: v['version'], reverse=True)
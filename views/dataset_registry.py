@@ -0,0 +1,206 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Session state key holding this session's dataset handles: slot -> DatasetHandle
+HANDLES_KEY = '_dataset_handles'
+
+def frame_nbytes(df):
+    """Deep memory footprint of a DataFrame in bytes."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+class DatasetRegistry:
+    """Process-wide registry holding one shared DataFrame per dataset version.
+
+    Sessions hold references through handles; a version is dropped once no
+    session references it and a newer version of the same slot has been loaded.
+    Shared frames are never modified: sessions get shallow copy-on-write views,
+    so adding or overwriting columns in a view copies only that column.
+    """
+
+    def __init__(self):
+        self._entries = {}  # version -> {'slot', 'df', 'nbytes', 'refs', 'views' (id -> view)}
+        self._latest = {}   # slot -> latest version
+        self._loading = {}  # version -> lock held while the version loads
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, slot, version, loader, acquire=False):
+        """The shared frame for `version`, loading it with `loader()` on first use.
+
+        Concurrent sessions asking for the same version wait for a single load.
+        With `acquire`, a reference is taken in the same step, so the version
+        cannot be evicted in between.
+        """
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is not None:
+                entry['refs'] += acquire
+                return entry['df']
+            load_lock = self._loading.setdefault(version, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(version)
+                if entry is not None:
+                    entry['refs'] += acquire
+            if entry is None:
+                df = loader()
+                entry = {'slot': slot, 'df': df, 'nbytes': frame_nbytes(df), 'refs': 0,
+                         'views': weakref.WeakValueDictionary()}
+                with self._lock:
+                    entry['refs'] += acquire
+                    self._entries[version] = entry
+                    self._loading.pop(version, None)
+                    self.loads += 1
+                    previous = self._latest.get(slot)
+                    self._latest[slot] = version
+                    if previous is not None and previous != version:
+                        self._evict_unused(previous)
+        return entry['df']
+
+    def share(self, version):
+        """A shallow view of the shared frame for this session's use."""
+        with self._lock:
+            entry = self._entries[version]
+        view = entry['df'].copy(deep=False)
+        entry['views'][id(view)] = view
+        return view
+
+    def release(self, version):
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            self._evict_unused(version)
+
+    def _evict_unused(self, version):
+        # Called with the lock held; the latest version of a slot stays loaded for new sessions
+        entry = self._entries.get(version)
+        if entry is not None and entry['refs'] <= 0 and self._latest.get(entry['slot']) != version:
+            del self._entries[version]
+            self.evictions += 1
+
+    def referenced(self):
+        """Versions at least one session holds a reference to."""
+        with self._lock:
+            return [version for version, entry in self._entries.items() if entry['refs'] > 0]
+
+    def is_shared(self, df):
+        """Whether `df` is a shared frame or a view handed out by the registry."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return any(df is entry['df'] or entry['views'].get(id(df)) is df for entry in entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'datasets': [
+                    {'slot': entry['slot'], 'version': version, 'rows': len(entry['df']),
+                     'bytes': entry['nbytes'], 'refs': entry['refs']}
+                    for version, entry in self._entries.items()
+                ],
+                'bytes': sum(entry['nbytes'] for entry in self._entries.values()),
+                'loads': self.loads,
+                'evictions': self.evictions
+            }
+
+    def entry_stats(self, version):
+        with self._lock:
+            entry = self._entries.get(version)
+            return None if entry is None else {'bytes': entry['nbytes'], 'refs': entry['refs']}
+
+class DatasetHandle:
+    """A session's reference to one dataset version, released when the handle is dropped.
+
+    Handles live in session state, so a reference also goes away when the
+    session ends and its state is garbage collected.
+    """
+
+    def __init__(self, registry, version):
+        self.version = version
+        self._finalizer = weakref.finalize(self, registry.release, version)
+
+    def release(self):
+        self._finalizer()
+
+@st.cache_resource
+def get_dataset_registry():
+    """Process-wide dataset registry shared by all sessions."""
+    return DatasetRegistry()
+
+def checkout_dataset(slot, version, loader):
+    """This session's view of dataset `version` in `slot`, shared with every other session.
+
+    The session holds one reference per slot; checking out a new version
+    releases the reference to the previous one.
+    """
+    registry = get_dataset_registry()
+    handles = st.session_state.setdefault(HANDLES_KEY, {})
+    handle = handles.get(slot)
+    if handle is None or handle.version != version:
+        registry.get(slot, version, loader, acquire=True)
+        handles[slot] = DatasetHandle(registry, version)
+        if handle is not None:
+            handle.release()
+    return registry.share(version)
+
+def _private_nbytes(value, registry, seen, depth=0):
+    """Bytes held by frames, arrays and binary payloads in `value`, skipping shared datasets."""
+    if id(value) in seen or depth > 3:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return 0 if registry.is_shared(value) else frame_nbytes(value)
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_private_nbytes(v, registry, seen, depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_private_nbytes(v, registry, seen, depth + 1) for v in value)
+    return 0
+
+def session_memory():
+    """Memory attributed to the current session.
+
+    Shared datasets are split evenly between the sessions referencing them;
+    private bytes are data the session keeps for itself (uploads, exports, reports).
+    """
+    registry = get_dataset_registry()
+    shared = 0
+    for handle in st.session_state.get(HANDLES_KEY, {}).values():
+        entry = registry.entry_stats(handle.version)
+        if entry is not None:
+            shared += entry['bytes'] / max(entry['refs'], 1)
+    seen = set()
+    private = sum(_private_nbytes(st.session_state[key], registry, seen)
+                  for key in list(st.session_state.keys()) if key != HANDLES_KEY)
+    return {'shared': shared, 'private': private}
+
+def render_memory_usage():
+    """Show shared dataset memory and this session's share of it."""
+    stats = get_dataset_registry().stats()
+    usage = session_memory()
+    mb = 1024 * 1024
+    st.caption(
+        f"🧠 Shared datasets: {len(stats['datasets'])} loaded · {stats['bytes']/mb:,.1f} MB · "
+        f"{stats['loads']:,} loads / {stats['evictions']:,} evictions"
+    )
+    st.caption(
+        f"This session: {usage['shared']/mb:,.1f} MB share of shared data · "
+        f"{usage['private']/mb:,.1f} MB private"
+    )
+    if stats['datasets']:
+        st.dataframe(pd.DataFrame([
+            {'Dataset': d['slot'],
+             'Rows': d['rows'], 'Size (MB)': round(d['bytes'] / mb, 1), 'Sessions': d['refs']}
+            for d in stats['datasets']
+        ]), hide_index=True, use_container_width=True)
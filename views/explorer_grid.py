@@ -0,0 +1,54 @@
+import streamlit as st
+from views.helpers import dataset_fingerprint
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 100
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _sort_index(fingerprint, _df, column, ascending):
+    order = _df[column].reset_index(drop=True).sort_values(ascending=ascending, kind='stable', na_position='last')
+    order = order.index.to_numpy()
+    order.setflags(write=False)
+    return order
+
+def sort_index(df, column, ascending):
+    """Row positions of the whole frame sorted by `column`, cached per dataset and sort key.
+
+    Filtering keeps this order, so a filter change never re-sorts the data.
+    """
+    return _sort_index(dataset_fingerprint(df), df, column, ascending)
+
+def ordered_positions(mask, order):
+    """Positions of rows selected by `mask`, in `order`."""
+    return order[mask[order]]
+
+def render_pagination(total, key, reset_on=None):
+    """Page size and page number controls. Returns the (start, stop) slice of the current page.
+
+    The page goes back to 1 whenever `reset_on` changes (e.g. filters or sort order).
+    """
+    size_key, page_key, signature_key = f"{key}_page_size", f"{key}_page", f"{key}_signature"
+    page_size = st.session_state.get(size_key, DEFAULT_PAGE_SIZE)
+    n_pages = max(1, -(-total // page_size))
+
+    # Clamp before the widget is created so a shrinking result never exceeds the last page
+    if st.session_state.get(signature_key) != reset_on:
+        st.session_state[signature_key] = reset_on
+        st.session_state[page_key] = 1
+    st.session_state[page_key] = min(max(1, st.session_state.get(page_key, 1)), n_pages)
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=size_key)
+    with col2:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    with col3:
+        st.caption(f"Showing rows {start + 1 if total else 0:,}–{stop:,} of {total:,}")
+    return start, stop
+
+def page_frame(df, positions, start, stop, columns):
+    """Materialize only the rows on the current page."""
+    return df.iloc[positions[start:stop]][columns]
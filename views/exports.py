@@ -0,0 +1,243 @@
+import gzip
+import io
+import time
+import zipfile
+import pandas as pd
+import streamlit as st
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+CHUNK_ROWS = 100_000
+# Fast deflate: about 4x quicker than the default level for ~10% larger files
+COMPRESS_LEVEL = 1
+
+# Export file formats: label -> (extension, MIME type)
+FILE_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'CSV (zip)': ('zip', 'application/zip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+
+# Excel number formats by column name; other numeric and date columns fall back to their dtype
+EXCEL_FORMATS = {
+    'confidence_score': '0.0%',
+    'confidence_location': '0.0%',
+    'confidence_type': '0.0%'
+}
+EXCEL_MAX_ROWS = 1_048_575  # per sheet, below the header row
+
+def iter_chunks(df, positions=None, columns=None, transform=None, chunk_rows=CHUNK_ROWS):
+    """Yield `df` (or the rows at `positions`) a chunk of rows at a time, optionally transformed.
+
+    Only one chunk is materialized at a time; an empty selection still yields one empty chunk.
+    """
+    n_rows = len(df) if positions is None else len(positions)
+    for start in range(0, max(n_rows, 1), chunk_rows):
+        if positions is None:
+            chunk = df.iloc[start:start + chunk_rows]
+        else:
+            chunk = df.iloc[positions[start:start + chunk_rows]]
+        if columns is not None:
+            chunk = chunk[columns]
+        yield transform(chunk) if transform is not None else chunk
+
+def _write_csv(chunks, stream):
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        stream.write(chunk.to_csv(index=False, header=i == 0).encode('utf-8'))
+        rows += len(chunk)
+    return rows
+
+def _write_parquet(chunks, stream):
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(stream, table.schema, compression='zstd')
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def excel_number_format(column, dtype):
+    """Excel number format for a column, or None to leave the cells unformatted."""
+    name = str(column).lower()
+    if column in EXCEL_FORMATS:
+        return EXCEL_FORMATS[column]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'yyyy-mm-dd'
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return None
+    if 'usd' in name:
+        return '"$"#,##0.00'
+    if 'aed' in name:
+        return '"AED "#,##0.00'
+    return '#,##0' if pd.api.types.is_integer_dtype(dtype) else '#,##0.00'
+
+def _chunk_rows(chunk):
+    """Row tuples of plain Python values, with missing values as None."""
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col].to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = None
+        columns.append(values)
+    return zip(*columns)
+
+def _start_sheet(wb, name, columns, formats):
+    """Add a write-only sheet with a bold, frozen header; returns it with one template cell per column."""
+    ws = wb.create_sheet(name)
+    ws.freeze_panes = 'A2'
+    for i, col in enumerate(columns, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(max(len(str(col)) + 2, 12), 50)
+    header = [WriteOnlyCell(ws, value=str(col)) for col in columns]
+    for cell in header:
+        cell.font = Font(bold=True)
+    ws.append(header)
+
+    templates = []
+    for fmt in formats:
+        cell = None
+        if fmt is not None:
+            cell = WriteOnlyCell(ws)
+            cell.number_format = fmt
+        templates.append(cell)
+    return ws, templates
+
+def _fill(cell, value):
+    cell.value = value
+    return cell
+
+def _write_excel(sheets, stream):
+    """Write (sheet name, chunks) pairs with a write-only workbook, which streams rows to disk.
+
+    Each formatted column gets one styled template cell that is refilled row by row, so
+    number formats are set per column rather than by formatting strings. A sheet that
+    outgrows Excel's row limit continues on "<name> (2)", "<name> (3)", ...
+    Returns the number of data rows written per sheet name.
+    """
+    wb = Workbook(write_only=True)
+    counts = {}
+    for name, chunks in sheets:
+        counts[name], part, written = 0, 0, EXCEL_MAX_ROWS
+        for chunk in chunks:
+            if part == 0:
+                columns = list(chunk.columns)
+                formats = [excel_number_format(col, chunk[col].dtype) for col in columns]
+            for row in _chunk_rows(chunk):
+                if written == EXCEL_MAX_ROWS or part == 0:
+                    part += 1
+                    ws, templates = _start_sheet(wb, name if part == 1 else f"{name} ({part})", columns, formats)
+                    written = 0
+                # Rows are serialized on append, so the template cells can be reused; empty values are skipped
+                ws.append([value if cell is None or value is None else _fill(cell, value)
+                           for cell, value in zip(templates, row)])
+                written += 1
+            counts[name] += len(chunk)
+        if part == 0:
+            # Header-only sheet for an empty frame
+            _start_sheet(wb, name, columns, formats)
+    wb.save(stream)
+    return counts
+
+def write_export(chunks, file_format, stream, entry_name='export.csv', sheets=None):
+    """Stream `chunks` into `stream` in `file_format`, compressing as it goes. Returns the row count.
+
+    Peak memory is one chunk plus the output, never the whole uncompressed file.
+    `entry_name` names the CSV inside a zip export; `sheets` maps extra Excel sheet
+    names to small frames written after the "Data" sheet.
+    """
+    if file_format == 'CSV':
+        return _write_csv(chunks, stream)
+    if file_format == 'CSV (gzip)':
+        with gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=COMPRESS_LEVEL, mtime=0) as gz:
+            return _write_csv(chunks, gz)
+    if file_format == 'CSV (zip)':
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+            with zf.open(entry_name, 'w', force_zip64=True) as entry:
+                return _write_csv(chunks, entry)
+    if file_format == 'Parquet':
+        return _write_parquet(chunks, stream)
+    if file_format == 'Excel':
+        extra = [(name, [frame]) for name, frame in (sheets or {}).items()]
+        return _write_excel([('Data', chunks)] + extra, stream)['Data']
+    raise ValueError(f"Unknown export format: {file_format}")
+
+def build_export(chunks, file_format, file_stem, sheets=None):
+    """Build an export file in memory and time it."""
+    extension, mime = FILE_FORMATS[file_format]
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    rows = write_export(chunks, file_format, buffer, entry_name=f"{file_stem}.csv", sheets=sheets)
+    data = buffer.getvalue()
+    return {
+        'data': data,
+        'file_name': f"{file_stem}.{extension}",
+        'mime': mime,
+        'rows': rows,
+        'size': len(data),
+        'seconds': time.perf_counter() - start
+    }
+
+def format_size(n_bytes):
+    for unit in ['B', 'KB', 'MB']:
+        if n_bytes < 1024:
+            return f"{n_bytes:,.0f} {unit}" if unit == 'B' else f"{n_bytes:,.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:,.1f} GB"
+
+def render_export(key, sources, state=None, sheets=None):
+    """Export controls: pick the content and format, generate on click, then download.
+
+    `sources` maps a content label to (file stem, callable returning an iterator of chunks).
+    `sheets` optionally returns extra {sheet name: frame} for Excel exports.
+    Nothing is built until the button is pressed; the generated file is kept in the
+    session until `state`, the content or the format changes.
+    """
+    source = next(iter(sources))
+    col1, col2 = st.columns(2)
+    if len(sources) > 1:
+        with col1:
+            source = st.selectbox("Content", list(sources), key=f"{key}_source")
+    with col2 if len(sources) > 1 else col1:
+        file_format = st.selectbox("Format", list(FILE_FORMATS), key=f"{key}_format")
+
+    export_key = f"{key}_export"
+    request = (state, source, file_format)
+    export = st.session_state.get(export_key)
+    if export is None or export['request'] != request:
+        # Drop a file built for earlier settings so it doesn't linger in the session
+        st.session_state.pop(export_key, None)
+        if st.button(f"📦 Generate {file_format} Export", key=f"{key}_generate"):
+            file_stem, make_chunks = sources[source]
+            try:
+                with st.spinner(f"Generating {file_format} export..."):
+                    extra_sheets = sheets() if sheets is not None and file_format == 'Excel' else None
+                    export = build_export(make_chunks(), file_format, file_stem, sheets=extra_sheets)
+            except Exception as e:
+                st.error(f"Error generating export: {str(e)}")
+                return
+            export['request'] = request
+            st.session_state[export_key] = export
+            st.rerun()
+        return
+
+    st.download_button(
+        label=f"📥 Download {export['file_name']}",
+        data=export['data'],
+        file_name=export['file_name'],
+        mime=export['mime'],
+        key=f"{key}_download",
+        on_click="ignore"
+    )
+    st.caption(f"{format_size(export['size'])} · {export['rows']:,} rows · generated in {export['seconds']:.1f}s")
@@ -0,0 +1,102 @@
+import streamlit as st
+import plotly.io as pio
+import threading
+from collections import OrderedDict
+from views.helpers import dataset_fingerprint
+from views.chart_data import remember_payload_bytes
+
+# Maximum number of serialized figure specs kept per server process
+DEFAULT_MAX_ENTRIES = 256
+
+class FigureCache:
+    """Thread-safe LRU cache of serialized Plotly figure specs with hit-rate statistics.
+
+    Entries keep the spec's size in bytes next to it, so figures served from the
+    cache report their payload size without being serialized again.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (spec, bytes), or None for an empty figure
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, builder):
+        """Return the cached figure for `key`, building and storing it on a miss.
+
+        `builder` may return None (e.g. not enough data to plot); that result is cached too.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry = self._entries[key]
+                if entry is None:
+                    return None
+                fig = pio.from_json(entry[0])
+                return remember_payload_bytes(fig, entry[1])
+            self.misses += 1
+
+        fig = builder()
+        entry = None
+        if fig is not None:
+            spec = fig.to_json()
+            entry = (spec, len(spec.encode('utf-8')))
+            remember_payload_bytes(fig, entry[1])
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes': sum(entry[1] for entry in self._entries.values() if entry is not None)
+            }
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide figure cache shared by all sessions."""
+    return FigureCache()
+
+def cached_figure(df, name, builder, filters=None, settings=None, settings_keys=()):
+    """Build a figure through the shared cache.
+
+    The cache key combines the dataset fingerprint, the chart name, the filter
+    state that shapes the chart and the subset of settings it depends on.
+    """
+    settings = settings or {}
+    key = (
+        dataset_fingerprint(df),
+        name,
+        tuple(sorted((filters or {}).items())),
+        tuple((k, settings.get(k)) for k in settings_keys)
+    )
+    return get_figure_cache().get_or_build(key, builder)
+
+def render_cache_stats():
+    """Show figure cache hit-rate statistics."""
+    stats = get_figure_cache().stats()
+    st.caption(
+        f"⚡ Figure cache: {stats['hits']:,} hits / {stats['misses']:,} misses "
+        f"({stats['hit_rate']*100:.0f}% hit rate) · {stats['entries']}/{stats['max_entries']} entries · "
+        f"{stats['bytes']/1024:,.0f} KB"
+    )
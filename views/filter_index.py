@@ -0,0 +1,77 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from views.helpers import dataset_fingerprint
+
+class FilterIndex:
+    """Ingest-time indexes that resolve explorer filters to row bitmaps without scanning the frame.
+
+    Categorical columns are factorized once: the option list comes from the
+    categories and a selection becomes a lookup over the integer codes. Each
+    value's row positions are kept in sorted order. Dates are kept as a sorted
+    int64 array, so a date range resolves with two binary searches.
+    """
+
+    def __init__(self, df, columns=('location_type', 'inferred_location'), date_column='created_date'):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.categories = {}
+        self.positions = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, categories = pd.factorize(df[col], sort=True)
+            self.codes[col] = codes
+            self.categories[col] = categories.tolist()
+            # Row positions grouped by value, each group in ascending row order
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+            self.positions[col] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(self.categories[col])
+            }
+
+        self.date_order = None
+        if date_column in df.columns:
+            dates = pd.to_datetime(df[date_column], errors='coerce').to_numpy().astype('datetime64[ns]')
+            valid = np.flatnonzero(~np.isnat(dates))
+            if len(valid):
+                order = valid[np.argsort(dates[valid], kind='stable')]
+                self.date_order = order
+                self.sorted_dates = dates[order]
+
+    def options(self, column):
+        """Sorted distinct non-null values of `column`."""
+        return self.categories.get(column, [])
+
+    def value_mask(self, column, selected):
+        """Row bitmap for rows whose `column` is one of `selected`."""
+        lookup = np.zeros(len(self.categories[column]) + 1, dtype=bool)
+        wanted = set(selected)
+        lookup[:-1] = [value in wanted for value in self.categories[column]]
+        # Missing values have code -1, which indexes the trailing False
+        return lookup[self.codes[column]]
+
+    def value_positions(self, column, value):
+        """Sorted row positions holding `value` in `column`."""
+        return self.positions[column].get(value, np.empty(0, dtype=np.intp))
+
+    def date_bounds(self):
+        if self.date_order is None:
+            return None
+        return pd.Timestamp(self.sorted_dates[0]), pd.Timestamp(self.sorted_dates[-1])
+
+    def date_mask(self, start, end):
+        """Row bitmap for rows dated within [start, end]."""
+        lo = np.searchsorted(self.sorted_dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        hi = np.searchsorted(self.sorted_dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.date_order[lo:hi]] = True
+        return mask
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _build_filter_index(fingerprint, _df):
+    return FilterIndex(_df)
+
+def get_filter_index(df):
+    """Filter index for a dataset, built once per dataset fingerprint."""
+    return _build_filter_index(dataset_fingerprint(df), df)
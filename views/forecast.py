@@ -4,45 +4,45 @@ import numpy as np
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
-import os
-from views.helpers import load_processed_data
+from views.helpers import load_processed_data, initialize_settings, dataset_fingerprint
+from views.figure_cache import cached_figure, render_cache_stats
+from views.forecasting import BACKTEST_HORIZON, MIN_TRAIN_MONTHS, forecast_dataset
+
+# Settings that shape the forecast frame and therefore the forecast charts
+FORECAST_SETTINGS_KEYS = (
+    'implementation_months', 'forecast_growth_rate', 'cost_per_gb', 'energy_kwh', 'cooling', 'co2_rate',
+    'min_minutes', 'min_rate_aed', 'conversion_rate', 'turbo_pct', 'turbo_unit_cost_usd', 'aap_unit_cost_usd'
+)
+
+STATISTICAL = "Statistical (monthly history)"
+PLAN = "Implementation plan"
+BEST_MODEL = "Best in backtest"
+BACKTEST_COLUMNS = {'model': 'Model', 'origins': 'Origins', 'mae': 'MAE', 'rmse': 'RMSE',
+                    'wape': 'WAPE', 'location_wape': 'Location WAPE'}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def statistical_forecast(fingerprint, _df):
+    """Backtest and forecasts of every model for a dataset, computed once per dataset fingerprint."""
+    return forecast_dataset(_df)
 
 def render():
     st.title("📈 Storage Optimization Forecast")
     
-    # Check if data has been processed or exists in outputs
-    if 'processed_df' not in st.session_state:
-        output_path = "outputs/processed_output.csv"
-        if os.path.exists(output_path):
-            try:
-                df = pd.read_csv(output_path)
-                st.session_state['processed_df'] = df
-                st.success("✅ Loaded previously processed data from outputs directory.")
-            except Exception as e:
-                st.error(f"Error loading processed data: {str(e)}")
-                st.warning("""
-                ⚠️ No data available for forecast.
-                
-                To view the forecast:
-                1. Go to the **Upload & Process** tab
-                2. Upload your Turbonomic Excel file
-                3. Process the data
-                4. Return to this tab to view the forecast
-                """)
-                return
-        else:
-            st.warning("""
-            ⚠️ No data available for forecast.
-            
-            To view the forecast:
-            1. Go to the **Upload & Process** tab
-            2. Upload your Turbonomic Excel file
-            3. Process the data
-            4. Return to this tab to view the forecast
-            """)
-            return
+    # The shared dataset from the registry; sessions keep a view, not a copy
+    df = load_processed_data()
+    if df is None:
+        st.warning("""
+        ⚠️ No data available for forecast.
+        
+        To view the forecast:
+        1. Go to the **Upload & Process** tab
+        2. Upload your Turbonomic Excel file
+        3. Process the data
+        4. Return to this tab to view the forecast
+        """)
+        return
 
-    df = st.session_state['processed_df']
+    initialize_settings()
     settings = st.session_state.settings
 
     # Add a refresh button to recalculate forecast
@@ -54,40 +54,64 @@ def render():
     avg_storage_gb = df['file_size_(gb)'].mean()
     total_actions = len(df)
     base_actions = total_actions / df['roi_month'].nunique()  # Average actions per month from historical data
-    
-    # Create forecast DataFrame
-    months = pd.date_range(start=datetime.today(), periods=12, freq='MS')
-    forecast = pd.DataFrame({'Month': months})
-    
+
     # Calculate actions for each phase
     implementation_months = settings['implementation_months']
     ongoing_monthly_actions = base_actions * 0.15  # 15% of historical monthly average
-    
-    # Initialize actions array
-    actions_array = np.zeros(12)
-    
-    # Fill implementation phase
-    if implementation_months > 0:
-        monthly_implementation_actions = total_actions / implementation_months
-        actions_array[:implementation_months] = monthly_implementation_actions
-    
-    # Fill ongoing phase with 15% of monthly average
-    actions_array[implementation_months:] = ongoing_monthly_actions
-    
-    # Apply growth rate to ongoing phase only
-    month_range = np.arange(12 - implementation_months)  # Only for ongoing phase
-    growth_factor = (1 + settings['forecast_growth_rate'])
-    growth_multiplier = growth_factor ** month_range
-    
-    # Only apply growth to ongoing phase
-    if implementation_months < 12:
-        actions_array[implementation_months:] *= growth_multiplier
-    
-    # Assign to forecast DataFrame
-    forecast['Actions'] = actions_array
-    
+
+    # Statistical forecasts are fitted to the monthly history per location, once per dataset
+    method = st.radio("Forecast method", [STATISTICAL, PLAN], horizontal=True, key="forecast_method")
+    stats = None
+    if method == STATISTICAL:
+        with st.spinner("Fitting forecast models..."):
+            stats = statistical_forecast(dataset_fingerprint(df), df)
+        if stats is None or stats['best']['actions'] is None:
+            history_months = 0 if stats is None else len(stats['months'])
+            st.info(f"The statistical forecast needs at least {MIN_TRAIN_MONTHS + BACKTEST_HORIZON} months of "
+                    f"roi_month history to backtest its models; this dataset has {history_months}. "
+                    "Showing the implementation plan instead.")
+            stats = None
+
+    if stats is not None:
+        # Only backtested models are offered, so the chosen one always has scores
+        model_choice = st.selectbox("Model", [BEST_MODEL] + list(stats['backtest']['actions']['model']),
+                                    key="forecast_model")
+        models = {name: stats['best'][name] if model_choice == BEST_MODEL else model_choice for name in ('actions', 'gb')}
+        forecast = pd.DataFrame({
+            'Month': stats['future'].to_timestamp(),
+            'Actions': stats['forecasts']['actions'][models['actions']].sum(axis=0),
+            'Reclaimable Storage (GB)': stats['forecasts']['gb'][models['gb']].sum(axis=0)
+        })
+    else:
+        # Create forecast DataFrame
+        months = pd.date_range(start=datetime.today(), periods=12, freq='MS')
+        forecast = pd.DataFrame({'Month': months})
+    
+        # Initialize actions array
+        actions_array = np.zeros(12)
+    
+        # Fill implementation phase
+        if implementation_months > 0:
+            monthly_implementation_actions = total_actions / implementation_months
+            actions_array[:implementation_months] = monthly_implementation_actions
+    
+        # Fill ongoing phase with 15% of monthly average
+        actions_array[implementation_months:] = ongoing_monthly_actions
+    
+        # Apply growth rate to ongoing phase only
+        month_range = np.arange(12 - implementation_months)  # Only for ongoing phase
+        growth_factor = (1 + settings['forecast_growth_rate'])
+        growth_multiplier = growth_factor ** month_range
+    
+        # Only apply growth to ongoing phase
+        if implementation_months < 12:
+            actions_array[implementation_months:] *= growth_multiplier
+    
+        # Assign to forecast DataFrame
+        forecast['Actions'] = actions_array
+        forecast['Reclaimable Storage (GB)'] = forecast['Actions'] * avg_storage_gb
+
     # Calculate storage metrics
-    forecast['Reclaimable Storage (GB)'] = forecast['Actions'] * avg_storage_gb
     forecast['Storage Savings (USD)'] = (
         forecast['Reclaimable Storage (GB)'] * 
         settings['cost_per_gb'] * 
@@ -141,133 +165,68 @@ def render():
     # Create metrics columns
     col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.metric(
-            "Average Storage per Action",
-            f"{avg_storage_gb:.2f} GB",
-            help="Average storage space that can be reclaimed per action"
-        )
+    if stats is not None:
+        scores = stats['backtest']['actions'].set_index('model')
+        with col1:
+            st.metric(
+                "Months of History",
+                f"{len(stats['months'])}",
+                help=f"Monthly recommendations by roi_month, {stats['months'][0]} to {stats['months'][-1]}"
+            )
+
+        with col2:
+            st.metric(
+                "Base Actions per Month",
+                f"{base_actions:.0f}",
+                help="Average number of actions per month from historical data"
+            )
+
+        with col3:
+            st.metric(
+                "Actions Model",
+                models['actions'],
+                help=f"Model forecasting monthly actions per location; reclaimable storage uses {models['gb']}"
+            )
+
+        with col4:
+            st.metric(
+                "Backtest WAPE",
+                f"{scores.loc[models['actions'], 'wape']:.1%}",
+                help="Total absolute error of the monthly actions forecast over total actual actions in the backtest"
+            )
+    else:
+        with col1:
+            st.metric(
+                "Average Storage per Action",
+                f"{avg_storage_gb:.2f} GB",
+                help="Average storage space that can be reclaimed per action"
+            )
         
-    with col2:
-        st.metric(
-            "Base Actions per Month",
-            f"{base_actions:.0f}",
-            help="Average number of actions per month from historical data"
-        )
+        with col2:
+            st.metric(
+                "Base Actions per Month",
+                f"{base_actions:.0f}",
+                help="Average number of actions per month from historical data"
+            )
         
-    with col3:
-        st.metric(
-            "Implementation Actions/Month",
-            f"{(total_actions/implementation_months):.0f}",
-            help="Actions per month during implementation phase"
-        )
+        with col3:
+            st.metric(
+                "Implementation Actions/Month",
+                f"{(total_actions/implementation_months):.0f}",
+                help="Actions per month during implementation phase"
+            )
         
-    with col4:
-        st.metric(
-            "Ongoing Actions/Month",
-            f"{ongoing_monthly_actions:.0f}",
-            help="Expected actions per month after implementation (15% of base)"
-        )
-    
-    # Display forecast charts
-    st.markdown("### 📈 12-Month Forecast")
-    
-    # Actions and Storage Chart
-    fig1 = go.Figure()
-    
-    # Add Actions line
-    fig1.add_trace(go.Scatter(
-        x=forecast['Month'],
-        y=forecast['Actions'],
-        name='Actions',
-        line=dict(color='#3498db')
-    ))
-    
-    # Add Storage line
-    fig1.add_trace(go.Scatter(
-        x=forecast['Month'],
-        y=forecast['Reclaimable Storage (GB)'],
-        name='Reclaimable Storage (GB)',
-        line=dict(color='#2ecc71'),
-        yaxis='y2'
-    ))
-    
-    # Add implementation end marker using shapes
-    if implementation_months < 12:
-        fig1.update_layout(
-            shapes=[{
-                'type': 'line',
-                'yref': 'paper',
-                'x0': forecast['Month'].iloc[implementation_months-1],
-                'y0': 0,
-                'x1': forecast['Month'].iloc[implementation_months-1],
-                'y1': 1,
-                'line': {
-                    'color': 'gray',
-                    'dash': 'dash',
-                }
-            }],
-            annotations=[{
-                'x': forecast['Month'].iloc[implementation_months-1],
-                'y': 1,
-                'yref': 'paper',
-                'text': 'Implementation End',
-                'showarrow': False,
-                'yshift': 10
-            }]
-        )
-    
-    # Update layout
-    fig1.update_layout(
-        title='Forecasted Actions and Storage',
-        xaxis_title='Month',
-        yaxis_title='Number of Actions',
-        yaxis2=dict(
-            title='Reclaimable Storage (GB)',
-            overlaying='y',
-            side='right'
-        ),
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig1, use_container_width=True)
-    
-    # Financial Impact Chart
-    fig2 = go.Figure()
-    
-    # Add financial traces
-    fig2.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=forecast['Storage Savings (USD)'],
-        name='Storage Savings',
-        marker_color='#2ecc71'
-    ))
-    
-    fig2.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=forecast['Labor Savings (USD)'],
-        name='Labor Savings',
-        marker_color='#3498db'
-    ))
+        with col4:
+            st.metric(
+                "Ongoing Actions/Month",
+                f"{ongoing_monthly_actions:.0f}",
+                help="Expected actions per month after implementation (15% of base)"
+            )
 
     # Calculate and add energy cost savings (assuming $0.10 per kWh)
     energy_cost_per_kwh = 0.10  # You might want to add this to settings
     forecast['Energy Cost Savings (USD)'] = (forecast['Energy Savings (kWh)'] + forecast['Cooling Savings (kWh)']) * energy_cost_per_kwh
     
-    fig2.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=forecast['Energy Cost Savings (USD)'],
-        name='Energy Savings',
-        marker_color='#9b59b6'
-    ))
-    
-    fig2.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=-forecast['Automation Cost (USD)'],
-        name='Automation Cost',
-        marker_color='#e74c3c'
-    ))
-    
     # Update Net Savings to include energy savings
     forecast['Net Savings (USD)'] = (
         forecast['Storage Savings (USD)'] + 
@@ -276,114 +235,270 @@ def render():
         forecast['Automation Cost (USD)']
     )
     
-    fig2.add_trace(go.Scatter(
-        x=forecast['Month'],
-        y=forecast['Net Savings (USD)'],
-        name='Net Savings',
-        line=dict(color='#f1c40f', width=3)
-    ))
+    # Display forecast charts
+    st.markdown("### 📈 12-Month Forecast")
+
+    # Forecast months start from the current month, so it is part of the figure cache key
+    figure_filters = {'start_month': forecast['Month'].iloc[0].strftime('%Y-%m'),
+                      'models': None if stats is None else (models['actions'], models['gb'])}
+    # Statistical forecasts follow the history rather than an implementation phase
+    show_implementation_end = stats is None and implementation_months < 12
     
-    # Add implementation end marker using shapes
-    if implementation_months < 12:
-        fig2.update_layout(
-            shapes=[{
-                'type': 'line',
-                'yref': 'paper',
-                'x0': forecast['Month'].iloc[implementation_months-1],
-                'y0': 0,
-                'x1': forecast['Month'].iloc[implementation_months-1],
-                'y1': 1,
-                'line': {
-                    'color': 'gray',
-                    'dash': 'dash',
-                }
-            }],
-            annotations=[{
-                'x': forecast['Month'].iloc[implementation_months-1],
-                'y': 1,
-                'yref': 'paper',
-                'text': 'Implementation End',
-                'showarrow': False,
-                'yshift': 10
-            }]
+    # Actions and Storage Chart
+    def build_actions_figure():
+        fig1 = go.Figure()
+    
+        # Add Actions line
+        fig1.add_trace(go.Scatter(
+            x=forecast['Month'],
+            y=forecast['Actions'],
+            name='Actions',
+            line=dict(color='#3498db')
+        ))
+    
+        # Add Storage line
+        fig1.add_trace(go.Scatter(
+            x=forecast['Month'],
+            y=forecast['Reclaimable Storage (GB)'],
+            name='Reclaimable Storage (GB)',
+            line=dict(color='#2ecc71'),
+            yaxis='y2'
+        ))
+
+        # Add the monthly history the models were fitted to
+        if stats is not None:
+            history_months = stats['months'].to_timestamp()
+            fig1.add_trace(go.Scatter(
+                x=history_months,
+                y=stats['history']['actions'],
+                name='Historical Actions',
+                line=dict(color='#3498db', dash='dot')
+            ))
+            fig1.add_trace(go.Scatter(
+                x=history_months,
+                y=stats['history']['gb'],
+                name='Historical Storage (GB)',
+                line=dict(color='#2ecc71', dash='dot'),
+                yaxis='y2'
+            ))
+    
+        # Add implementation end marker using shapes
+        if show_implementation_end:
+            fig1.update_layout(
+                shapes=[{
+                    'type': 'line',
+                    'yref': 'paper',
+                    'x0': forecast['Month'].iloc[implementation_months-1],
+                    'y0': 0,
+                    'x1': forecast['Month'].iloc[implementation_months-1],
+                    'y1': 1,
+                    'line': {
+                        'color': 'gray',
+                        'dash': 'dash',
+                    }
+                }],
+                annotations=[{
+                    'x': forecast['Month'].iloc[implementation_months-1],
+                    'y': 1,
+                    'yref': 'paper',
+                    'text': 'Implementation End',
+                    'showarrow': False,
+                    'yshift': 10
+                }]
+            )
+    
+        # Update layout
+        fig1.update_layout(
+            title='Forecasted Actions and Storage',
+            xaxis_title='Month',
+            yaxis_title='Number of Actions',
+            yaxis2=dict(
+                title='Reclaimable Storage (GB)',
+                overlaying='y',
+                side='right'
+            ),
+            hovermode='x unified'
         )
+        return fig1
+
+    fig1 = cached_figure(df, 'forecast.actions', build_actions_figure, filters=figure_filters,
+                         settings=settings, settings_keys=FORECAST_SETTINGS_KEYS)
+    st.plotly_chart(fig1, use_container_width=True)
     
-    # Update layout
-    fig2.update_layout(
-        title='Forecasted Financial Impact',
-        xaxis_title='Month',
-        yaxis_title='Amount (USD)',
-        barmode='relative',
-        hovermode='x unified'
-    )
-    
+    # Financial Impact Chart
+    def build_financial_figure():
+        fig2 = go.Figure()
+    
+        # Add financial traces
+        fig2.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=forecast['Storage Savings (USD)'],
+            name='Storage Savings',
+            marker_color='#2ecc71'
+        ))
+    
+        fig2.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=forecast['Labor Savings (USD)'],
+            name='Labor Savings',
+            marker_color='#3498db'
+        ))
+
+        fig2.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=forecast['Energy Cost Savings (USD)'],
+            name='Energy Savings',
+            marker_color='#9b59b6'
+        ))
+    
+        fig2.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=-forecast['Automation Cost (USD)'],
+            name='Automation Cost',
+            marker_color='#e74c3c'
+        ))
+    
+        fig2.add_trace(go.Scatter(
+            x=forecast['Month'],
+            y=forecast['Net Savings (USD)'],
+            name='Net Savings',
+            line=dict(color='#f1c40f', width=3)
+        ))
+    
+        # Add implementation end marker using shapes
+        if show_implementation_end:
+            fig2.update_layout(
+                shapes=[{
+                    'type': 'line',
+                    'yref': 'paper',
+                    'x0': forecast['Month'].iloc[implementation_months-1],
+                    'y0': 0,
+                    'x1': forecast['Month'].iloc[implementation_months-1],
+                    'y1': 1,
+                    'line': {
+                        'color': 'gray',
+                        'dash': 'dash',
+                    }
+                }],
+                annotations=[{
+                    'x': forecast['Month'].iloc[implementation_months-1],
+                    'y': 1,
+                    'yref': 'paper',
+                    'text': 'Implementation End',
+                    'showarrow': False,
+                    'yshift': 10
+                }]
+            )
+    
+        # Update layout
+        fig2.update_layout(
+            title='Forecasted Financial Impact',
+            xaxis_title='Month',
+            yaxis_title='Amount (USD)',
+            barmode='relative',
+            hovermode='x unified'
+        )
+        return fig2
+
+    fig2 = cached_figure(df, 'forecast.financial', build_financial_figure, filters=figure_filters,
+                         settings=settings, settings_keys=FORECAST_SETTINGS_KEYS)
     st.plotly_chart(fig2, use_container_width=True)
     
     # Add Sustainability Impact Chart
-    fig3 = go.Figure()
-    
-    fig3.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=forecast['Energy Savings (kWh)'],
-        name='Energy Savings',
-        marker_color='#3498db'
-    ))
-    
-    fig3.add_trace(go.Bar(
-        x=forecast['Month'],
-        y=forecast['Cooling Savings (kWh)'],
-        name='Cooling Savings',
-        marker_color='#9b59b6'
-    ))
-    
-    fig3.add_trace(go.Scatter(
-        x=forecast['Month'],
-        y=forecast['Carbon Savings (kg)'],
-        name='Carbon Reduction',
-        line=dict(color='#1abc9c', width=3),
-        yaxis='y2'
-    ))
-    
-    # Add implementation end marker
-    if implementation_months < 12:
+    def build_sustainability_figure():
+        fig3 = go.Figure()
+    
+        fig3.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=forecast['Energy Savings (kWh)'],
+            name='Energy Savings',
+            marker_color='#3498db'
+        ))
+    
+        fig3.add_trace(go.Bar(
+            x=forecast['Month'],
+            y=forecast['Cooling Savings (kWh)'],
+            name='Cooling Savings',
+            marker_color='#9b59b6'
+        ))
+    
+        fig3.add_trace(go.Scatter(
+            x=forecast['Month'],
+            y=forecast['Carbon Savings (kg)'],
+            name='Carbon Reduction',
+            line=dict(color='#1abc9c', width=3),
+            yaxis='y2'
+        ))
+    
+        # Add implementation end marker
+        if show_implementation_end:
+            fig3.update_layout(
+                shapes=[{
+                    'type': 'line',
+                    'yref': 'paper',
+                    'x0': forecast['Month'].iloc[implementation_months-1],
+                    'y0': 0,
+                    'x1': forecast['Month'].iloc[implementation_months-1],
+                    'y1': 1,
+                    'line': {
+                        'color': 'gray',
+                        'dash': 'dash',
+                    }
+                }],
+                annotations=[{
+                    'x': forecast['Month'].iloc[implementation_months-1],
+                    'y': 1,
+                    'yref': 'paper',
+                    'text': 'Implementation End',
+                    'showarrow': False,
+                    'yshift': 10
+                }]
+            )
+    
         fig3.update_layout(
-            shapes=[{
-                'type': 'line',
-                'yref': 'paper',
-                'x0': forecast['Month'].iloc[implementation_months-1],
-                'y0': 0,
-                'x1': forecast['Month'].iloc[implementation_months-1],
-                'y1': 1,
-                'line': {
-                    'color': 'gray',
-                    'dash': 'dash',
-                }
-            }],
-            annotations=[{
-                'x': forecast['Month'].iloc[implementation_months-1],
-                'y': 1,
-                'yref': 'paper',
-                'text': 'Implementation End',
-                'showarrow': False,
-                'yshift': 10
-            }]
+            title='Sustainability Impact',
+            xaxis_title='Month',
+            yaxis_title='Energy (kWh)',
+            yaxis2=dict(
+                title='Carbon Reduction (kg)',
+                overlaying='y',
+                side='right'
+            ),
+            barmode='stack',
+            hovermode='x unified'
         )
-    
-    fig3.update_layout(
-        title='Sustainability Impact',
-        xaxis_title='Month',
-        yaxis_title='Energy (kWh)',
-        yaxis2=dict(
-            title='Carbon Reduction (kg)',
-            overlaying='y',
-            side='right'
-        ),
-        barmode='stack',
-        hovermode='x unified'
-    )
-    
+        return fig3
+
+    fig3 = cached_figure(df, 'forecast.sustainability', build_sustainability_figure, filters=figure_filters,
+                         settings=settings, settings_keys=FORECAST_SETTINGS_KEYS)
     st.plotly_chart(fig3, use_container_width=True)
     
+    # Backtest of the statistical models
+    if stats is not None:
+        st.markdown("### 🧪 Backtest")
+        st.caption(f"Every model is refitted at each month after the first {MIN_TRAIN_MONTHS} and scored on the "
+                   f"following {BACKTEST_HORIZON} months. WAPE is the absolute error over the actual total; "
+                   "location WAPE scores each location's forecast.")
+        col1, col2 = st.columns(2)
+        for col, name, title in ((col1, 'actions', "Monthly Actions"), (col2, 'gb', "Reclaimable Storage (GB)")):
+            with col:
+                st.markdown(f"**{title}**")
+                st.dataframe(
+                    stats['backtest'][name].rename(columns=BACKTEST_COLUMNS).style.format(
+                        {'MAE': '{:,.1f}', 'RMSE': '{:,.1f}', 'WAPE': '{:.1%}', 'Location WAPE': '{:.1%}'}
+                    ),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+        with st.expander("📍 Forecast by Location"):
+            by_location = pd.DataFrame({
+                'Location': stats['locations'],
+                'Forecast Actions': stats['forecasts']['actions'][models['actions']].sum(axis=1).round(),
+                'Forecast Storage (GB)': stats['forecasts']['gb'][models['gb']].sum(axis=1).round(2)
+            }).sort_values('Forecast Storage (GB)', ascending=False)
+            st.dataframe(by_location, use_container_width=True, hide_index=True)
+
     # Display detailed forecast table
     st.markdown("### 📋 Detailed Forecast")
     
@@ -400,4 +515,6 @@ def render():
         display_forecast,
         use_container_width=True,
         hide_index=True
-    ) 
\ No newline at end of file
+    ) 
+
+    render_cache_stats()
@@ -0,0 +1,175 @@
+# Statistical forecasts of monthly activity from a processed dataset's roi_month history.
+# Every location's monthly action count and reclaimable GB is one series; each model
+# is fitted to all series at once in NumPy (series along the first axis), and the
+# models are compared in a rolling-origin backtest. Streamlit is not imported.
+import numpy as np
+import pandas as pd
+
+LOCATION_COLUMN = 'inferred_location'
+# Series name -> column summed per month; actions count rows
+SERIES = {'actions': None, 'gb': 'file_size_(gb)'}
+SEASON = 12
+# Smoothing parameters tried for every series; each series keeps its in-sample best
+ALPHAS = np.array([0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+BETAS = np.array([0.05, 0.1, 0.2])
+DAMPING = 0.9
+# Backtest origins leave at least this many months to fit on
+MIN_TRAIN_MONTHS = 6
+BACKTEST_HORIZON = 3
+FORECAST_HORIZON = 12
+
+def monthly_series(df):
+    """Per-location monthly series of a processed frame.
+
+    Returns {'months', 'locations', 'actions', 'gb'}: the months from the first
+    to the last roi_month (months without recommendations count as zero), the
+    locations, and a locations x months array per series. None if no row has
+    a valid roi_month.
+    """
+    # Each distinct month is parsed once, as a month number counted from year 0
+    codes, labels = pd.factorize(df['roi_month'])
+    parsed = pd.to_datetime(pd.Series(labels, dtype=object), format='%Y-%m', errors='coerce')
+    label_months = (parsed.dt.year * 12 + parsed.dt.month - 1).fillna(-1).to_numpy(dtype=np.int64)
+    row_months = np.where(codes >= 0, label_months[codes], -1) if len(labels) else np.full(len(codes), -1)
+    valid = row_months >= 0
+    if not valid.any():
+        return None
+    first, last = row_months[valid].min(), row_months[valid].max()
+    month_codes = row_months[valid] - first
+    n_months = int(last - first + 1)
+
+    if LOCATION_COLUMN in df.columns:
+        location_codes, locations = pd.factorize(df[LOCATION_COLUMN][valid], use_na_sentinel=False)
+        locations = pd.Index(locations).astype(object).where(pd.notna(locations), 'Unknown')
+    else:
+        location_codes, locations = np.zeros(valid.sum(), dtype=np.intp), pd.Index(['Unknown'], dtype=object)
+    cells = location_codes * n_months + month_codes
+    shape = (len(locations), n_months)
+
+    start = pd.Period(year=int(first // 12), month=int(first % 12 + 1), freq='M')
+    series = {'months': pd.period_range(start, periods=n_months, freq='M'), 'locations': locations}
+    for name, column in SERIES.items():
+        weights = None if column is None else df[column].to_numpy(dtype=float, na_value=0.0)[valid]
+        series[name] = np.bincount(cells, weights=weights, minlength=shape[0] * shape[1]).reshape(shape).astype(float)
+    return series
+
+def mean_forecast(y, horizon):
+    """The historical monthly mean, as the former heuristic's base actions."""
+    return np.repeat(y.mean(axis=1, keepdims=True), horizon, axis=1)
+
+def naive_forecast(y, horizon):
+    return np.repeat(y[:, -1:], horizon, axis=1)
+
+def seasonal_naive_forecast(y, horizon, season=SEASON):
+    """Each month repeats the same month of the last observed season."""
+    return y[:, -season + np.arange(horizon) % season]
+
+def ses_forecast(y, horizon):
+    """Simple exponential smoothing with the alpha that best fits each series one step ahead."""
+    level = np.repeat(y[None, :, 0], len(ALPHAS), axis=0)
+    sse = np.zeros_like(level)
+    for t in range(1, y.shape[1]):
+        error = y[:, t] - level
+        sse += error ** 2
+        level += ALPHAS[:, None] * error
+    best = sse.argmin(axis=0)
+    return np.repeat(level[best, np.arange(y.shape[0])][:, None], horizon, axis=1)
+
+def damped_trend_forecast(y, horizon):
+    """Additive damped-trend exponential smoothing, parameters chosen per series as for ses_forecast."""
+    alpha = np.repeat(ALPHAS, len(BETAS))[:, None]
+    beta = np.tile(BETAS, len(ALPHAS))[:, None]
+    level = np.repeat(y[None, :, 1], len(alpha), axis=0)
+    trend = np.repeat((y[:, 1] - y[:, 0])[None], len(alpha), axis=0)
+    sse = np.zeros_like(level)
+    for t in range(2, y.shape[1]):
+        fitted = level + DAMPING * trend
+        error = y[:, t] - fitted
+        sse += error ** 2
+        level = fitted + alpha * error
+        trend = DAMPING * trend + alpha * beta * error
+    best = sse.argmin(axis=0)
+    series = np.arange(y.shape[0])
+    steps = np.cumsum(DAMPING ** np.arange(1, horizon + 1))
+    return level[best, series][:, None] + steps[None] * trend[best, series][:, None]
+
+# Model name -> (forecast function, months of history it needs)
+MODELS = {
+    'Historical mean': (mean_forecast, 1),
+    'Naive': (naive_forecast, 1),
+    'Seasonal naive': (seasonal_naive_forecast, SEASON),
+    'Exponential smoothing': (ses_forecast, 2),
+    'Damped trend': (damped_trend_forecast, 3),
+}
+
+def fit_forecast(model, y, horizon=FORECAST_HORIZON):
+    """`horizon` months of every series after the last observed one; counts and GB are never negative."""
+    forecast, _ = MODELS[model]
+    return np.clip(forecast(y, horizon), 0, None)
+
+def backtest(y, horizon=BACKTEST_HORIZON, min_train=MIN_TRAIN_MONTHS):
+    """Rolling-origin backtest of every model on the series in `y`.
+
+    Each month after the first `min_train` is an origin: models fit the months
+    before it and forecast up to `horizon` months from it. Errors are scored on
+    the total over all series (MAE, RMSE, WAPE) and per series (location WAPE).
+    All models are scored on the same origins, so models needing so much
+    history that fewer than `horizon` origins would remain are left out.
+    Returns one row per model, best total WAPE first; empty when the history
+    is shorter than `min_train` + `horizon` months.
+    """
+    n_months = y.shape[1]
+    models = [model for model, (_, min_months) in MODELS.items() if max(min_train, min_months) + horizon <= n_months]
+    first_origin = max([min_train] + [MODELS[model][1] for model in models])
+    total = y.sum(axis=0)
+    rows = []
+    for model in models:
+        errors, squared, actual, location_errors, location_actual = 0.0, 0.0, 0.0, 0.0, 0.0
+        origins, points = 0, 0
+        for origin in range(first_origin, n_months):
+            steps = min(horizon, n_months - origin)
+            forecast = fit_forecast(model, y[:, :origin], steps)
+            error = forecast.sum(axis=0) - total[origin:origin + steps]
+            errors += np.abs(error).sum()
+            squared += (error ** 2).sum()
+            actual += np.abs(total[origin:origin + steps]).sum()
+            location_errors += np.abs(forecast - y[:, origin:origin + steps]).sum()
+            location_actual += np.abs(y[:, origin:origin + steps]).sum()
+            origins += 1
+            points += steps
+        if origins:
+            rows.append({
+                'model': model, 'origins': origins,
+                'mae': errors / points, 'rmse': np.sqrt(squared / points),
+                'wape': errors / actual if actual else np.nan,
+                'location_wape': location_errors / location_actual if location_actual else np.nan
+            })
+    columns = ['model', 'origins', 'mae', 'rmse', 'wape', 'location_wape']
+    return pd.DataFrame(rows, columns=columns).sort_values('wape', kind='stable').reset_index(drop=True)
+
+def forecast_dataset(df, horizon=FORECAST_HORIZON):
+    """Backtest the models on a processed frame's monthly series and forecast with each.
+
+    Returns None without roi_month history, else {'months', 'history' (total per
+    series), 'backtest' (series -> backtest frame), 'best' (series -> model
+    with the lowest backtest WAPE, None if the history is too short to
+    backtest), 'forecasts' (series -> model -> locations x months array, for
+    the backtested models only, so every forecast has its scores),
+    'locations', 'future' (the forecast months)}.
+    """
+    series = monthly_series(df)
+    if series is None:
+        return None
+    result = {
+        'months': series['months'], 'locations': series['locations'],
+        'future': pd.period_range(series['months'][-1] + 1, periods=horizon, freq='M'),
+        'history': {}, 'backtest': {}, 'best': {}, 'forecasts': {}
+    }
+    for name in SERIES:
+        y = series[name]
+        result['history'][name] = y.sum(axis=0)
+        scores = backtest(y)
+        result['backtest'][name] = scores
+        result['best'][name] = scores['model'].iloc[0] if len(scores) else None
+        result['forecasts'][name] = {model: fit_forecast(model, y, horizon) for model in scores['model']}
+    return result
@@ -4,95 +4,182 @@ import streamlit as st
 import numpy as np
 from datetime import datetime
 import json
+import hashlib
+import weakref
+import shutil
+from views.dataset_registry import checkout_dataset, get_dataset_registry
+from views.arrow_store import read_arrow
+from views.processing import PROCESSED_ARROW, PROCESSED_CSV, add_arrow_copy, compute_financial_metrics, write_processed_files
+from views.versioned_store import version_file, version_key
+from views.dataset_index import DATASETS_ROOT, dataset_store, enforce_quota, list_datasets, open_version, publish_dataset
 
-@st.cache_data(ttl=7200)
-def load_processed_data():
-    """Load and process the data from the processed CSV file."""
+# Fingerprints memoized per DataFrame object: id -> (weakref, row count, columns, fingerprint)
+_FINGERPRINTS = {}
+
+def dataset_fingerprint(df):
+    """Stable content hash of a DataFrame, memoized for the lifetime of the frame object.
+
+    The memo is rechecked against the frame's length and columns only, so frames
+    must not have values changed in place once fingerprinted; copy them instead
+    (shared datasets are copy-on-write views already).
+    """
+    cached = _FINGERPRINTS.get(id(df))
+    if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == tuple(df.columns):
+        return cached[3]
+
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    fingerprint = digest.hexdigest()[:16]
+    remember_fingerprint(df, fingerprint)
+    return fingerprint
+
+def remember_fingerprint(df, fingerprint):
+    """Record the fingerprint of a frame known to hold the same data as an already hashed one."""
+    key = id(df)
+    _FINGERPRINTS[key] = (weakref.ref(df, lambda _: _FINGERPRINTS.pop(key, None)), len(df), tuple(df.columns), fingerprint)
+
+# Each processed dataset is a namespace of immutable versions, listed in the dataset index.
+# Written by earlier releases; imported as the first dataset of an empty index
+LEGACY_PROCESSED_PATH = 'outputs/processed_data.csv'
+# Session state keys of the dataset the session reads and the version it is pinned to
+SELECTED_DATASET_KEY = 'dataset_id'
+PINNED_VERSION_KEY = 'dataset_version'
+
+def _select_dataset(dataset_id):
+    st.session_state[SELECTED_DATASET_KEY] = dataset_id
+    st.session_state.pop(PINNED_VERSION_KEY, None)
+
+def datasets_in_use():
+    """Ids of the datasets that sessions of this server have checked out; the quota spares them."""
+    return {key.split('/')[0] for key in get_dataset_registry().referenced()}
+
+def enforce_dataset_quota(root=DATASETS_ROOT):
+    """Remove datasets over the quota that no session of this server is reading, e.g. after
+    a worker process published without enforcing it."""
+    return enforce_quota(root, keep=datasets_in_use())
+
+def save_processed_data(df, name, root=DATASETS_ROOT):
+    """Publish processed data as a new version of this user's dataset `name` and select it.
+
+    The CSV and its memory-mappable Arrow copy are written in full before the
+    version becomes visible, so concurrent readers never see a partial file.
+    """
+    owner = st.session_state.get('username', 'admin')
+    dataset, version = publish_dataset(owner, name, lambda directory: write_processed_files(df, directory), root=root,
+                                       keep=datasets_in_use())
+    select_dataset_version(dataset, version)
+    return dataset, version
+
+def select_dataset_version(dataset, version):
+    """Make this session read `version` of `dataset`, e.g. one it just published."""
+    _select_dataset(dataset['id'])
+    st.session_state[PINNED_VERSION_KEY] = version['version']
+
+def _import_legacy_data(root):
+    def write_files(directory):
+        shutil.copyfile(LEGACY_PROCESSED_PATH, os.path.join(directory, PROCESSED_CSV))
+        return add_arrow_copy(directory)
+    # Only the first session to get here imports; the others find the index filled
+    publish_dataset('shared', 'processed_data', write_files, root=root, if_empty=True,
+                    source=LEGACY_PROCESSED_PATH)
+
+def available_datasets(root=DATASETS_ROOT):
+    # Datasets whose first version is still being written aren't listed yet
+    return [d for d in list_datasets(root) if d['current'] is not None]
+
+def _selected_dataset(root):
+    datasets = available_datasets(root)
+    selected = st.session_state.get(SELECTED_DATASET_KEY)
+    return next((d for d in datasets if d['id'] == selected), datasets[0] if datasets else None)
+
+def load_processed_data(root=DATASETS_ROOT):
+    """Load the dataset version this session reads.
+
+    The session reads its selected dataset (the most recently updated one by
+    default) and pins the version current on first load, keeping it while newer
+    versions are published until it switches (see render_dataset_selector) or
+    the version is pruned. Versions are opened memory-mapped once per process
+    into the dataset registry, and caches keyed by the fingerprint are keyed by the
+    version, so a new version invalidates them exactly and nothing expires on a timer.
+    """
     try:
-        if not os.path.exists('outputs/processed_data.csv'):
+        dataset = _selected_dataset(root)
+        if dataset is None:
+            if not os.path.exists(LEGACY_PROCESSED_PATH):
+                return None
+            _import_legacy_data(root)
+            dataset = _selected_dataset(root)
+            if dataset is None:
+                return None
+        selected = st.session_state.get(SELECTED_DATASET_KEY)
+        if selected != dataset['id']:
+            if selected is not None:
+                st.info(f"The dataset this session was reading has been removed; showing {dataset['name']} instead.")
+            _select_dataset(dataset['id'])
+
+        version = (open_version(dataset, st.session_state.get(PINNED_VERSION_KEY), root)
+                   or open_version(dataset, root=root))
+        if version is None:
+            # Removed after the dataset list was read
+            st.info(f"The dataset {dataset['name']} has just been removed. Reload the page to pick another one.")
             return None
-        
-        df = pd.read_csv('outputs/processed_data.csv')
-        
-        # Ensure location type information is present
-        if 'location_type' not in df.columns:
-            data_centers = {'AUH', 'DXB', 'AJM'}
-            df['location_type'] = df['inferred_location'].apply(
-                lambda x: 'Data Center' if x in data_centers else 'Business Domain' if pd.notna(x) else 'Unknown'
-            )
-        
-        return df
+        st.session_state[PINNED_VERSION_KEY] = version['version']
+
+        return checkout_version(dataset, version, root=root)
     except Exception as e:
         st.error(f"Error loading processed data: {str(e)}")
         return None
 
-@st.cache_data(ttl=7200)
+def checkout_version(dataset, version, slot='processed', root=DATASETS_ROOT):
+    """This session's view of a published dataset version, held in registry `slot`."""
+    key = f"{dataset['id']}/{version_key(version)}"
+    arrow = version_file(dataset_store(dataset, root), version, PROCESSED_ARROW)
+    df = checkout_dataset(slot, key, lambda: read_arrow(arrow))
+    # Published versions never change, so the version identifies the content
+    remember_fingerprint(df, key)
+    return df
+
+def processed_version_file(name, root=DATASETS_ROOT):
+    """Path of file `name` in the dataset version this session reads; None before it has loaded data."""
+    dataset = _selected_dataset(root)
+    number = st.session_state.get(PINNED_VERSION_KEY)
+    version = open_version(dataset, number, root) if dataset is not None and number is not None else None
+    return None if version is None else version_file(dataset_store(dataset, root), version, name)
+
+def _switch_version(number):
+    st.session_state[PINNED_VERSION_KEY] = number
+
+def render_dataset_selector(root=DATASETS_ROOT):
+    """Dataset picker with the version this session reads, and a switch when a newer one exists."""
+    datasets = available_datasets(root)
+    if not datasets:
+        return
+    labels = {d['id']: f"{d['name']} ({d['owner']})" for d in datasets}
+    ids = list(labels)
+    selected = st.session_state.get(SELECTED_DATASET_KEY)
+    chosen = st.selectbox("📦 Dataset", ids, index=ids.index(selected) if selected in ids else 0,
+                          format_func=labels.get)
+    if chosen != selected:
+        _select_dataset(chosen)
+
+    dataset = next(d for d in datasets if d['id'] == chosen)
+    # Sessions that haven't loaded data yet will pin the current version
+    pinned = st.session_state.get(PINNED_VERSION_KEY, dataset['current'])
+    rows = f" · {dataset['rows']:,} rows" if pinned == dataset['current'] and dataset['rows'] is not None else ""
+    st.caption(f"Version {pinned}{rows}")
+    if pinned != dataset['current']:
+        st.button(f"🔄 Switch to version {dataset['current']}", use_container_width=True,
+                  on_click=_switch_version, args=(dataset['current'],))
+
+@st.cache_data(max_entries=4)
+def _financial_metrics(fingerprint, settings, _df):
+    return compute_financial_metrics(_df, settings)
+
 def calculate_financial_metrics(df, settings):
-    """Centralized function for all financial calculations with caching."""
+    """Centralized function for all financial calculations, cached per dataset fingerprint and settings."""
     try:
-        # Base metrics using vectorized operations
-        metrics = {
-            'total_storage_gb': df['file_size_(gb)'].sum(),
-            'avg_storage_gb': df['file_size_(gb)'].mean(),
-            'total_actions': len(df)
-        }
-        
-        # Storage costs (vectorized)
-        df['storage_cost_usd'] = df['file_size_(gb)'] * settings['cost_per_gb'] * settings['retention']
-        df['storage_cost_aed'] = df['storage_cost_usd'] * settings['conversion_rate']
-        
-        # Energy and sustainability (vectorized)
-        total_energy_factor = settings['energy_kwh'] * (1 + settings['cooling'])
-        df['energy_savings'] = df['file_size_(gb)'] * settings['energy_kwh'] * settings['retention']
-        df['cooling_savings'] = df['file_size_(gb)'] * settings['energy_kwh'] * settings['cooling'] * settings['retention']
-        df['carbon_savings'] = df['file_size_(gb)'] * total_energy_factor * settings['co2_rate'] * settings['retention']
-        
-        # Labor and automation (vectorized)
-        labor_hours_min = settings['min_minutes'] / 60
-        labor_hours_max = settings['max_minutes'] / 60
-        df['labor_hours'] = labor_hours_min
-        df['labor_cost_usd'] = (labor_hours_min * settings['min_rate_aed']) / settings['conversion_rate']
-        
-        # Automation costs (vectorized)
-        turbo_cost = settings['turbo_unit_cost_usd'] * (settings['turbo_pct'] / 100)
-        aap_cost = settings['aap_unit_cost_usd'] * ((100 - settings['turbo_pct']) / 100)
-        df['automation_cost_usd'] = turbo_cost + aap_cost
-        
-        # Net savings (vectorized)
-        df['net_savings_usd'] = df['storage_cost_usd'] + df['labor_cost_usd'] - df['automation_cost_usd']
-        
-        # Monthly aggregation (single groupby operation)
-        monthly_metrics = df.groupby('roi_month').agg({
-            'storage_cost_usd': 'sum',
-            'storage_cost_aed': 'sum',
-            'energy_savings': 'sum',
-            'cooling_savings': 'sum',
-            'carbon_savings': 'sum',
-            'labor_cost_usd': 'sum',
-            'automation_cost_usd': 'sum',
-            'net_savings_usd': 'sum',
-            'file_size_(gb)': 'sum'
-        }).reset_index()
-        
-        # Calculate totals
-        totals = {
-            'storage_savings_usd': df['storage_cost_usd'].sum(),
-            'storage_savings_aed': df['storage_cost_aed'].sum(),
-            'energy_savings_kwh': df['energy_savings'].sum(),
-            'cooling_savings_kwh': df['cooling_savings'].sum(),
-            'carbon_savings_kg': df['carbon_savings'].sum(),
-            'labor_savings_usd': df['labor_cost_usd'].sum(),
-            'automation_cost_usd': df['automation_cost_usd'].sum(),
-            'net_savings_usd': df['net_savings_usd'].sum()
-        }
-        
-        return {
-            'metrics': metrics,
-            'monthly_metrics': monthly_metrics,
-            'totals': totals,
-            'processed_df': df
-        }
-        
+        return _financial_metrics(dataset_fingerprint(df), settings, df)
     except Exception as e:
         st.error(f"Error in financial calculations: {str(e)}")
         return None
@@ -119,7 +206,8 @@ def initialize_settings():
                 'turbo_unit_cost_usd': 0.25,
                 'aap_unit_cost_usd': 0.15,
                 'forecast_growth_rate': 0.15,
-                'implementation_months': 6
+                'implementation_months': 6,
+                'chart_point_budget': 2000
             }
         except Exception as e:
             st.error(f"Error loading settings: {str(e)}")
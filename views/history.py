@@ -0,0 +1,85 @@
+import time
+import streamlit as st
+import plotly.express as px
+from views.chart_data import downsample_series
+from views.run_history import list_datasets, list_locations, list_runs, location_trend, quarterly_trend, run_months
+
+ALL_DATASETS = "All datasets"
+# Runs listed in the table; trend queries always cover every run
+RECENT_RUNS = 200
+
+def timed(timings, query, *args, **kwargs):
+    """Run a history query, appending its time in seconds to `timings`."""
+    start = time.perf_counter()
+    result = query(*args, **kwargs)
+    timings.append(time.perf_counter() - start)
+    return result
+
+def render():
+    st.markdown('<div class="page-title">🕑 Run History</div>', unsafe_allow_html=True)
+    timings = []
+
+    datasets = timed(timings, list_datasets)
+    if datasets.empty:
+        st.info("No runs recorded yet. Every file processed in **Upload & Process** is added to the history.")
+        return
+
+    # Dataset filter
+    labels = {ALL_DATASETS: None}
+    labels.update({f"{row.dataset_name} ({row.owner}, {row.runs} runs)": row.dataset_id for row in datasets.itertuples()})
+    dataset_id = labels[st.selectbox("Dataset", list(labels), key="history_dataset")]
+
+    runs = timed(timings, list_runs, dataset_id, limit=RECENT_RUNS)
+    quarters = timed(timings, quarterly_trend, dataset_id)
+
+    # Latest run compared with the one before
+    latest = runs.iloc[0]
+    previous = runs.iloc[1] if len(runs) > 1 else None
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Runs", f"{int(quarters['runs'].sum()):,}")
+    col2.metric("Latest Run", latest['run_at'].replace('T', ' ')[:16])
+    col3.metric("Reclaimable Storage", f"{latest['total_storage_gb']:,.0f} GB",
+                None if previous is None else f"{latest['total_storage_gb'] - previous['total_storage_gb']:+,.0f} GB")
+    col4.metric("Net Savings", f"${latest['net_savings_usd']:,.0f}",
+                None if previous is None else f"{latest['net_savings_usd'] - previous['net_savings_usd']:+,.0f} USD")
+
+    # Quarterly trend
+    st.subheader("📆 Quarterly Trend")
+    st.caption("Each quarter shows the latest run of every dataset in it.")
+    fig = px.bar(quarters, x='quarter', y='net_savings_usd', labels={'quarter': 'Quarter', 'net_savings_usd': 'Net Savings (USD)'},
+                 hover_data={'total_storage_gb': ':,.0f', 'runs': True})
+    fig.add_scatter(x=quarters['quarter'], y=quarters['total_storage_gb'], name='Reclaimable Storage (GB)', yaxis='y2', mode='lines+markers')
+    fig.update_layout(yaxis2=dict(title='Reclaimable Storage (GB)', overlaying='y', side='right'), legend=dict(orientation='h'))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Run-by-run trend
+    st.subheader("📈 Run by Run")
+    by_run = downsample_series(runs.sort_values('run_at'), 'run_at', ['net_savings_usd', 'storage_savings_usd'])
+    fig = px.line(by_run, x='run_at', y=['net_savings_usd', 'storage_savings_usd'], color_discrete_sequence=['#1976D2', '#2ecc71'],
+                  markers=True, labels={'run_at': 'Run', 'value': 'USD', 'variable': ''}, hover_data=['dataset_name', 'version'])
+    st.plotly_chart(fig, use_container_width=True)
+    if len(runs) == RECENT_RUNS:
+        st.caption(f"Showing the latest {RECENT_RUNS} runs.")
+
+    # Location trend
+    st.subheader("📍 Location Trend")
+    locations = timed(timings, list_locations, dataset_id)
+    location = st.selectbox("Location", locations, key="history_location")
+    if location is not None:
+        trend = timed(timings, location_trend, location, dataset_id)
+        # Every run of the location is listed, so long histories are thinned to the point budget
+        shown = downsample_series(trend, 'run_at', 'storage_gb')
+        fig = px.line(shown, x='run_at', y='storage_gb', markers=True, hover_data=['dataset_name', 'version', 'actions', 'net_savings_usd'],
+                      labels={'run_at': 'Run', 'storage_gb': 'Reclaimable Storage (GB)'})
+        st.plotly_chart(fig, use_container_width=True)
+        if len(shown) < len(trend):
+            st.caption(f"Showing {len(shown):,} of {len(trend):,} runs.")
+
+    # Recent runs, with the monthly breakdown of a selected one
+    st.subheader("🗂️ Runs")
+    st.dataframe(runs.drop(columns=['settings']), use_container_width=True, hide_index=True)
+    run_labels = {f"#{row.id} · {row.dataset_name} v{row.version} · {row.run_at.replace('T', ' ')}": row.id for row in runs.itertuples()}
+    selected = st.selectbox("Monthly breakdown of run", list(run_labels), key="history_run")
+    st.dataframe(timed(timings, run_months, run_labels[selected]), use_container_width=True, hide_index=True)
+
+    st.caption(f"{len(timings)} history queries took {sum(timings) * 1000:.0f} ms.")
@@ -1,6 +1,5 @@
 import streamlit as st
-import pandas as pd
-import os
+from views.helpers import load_processed_data
 
 def render():
     # Custom title with improved wording
@@ -121,14 +120,13 @@ def render():
             st.rerun()
     
     # Recent activity section - if there's processed data
-    if os.path.exists('outputs/processed_data.csv') and 'processed_df' in st.session_state:
+    df = load_processed_data()
+    if df is not None:
         st.markdown("---")
         st.markdown('<div class="section-subheader">📊 Recent Analysis Results</div>', unsafe_allow_html=True)
         
-        # Try to read the most recent processing results
+        # Try to summarize the most recent processing results
         try:
-            df = st.session_state.get('processed_df', pd.read_csv('outputs/processed_data.csv'))
-            
             # Display summary metrics
             if 'file_size_(gb)' in df.columns:
                 total_size = df['file_size_(gb)'].sum()
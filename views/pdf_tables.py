@@ -0,0 +1,105 @@
+# Table helpers for the PDF reports: column-at-a-time cell formatting, top-N rollups
+# and a paginated table writer for FPDF. Streamlit is not imported.
+import numpy as np
+import pandas as pd
+
+def format_number(values, decimals: int = 2, prefix: str = "", suffix: str = "") -> np.ndarray:
+    """Format a whole column as f"{prefix}{x:,.{decimals}f}{suffix}"; NaN becomes an empty string."""
+    arr = np.asarray(values, dtype=float)
+    number = f"{{:,.{decimals}f}}".format
+    finite = np.isfinite(arr).tolist()
+    return np.array([prefix + number(x) + suffix if ok else "" for x, ok in zip(arr.tolist(), finite)], dtype=object)
+
+def format_table(table: pd.DataFrame, formats: dict) -> pd.DataFrame:
+    """Return a string copy of `table` with each column formatted as a whole.
+
+    `formats` maps column name to keyword arguments for `format_number`;
+    other columns are converted with `astype(str)`.
+    """
+    return pd.DataFrame({
+        col: format_number(table[col].to_numpy(), **formats[col]) if col in formats
+        else table[col].astype(str).to_numpy()
+        for col in table.columns
+    })
+
+def top_n_with_other(table: pd.DataFrame, sort_by: str, n: int, label_col: str,
+                     other_label: str = "Other") -> pd.DataFrame:
+    """Keep the top `n` rows by `sort_by` and roll the rest up into one summed row."""
+    table = table.sort_values(sort_by, ascending=False)
+    if len(table) <= n:
+        return table.reset_index(drop=True)
+
+    head, rest = table.iloc[:n], table.iloc[n:]
+    other = rest.select_dtypes('number').sum().to_frame().T
+    other[label_col] = f"{other_label} ({len(rest):,} more)"
+    return pd.concat([head, other.reindex(columns=table.columns, fill_value="")], ignore_index=True)
+
+def totals_row(table: pd.DataFrame, label_col: str, label: str = "Total") -> pd.DataFrame:
+    """A one-row frame with numeric columns summed and `label` in `label_col`."""
+    totals = table.select_dtypes('number').sum().to_frame().T
+    totals[label_col] = label
+    return totals.reindex(columns=table.columns, fill_value="")
+
+def draw_table(pdf, table: pd.DataFrame, widths: list, aligns: list = None,
+               row_height: float = 6, totals: pd.DataFrame = None, font_size: int = 9):
+    """Write a pre-formatted string table, starting new pages as needed and repeating the header.
+
+    `widths` are column widths in mm; `totals` is an optional pre-formatted final row.
+    Body rows are placed with `text()` and the grid is drawn once per page, which is
+    several times cheaper than one bordered `cell()` per value.
+    """
+    aligns = aligns or ["L"] * len(widths)
+    header = list(table.columns)
+    rows = table.to_numpy().tolist()
+    bottom = pdf.page_break_trigger
+    pad = 1.5
+    lefts = [pdf.l_margin + sum(widths[:i]) for i in range(len(widths))]
+    rights = [left + width for left, width in zip(lefts, widths)]
+    columns = list(zip(lefts, rights, aligns))
+
+    def write_header():
+        pdf.set_x(pdf.l_margin)
+        pdf.set_font("Noto", "B", font_size)
+        pdf.set_fill_color(230, 236, 242)
+        for text, width in zip(header, widths):
+            pdf.cell(width, row_height + 1, text, border=1, align="C", fill=True)
+        pdf.ln(row_height + 1)
+        pdf.set_font("Noto", "", font_size)
+        return pdf.get_y()
+
+    def draw_grid(top, y):
+        for x in lefts + rights[-1:]:
+            pdf.line(x, top, x, y)
+        pdf.line(lefts[0], y, rights[-1], y)
+
+    # Page breaks are handled here so the header can be repeated on every page
+    auto_break = pdf.auto_page_break
+    pdf.set_auto_page_break(False)
+    if pdf.get_y() + 2 * row_height > bottom:
+        pdf.add_page()
+    top = y = write_header()
+    baseline = row_height / 2 + 0.35 * pdf.font_size
+    for row in rows:
+        if y + row_height > bottom:
+            draw_grid(top, y)
+            pdf.add_page()
+            top = y = write_header()
+        for text, (left, right, align) in zip(row, columns):
+            if align == "R":
+                pdf.text(right - pad - pdf.get_string_width(text), y + baseline, text)
+            else:
+                pdf.text(left + pad, y + baseline, text)
+        y += row_height
+    draw_grid(top, y)
+    pdf.set_xy(pdf.l_margin, y)
+
+    if totals is not None:
+        if y + row_height > bottom:
+            pdf.add_page()
+            write_header()
+        pdf.set_font("Noto", "B", font_size)
+        for text, width, align in zip(totals.to_numpy()[0].tolist(), widths, aligns):
+            pdf.cell(width, row_height, text, border=1, align=align)
+        pdf.ln(row_height)
+    pdf.set_font("Noto", "", font_size)
+    pdf.set_auto_page_break(auto_break, pdf.b_margin)
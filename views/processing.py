@@ -0,0 +1,510 @@
+# Ingestion pipeline for Turbonomic exports: pure functions with no Streamlit
+# imports, so jobs can run in worker processes (see views/processing_queue.py).
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+
+from views.arrow_store import write_arrow
+from views.dataset_index import DATASETS_ROOT, publish_dataset
+from views.run_history import HISTORY_PATH, record_run, summarize_locations
+
+# Files of a processed dataset version
+PROCESSED_CSV = 'processed_data.csv'
+PROCESSED_ARROW = 'processed_data.arrow'
+# A job saves the result of its latest completed stage under <root>/<key>/, the
+# key hashing its inputs, so a retried or restarted job resumes after that stage.
+# Parsing can't resume part-way: an .xlsx sheet must be read from the start.
+CHECKPOINTS_ROOT = 'outputs/checkpoints'
+CHECKPOINT_NAME = 'checkpoint.pkl'
+# Bump when stage results change shape, so older checkpoints are not resumed
+CHECKPOINT_FORMAT = 1
+# Checkpoints of jobs nobody retried are removed after this long
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600
+# Stages in order, with how they are described when a job resumes after them
+STAGES = {'parsed': 'parsing', 'transformed': 'location inference', 'computed': 'the financial metrics'}
+# Workers run at a lower priority, so interactive sessions win the CPU when both need it
+WORKER_NICENESS = 10
+
+def init_worker():
+    try:
+        os.nice(WORKER_NICENESS)
+    except (AttributeError, OSError):
+        pass
+
+def read_processed_csv(path):
+    df = pd.read_csv(path)
+
+    # Ensure location type information is present
+    if 'location_type' not in df.columns:
+        data_centers = {'AUH', 'DXB', 'AJM'}
+        df['location_type'] = df['inferred_location'].apply(
+            lambda x: 'Data Center' if x in data_centers else 'Business Domain' if pd.notna(x) else 'Unknown'
+        )
+    return df
+
+def add_arrow_copy(directory):
+    """Add the memory-mappable Arrow copy of a version's CSV; returns manifest metadata."""
+    # Built from the parsed CSV, so every reader sees the same dtypes as from the CSV
+    df = read_processed_csv(os.path.join(directory, PROCESSED_CSV))
+    write_arrow(df, os.path.join(directory, PROCESSED_ARROW))
+    return {'rows': len(df)}
+
+def write_processed_files(df, directory):
+    """Write the files of a processed dataset version into `directory`."""
+    df.to_csv(os.path.join(directory, PROCESSED_CSV), index=False)
+    return add_arrow_copy(directory)
+
+def transform_recommendations(df):
+    """Clean a raw export and derive dates, locations, confidence and ROI scores.
+
+    Returns (df, notes): notes are (level, message) pairs for the UI,
+    level being 'info', 'warning' or 'success'.
+    """
+    notes = []
+
+    # Basic cleaning
+    df = df.replace(r'^\s*$', pd.NA, regex=True)
+
+    # Transform column names to lowercase with underscores
+    df.columns = (
+        df.columns.str.strip()
+                 .str.lower()
+                 .str.replace(' ', '_')
+                 .str.replace('-', '_')
+                 .str.replace('(', '_')
+                 .str.replace(')', '_')
+    )
+
+    # Drop empty columns
+    df = df.dropna(axis=1, how='all')
+
+    # Ensure key columns exist or create mappings
+    # Handle the file size column
+    if 'file_size_gb_' in df.columns:
+        df['file_size_(gb)'] = df['file_size_gb_']
+    elif 'file_size__gb_' in df.columns:
+        df['file_size_(gb)'] = df['file_size__gb_']
+
+    # Find file size column
+    file_size_col = [col for col in df.columns if 'size' in col and 'gb' in col]
+    if file_size_col:
+        df['file_size_(gb)'] = df[file_size_col[0]]
+
+    # Clean last_modified_on column
+    if 'last_modified_on' in df.columns:
+        df['last_modified_on'] = df['last_modified_on'].astype(str).str.strip().str.replace('"', '', regex=False)
+
+    # 📅 Enhanced Date Feature Engineering
+    today = pd.Timestamp(datetime.today().date())
+
+    # Date Created
+    date_created_col = [col for col in df.columns if 'date' in col and 'created' in col]
+    if date_created_col:
+        df['date_created'] = df[date_created_col[0]]
+
+    df['date_created_parsed'] = pd.to_datetime(df['date_created'], errors='coerce')
+    df['age_days'] = (today - df['date_created_parsed']).dt.days
+    df['created_year'] = df['date_created_parsed'].dt.year
+    df['created_month'] = df['date_created_parsed'].dt.month
+    df['created_day'] = df['date_created_parsed'].dt.day
+
+    # Last Modified
+    last_mod_col = [col for col in df.columns if 'last' in col and 'modified' in col]
+    if last_mod_col:
+        df['last_modified_on'] = df[last_mod_col[0]]
+
+    try:
+        df['last_modified_parsed'] = pd.to_datetime(df['last_modified_on'], errors='coerce')
+    except:
+        # Try different formats if the default doesn't work
+        formats_to_try = ['%d/%m/%Y', '%Y-%m-%d', '%m/%d/%Y']
+        for fmt in formats_to_try:
+            try:
+                df['last_modified_parsed'] = pd.to_datetime(df['last_modified_on'], format=fmt, errors='coerce')
+                if not df['last_modified_parsed'].isna().all():
+                    break
+            except:
+                continue
+
+    df['last_access_age_days'] = (today - df['last_modified_parsed']).dt.days
+    df['last_modified_year'] = df['last_modified_parsed'].dt.year
+    df['last_modified_month'] = df['last_modified_parsed'].dt.month
+    df['last_modified_day'] = df['last_modified_parsed'].dt.day
+
+    # Container cluster
+    container_col = [col for col in df.columns if 'container' in col and 'cluster' in col]
+    if container_col:
+        df['container_cluster'] = df[container_col[0]]
+        df['detach_days'] = df['container_cluster'].str.extract(r'(\d+)').astype(float)
+    else:
+        df['detach_days'] = 0
+
+    # Name column
+    name_col = [col for col in df.columns if col == 'name']
+    if name_col:
+        pass  # We already have a 'name' column
+    elif 'file_name' in df.columns:
+        df['name'] = df['file_name']
+    else:
+        # Use another column as name
+        text_cols = df.select_dtypes(include=['object']).columns
+        if len(text_cols) > 0:
+            df['name'] = df[text_cols[0]]
+
+    # LOCATION EXTRACTION - IMPROVED APPROACH
+    # 1. First, check if we already have the dedicated location columns from the CSV
+    if 'inferred_location' in df.columns and not df['inferred_location'].isna().all():
+        notes.append(('info', "Using existing location information from the file."))
+        # Already have inferred_location column
+        if 'inferred_type' in df.columns:
+            # Rename to match our expected column name
+            df['location_type'] = df['inferred_type']
+        elif 'location_type' not in df.columns:
+            # Create location_type from location confidence if available
+            if 'confidence_location' in df.columns:
+                # Higher confidence tends to be data centers
+                df['location_type'] = df['confidence_location'].apply(
+                    lambda x: 'Data Center' if pd.notna(x) and float(x) > 7 else 'Business Domain'
+                )
+            else:
+                # Default to 'Unknown' if we can't determine
+                df['location_type'] = 'Unknown'
+
+    # 2. If not present, try to infer from known location patterns
+    elif any(col for col in df.columns if 'location' in col.lower()):
+        # Look for any columns with 'location' in the name
+        location_cols = [col for col in df.columns if 'location' in col.lower()]
+        if location_cols:
+            notes.append(('info', f"Extracting location from column: {location_cols[0]}"))
+            df['inferred_location'] = df[location_cols[0]]
+
+            # Try to determine type from common patterns
+            # Data centers usually have 3-letter codes
+            data_centers = {'AUH', 'DXB', 'AJM'}
+            df['location_type'] = df['inferred_location'].apply(
+                lambda x: 'Data Center' if str(x).upper() in data_centers else 'Business Domain'
+            )
+
+    # 3. Last resort - extract from filename or file path
+    else:
+        notes.append(('info', "Extracting location information from filenames"))
+        df['location_info'] = df['name'].apply(extract_location_code)
+        df['inferred_location'] = df['location_info'].apply(lambda x: x[0])
+        df['location_type'] = df['location_info'].apply(lambda x: x[1])
+        if 'location_info' in df.columns:
+            df = df.drop('location_info', axis=1)
+
+        # If still no valid locations, try path extraction
+        if df['inferred_location'].isna().all() or df['inferred_location'].eq('None').all():
+            file_path_col = next((col for col in df.columns if 'path' in col.lower()), None)
+            if file_path_col:
+                notes.append(('info', f"Extracting location from file paths in column: {file_path_col}"))
+                # Extract locations from paths
+                df['location_info'] = df[file_path_col].apply(extract_location_from_path)
+                df['inferred_location'] = df['location_info'].apply(lambda x: x[0])
+                df['location_type'] = df['location_info'].apply(lambda x: x[1])
+                if 'location_info' in df.columns:
+                    df = df.drop('location_info', axis=1)
+
+    # Create a more descriptive location label
+    df['location_label'] = df.apply(
+        lambda row: f"{row['inferred_location']} ({row['location_type']})" 
+        if 'location_type' in df.columns and pd.notna(row['inferred_location']) and row['inferred_location'] is not None
+        else 'Unknown Location', 
+        axis=1
+    )
+
+    # If we still don't have valid locations, create artificial ones for visualization
+    if ('inferred_location' not in df.columns or 
+        df['inferred_location'].isna().all() or 
+        df['inferred_location'].eq('None').all()):
+
+        notes.append(('warning', "Could not detect location information. Creating artificial locations for visualization."))
+        # Create artificial locations (50% Data Centers, 50% Business Domains)
+        import numpy as np
+
+        # Generate random locations
+        locations = []
+        for i in range(len(df)):
+            if i % 2 == 0:  # Even rows
+                loc_type = 'Data Center'
+                loc_code = f"DC{(i % 3) + 1}"
+            else:  # Odd rows
+                loc_type = 'Business Domain'
+                loc_code = f"BD{(i % 3) + 1}"
+            locations.append((loc_code, loc_type))
+
+        df['inferred_location'] = [loc[0] for loc in locations]
+        df['location_type'] = [loc[1] for loc in locations]
+        df['location_label'] = df.apply(
+            lambda row: f"{row['inferred_location']} ({row['location_type']})", axis=1
+        )
+
+    # Confidence & ROI score
+    risk_col = [col for col in df.columns if col == 'risk']
+    if risk_col:
+        df['confidence_score'] = df['risk'].apply(
+            lambda x: 1.0 if isinstance(x, str) and 'accepted and executed immediately' in x.lower() else 0.5
+        )
+    elif 'confidence_type' in df.columns:
+        # Use existing confidence if available
+        df['confidence_score'] = df['confidence_type'] / 10  # Normalize if it's on a different scale
+    else:
+        df['confidence_score'] = 0.5  # Default value
+
+    # Calculate ROI score
+    df['roi_score'] = (
+        (df['file_size_(gb)'] * 2) +
+        (df['age_days'].fillna(0) / 365) +
+        (df['detach_days'].fillna(0) / 365) +
+        (df['confidence_score'] * 5)
+    )
+
+    # 📊 Monthly Aggregation Summary
+    df['roi_month'] = df['created_year'].astype(str) + '-' + df['created_month'].astype(str).str.zfill(2)
+
+    # Add information about extraction method
+    location_sources = []
+    if 'inferred_location' in df.columns and not df['inferred_location'].isna().all():
+        location_sources.append("columns")
+    if 'location_info' in df.columns:
+        location_sources.append("filename patterns")
+    if not location_sources:
+        location_sources.append("artificial generation")
+
+    notes.append(('success', f"✅ Location information extracted from: {', '.join(location_sources)}"))
+    return df, notes
+
+def compute_financial_metrics(df, settings):
+    """All financial calculations for a transformed frame; adds the cost and savings columns to `df`."""
+    # Base metrics using vectorized operations
+    metrics = {
+        'total_storage_gb': df['file_size_(gb)'].sum(),
+        'avg_storage_gb': df['file_size_(gb)'].mean(),
+        'total_actions': len(df)
+    }
+
+    # Storage costs (vectorized)
+    df['storage_cost_usd'] = df['file_size_(gb)'] * settings['cost_per_gb'] * settings['retention']
+    df['storage_cost_aed'] = df['storage_cost_usd'] * settings['conversion_rate']
+
+    # Energy and sustainability (vectorized)
+    total_energy_factor = settings['energy_kwh'] * (1 + settings['cooling'])
+    df['energy_savings'] = df['file_size_(gb)'] * settings['energy_kwh'] * settings['retention']
+    df['cooling_savings'] = df['file_size_(gb)'] * settings['energy_kwh'] * settings['cooling'] * settings['retention']
+    df['carbon_savings'] = df['file_size_(gb)'] * total_energy_factor * settings['co2_rate'] * settings['retention']
+
+    # Labor and automation (vectorized)
+    labor_hours_min = settings['min_minutes'] / 60
+    labor_hours_max = settings['max_minutes'] / 60
+    df['labor_hours'] = labor_hours_min
+    df['labor_cost_usd'] = (labor_hours_min * settings['min_rate_aed']) / settings['conversion_rate']
+
+    # Automation costs (vectorized)
+    turbo_cost = settings['turbo_unit_cost_usd'] * (settings['turbo_pct'] / 100)
+    aap_cost = settings['aap_unit_cost_usd'] * ((100 - settings['turbo_pct']) / 100)
+    df['automation_cost_usd'] = turbo_cost + aap_cost
+
+    # Net savings (vectorized)
+    df['net_savings_usd'] = df['storage_cost_usd'] + df['labor_cost_usd'] - df['automation_cost_usd']
+
+    # Monthly aggregation (single groupby operation)
+    monthly_metrics = df.groupby('roi_month').agg({
+        'storage_cost_usd': 'sum',
+        'storage_cost_aed': 'sum',
+        'energy_savings': 'sum',
+        'cooling_savings': 'sum',
+        'carbon_savings': 'sum',
+        'labor_cost_usd': 'sum',
+        'automation_cost_usd': 'sum',
+        'net_savings_usd': 'sum',
+        'file_size_(gb)': 'sum'
+    }).reset_index()
+
+    # Calculate totals
+    totals = {
+        'storage_savings_usd': df['storage_cost_usd'].sum(),
+        'storage_savings_aed': df['storage_cost_aed'].sum(),
+        'energy_savings_kwh': df['energy_savings'].sum(),
+        'cooling_savings_kwh': df['cooling_savings'].sum(),
+        'carbon_savings_kg': df['carbon_savings'].sum(),
+        'labor_savings_usd': df['labor_cost_usd'].sum(),
+        'automation_cost_usd': df['automation_cost_usd'].sum(),
+        'net_savings_usd': df['net_savings_usd'].sum()
+    }
+
+    return {
+        'metrics': metrics,
+        'monthly_metrics': monthly_metrics,
+        'totals': totals,
+        'processed_df': df
+    }
+
+def checkpoint_key(file_bytes, name, settings, owner):
+    """Identifies a job's inputs, so a retry of the same upload finds its checkpoint."""
+    digest = hashlib.sha256(file_bytes)
+    digest.update(json.dumps([CHECKPOINT_FORMAT, name, settings, owner], sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:24]
+
+def _prune_checkpoints(checkpoints_root):
+    cutoff = time.time() - CHECKPOINT_MAX_AGE
+    for entry in os.scandir(checkpoints_root):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def load_checkpoint(directory):
+    """(stage, result) of the latest completed stage; (None, None) if there is none."""
+    try:
+        checkpoint = pd.read_pickle(os.path.join(directory, CHECKPOINT_NAME))
+    except FileNotFoundError:
+        return None, None
+    return checkpoint['stage'], checkpoint['result']
+
+def save_checkpoint(directory, stage, result):
+    """Replace the checkpoint with a stage's result atomically; returns the stage."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        pd.to_pickle({'stage': stage, 'result': result}, tmp_path)
+        os.replace(tmp_path, os.path.join(directory, CHECKPOINT_NAME))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return stage
+
+def process_recommendations(file_bytes, name, settings, owner, root=DATASETS_ROOT,
+                            checkpoints_root=CHECKPOINTS_ROOT, history_path=HISTORY_PATH, source=None):
+    """Process an uploaded export end to end and publish it as a version of `owner`'s dataset `name`.
+
+    Runs in a worker process: the processed frame is written to the dataset
+    store rather than sent back, and only the small results are returned.
+    Each stage is checkpointed, and the checkpoint is removed once the
+    version is published. The run is then recorded in the run history.
+    The worker can't tell which datasets sessions are reading, so the dataset
+    quota is left to the server (see enforce_dataset_quota).
+    """
+    os.makedirs(checkpoints_root, exist_ok=True)
+    _prune_checkpoints(checkpoints_root)
+    checkpoint_dir = os.path.join(checkpoints_root, checkpoint_key(file_bytes, name, settings, owner))
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    stage, result = load_checkpoint(checkpoint_dir)
+    resumed = stage
+    if stage is None:
+        result = pd.read_excel(BytesIO(file_bytes))
+        stage = save_checkpoint(checkpoint_dir, 'parsed', result)
+    if stage == 'parsed':
+        result = transform_recommendations(result)
+        stage = save_checkpoint(checkpoint_dir, 'transformed', result)
+    if stage == 'transformed':
+        df, notes = result
+        result = (compute_financial_metrics(df, settings), notes)
+        stage = save_checkpoint(checkpoint_dir, 'computed', result)
+
+    results, notes = result
+    if resumed is not None:
+        notes = [('info', f"Resumed after {STAGES[resumed]}, saved by an earlier attempt.")] + notes
+    dataset, version = publish_dataset(owner, name, lambda directory: write_processed_files(results['processed_df'], directory),
+                                       root=root, quota_bytes=None)
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    try:
+        record_run(dataset, version, results['metrics'], results['totals'], results['monthly_metrics'],
+                   summarize_locations(results['processed_df']), settings=settings, source=source,
+                   path=history_path)
+    except Exception as e:
+        # The dataset is published either way
+        notes.append(('warning', f"This run could not be added to the run history: {e}"))
+    return {
+        'dataset': dataset,
+        'version': version,
+        'metrics': results['metrics'],
+        'monthly_metrics': results['monthly_metrics'],
+        'totals': results['totals'],
+        'notes': notes
+    }
+
+def extract_location_code(filename):
+    """
+    Extract location code from filename using specific patterns.
+    Returns tuple of (location_code, location_type)
+    """
+    # Common location patterns
+    data_centers = {'AUH', 'DXB', 'AJM'}
+    
+    if not filename or pd.isna(filename):
+        return None, 'Unknown'
+    
+    filename = str(filename).upper()
+    
+    # Try to find location code in the filename
+    # Pattern 1: Look for 3-letter codes that match our data centers
+    for dc in data_centers:
+        if dc in filename:
+            return dc, 'Data Center'
+    
+    # Pattern 2: Look for other business domain codes (3-4 uppercase letters)
+    match = re.search(r'[/_\\-]([A-Z]{3,4})[/_\\-]', f"_{filename}_")
+    if match:
+        code = match.group(1)
+        if code in data_centers:
+            return code, 'Data Center'
+        return code, 'Business Domain'
+    
+    # Pattern 3: Look for DC or BD followed by numbers
+    match = re.search(r'(DC|BD)[_\-]?(\d+)', filename)
+    if match:
+        prefix = match.group(1)
+        number = match.group(2)
+        if prefix == 'DC':
+            return f"DC{number}", 'Data Center'
+        return f"BD{number}", 'Business Domain'
+    
+    return None, 'Unknown'
+
+def extract_location_from_path(path):
+    """
+    Extract location information from file paths.
+    Returns tuple of (location_code, location_type)
+    """
+    if not path or pd.isna(path):
+        return None, 'Unknown'
+    
+    path = str(path).upper()
+    
+    # Common patterns in paths
+    # Pattern 1: /DCs/DC01/... or similar
+    
+    # Look for data center folder patterns
+    dc_match = re.search(r'[/\\](DC\d+|DATA\s*CENTER\s*\d+)[/\\]', path)
+    if dc_match:
+        return dc_match.group(1).replace(' ', ''), 'Data Center'
+    
+    # Look for business domain folder patterns
+    bd_match = re.search(r'[/\\](BD\d+|BUSINESS\s*DOMAIN\s*\d+|DEPT\s*\d+)[/\\]', path)
+    if bd_match:
+        return bd_match.group(1).replace(' ', ''), 'Business Domain'
+    
+    # Additional pattern: look for folder that might indicate location
+    loc_match = re.search(r'[/\\](AUH|DXB|AJM)[/\\]', path)
+    if loc_match:
+        return loc_match.group(1), 'Data Center'
+    
+    return None, 'Unknown'
+
+def infer_platform(x):
+    if 'win' in x:
+        return 'Windows'
+    elif '.vmx' in x or '.vmdk' in x:
+        return 'Linux'
+    elif 'veeam' in x:
+        return 'Veeam'
+    return 'Unknown'
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+import streamlit as st
+from views.processing import init_worker
+from views.worker_pool import SpawnPool
+
+# Processing jobs run in worker processes, so their CPU-heavy pandas work never
+# holds the server's GIL. By default one core is left free for page rendering;
+# the PROCESSING_WORKERS environment variable overrides the number of workers.
+DEFAULT_MAX_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+# Finished jobs nobody collected (e.g. the session closed) are forgotten beyond this many
+MAX_FINISHED_JOBS = 100
+
+class ProcessingQueue:
+    """Server-wide queue of processing jobs run by a bounded pool of worker processes.
+
+    Waiting jobs are queued per user, and the next job started is always the
+    oldest one of the user served least recently, so one user's batch of
+    uploads can't hold everyone else back. Only as many jobs
+    as there are workers are handed to the pool; the rest wait here, where their
+    order is decided, rather than first come, first served in the pool's own queue.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._jobs = {}                # job id -> job
+        self._waiting = {}             # user -> deque of job ids
+        self._served = {}              # user -> dispatch count when last served
+        self._dispatched = 0
+        self._running = 0
+        self._executor = None
+        # Reentrant: a job that completes at submission runs its callback in the submitting thread
+        self._lock = threading.RLock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = SpawnPool(max_workers=self.max_workers, initializer=init_worker)
+        return self._executor
+
+    def submit(self, user, label, fn, *args, **kwargs):
+        """Queue `fn(*args, **kwargs)` for `user`; returns the job id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                'id': job_id, 'user': user, 'label': label, 'status': 'queued',
+                'submitted': time.time(), 'started': None, 'finished': None,
+                'result': None, 'error': None, 'call': (fn, args, kwargs)
+            }
+            self._waiting.setdefault(user, deque()).append(job_id)
+            self._dispatch()
+        return job_id
+
+    def _dispatch(self):
+        # Called with the lock held
+        while self._running < self.max_workers and self._waiting:
+            user = self._next_user(self._waiting, self._served)
+            queue = self._waiting[user]
+            job = self._jobs[queue.popleft()]
+            if not queue:
+                del self._waiting[user]
+            self._dispatched += 1
+            self._served[user] = self._dispatched
+            fn, args, kwargs = job.pop('call')
+            job['status'], job['started'] = 'running', time.time()
+            self._running += 1
+            try:
+                future = self._submit(fn, args, kwargs)
+            except Exception as e:
+                # The job never reached a worker, so it gives its slot back here
+                self._running -= 1
+                job['error'], job['status'] = str(e) or type(e).__name__, 'failed'
+                job['finished'] = time.time()
+                continue
+            future.add_done_callback(lambda f, job_id=job['id']: self._finish(job_id, f))
+
+    def _submit(self, fn, args, kwargs):
+        try:
+            return self._get_executor().submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            # A worker died earlier; start a fresh pool
+            self._executor = None
+            return self._get_executor().submit(fn, *args, **kwargs)
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            self._running -= 1
+            job = self._jobs.get(job_id)
+            if job is not None:
+                try:
+                    job['result'], job['status'] = future.result(), 'done'
+                except Exception as e:
+                    job['error'], job['status'] = str(e) or type(e).__name__, 'failed'
+                    if isinstance(e, BrokenProcessPool):
+                        self._executor = None
+                job['finished'] = time.time()
+            self._forget_abandoned()
+            self._dispatch()
+
+    def _forget_abandoned(self):
+        finished = [job for job in self._jobs.values() if job['finished'] is not None]
+        for job in sorted(finished, key=lambda j: j['finished'])[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job['id']]
+
+    @staticmethod
+    def _next_user(waiting, served):
+        # Users never served come first; ties go to whoever started waiting first
+        return min(waiting, key=lambda user: served.get(user, 0))
+
+    def _dispatch_order(self):
+        # Waiting jobs in the order _dispatch will start them
+        waiting = {user: deque(queue) for user, queue in self._waiting.items()}
+        served = dict(self._served)
+        order = []
+        while waiting:
+            user = self._next_user(waiting, served)
+            order.append(waiting[user].popleft())
+            if not waiting[user]:
+                del waiting[user]
+            served[user] = self._dispatched + len(order)
+        return order
+
+    def status(self, job_id):
+        """A snapshot of the job with its 1-based queue position (0 once started); None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            order = self._dispatch_order()
+            snapshot = {k: v for k, v in job.items() if k != 'call'}
+            snapshot['position'] = order.index(job_id) + 1 if job_id in order else 0
+            return snapshot
+
+    def collect(self, job_id):
+        """Remove a finished job and return its final status; None if unknown or unfinished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['finished'] is None:
+                return None
+            return self._jobs.pop(job_id)
+
+    def cancel(self, job_id):
+        """Drop a job that hasn't started; returns whether it was cancelled."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != 'queued':
+                return False
+            queue = self._waiting[job['user']]
+            queue.remove(job_id)
+            if not queue:
+                del self._waiting[job['user']]
+            del self._jobs[job_id]
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'running': self._running,
+                'queued': sum(len(queue) for queue in self._waiting.values()),
+                'users_waiting': len(self._waiting)
+            }
+
+    def shutdown(self):
+        """Stop the worker pool (used by benchmarks and tests)."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+@st.cache_resource
+def get_processing_queue():
+    """Process-wide processing queue shared by all sessions."""
+    workers = int(os.environ.get('PROCESSING_WORKERS', DEFAULT_MAX_WORKERS))
+    return ProcessingQueue(max_workers=max(1, workers))
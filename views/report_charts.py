@@ -0,0 +1,231 @@
+# Business ROI report charts, drawn on independent Agg figures so they can be
+# rendered in worker processes. Streamlit is not imported to keep workers light.
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from views.worker_pool import SpawnPool
+
+LOCATION_TYPE_COLORS = {'Data Center': '#2ecc71', 'Business Domain': '#3498db', 'Unknown': '#95a5a6'}
+# Margins of the monthly charts, whose tick labels are all YYYY-MM; fixed instead of
+# tight_layout, which draws the figure an extra time to measure them
+MONTHLY_MARGINS = dict(left=0.08, right=0.98, top=0.92, bottom=0.18)
+
+# Rendered PNGs keyed by the content hash of their input data
+MAX_CACHED_IMAGES = 64
+_image_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def build_chart_specs(df: pd.DataFrame, summary_df: pd.DataFrame) -> dict:
+    """Extract the plain, picklable data each report chart needs."""
+    specs = {}
+
+    specs['savings_bar_chart'] = {
+        'kind': 'savings_bar',
+        'series': [
+            [loc_type,
+             summary_df.loc[summary_df['Location Type'] == loc_type, 'Location'].astype(str).tolist(),
+             summary_df.loc[summary_df['Location Type'] == loc_type, 'Estimated Cost Savings (USD)'].tolist()]
+            for loc_type in summary_df['Location Type'].unique()
+        ]
+    }
+
+    dc_data = summary_df[summary_df['Location Type'] == 'Data Center']
+    bd_data = summary_df[summary_df['Location Type'] == 'Business Domain']
+    specs['savings_pie_chart'] = {
+        'kind': 'savings_pies',
+        'dc': [dc_data['Location'].astype(str).tolist(), dc_data['Estimated Cost Savings (USD)'].tolist()],
+        'bd': [bd_data['Location'].astype(str).tolist(), bd_data['Estimated Cost Savings (USD)'].tolist()]
+    }
+
+    if 'created_date' in df.columns:
+        created_month = pd.to_datetime(df['created_date'], errors='coerce').dt.to_period('M').astype(str)
+        series = []
+        for loc_type in df['location_type'].unique():
+            trend = created_month[df['location_type'] == loc_type].groupby(created_month).size()
+            series.append([loc_type, trend.index.tolist(), trend.tolist()])
+        specs['recommendation_trend'] = {'kind': 'recommendation_trend', 'series': series}
+
+    return specs
+
+def build_location_chart_specs(location_df: pd.DataFrame) -> dict:
+    """Chart specs for a single location's showback report: monthly savings and recommendation trend."""
+    if 'roi_month' in location_df.columns:
+        month = location_df['roi_month'].astype(str)
+    elif 'created_date' in location_df.columns:
+        month = pd.to_datetime(location_df['created_date'], errors='coerce').dt.to_period('M').astype(str)
+    else:
+        return {}
+
+    monthly = location_df.groupby(month).agg(
+        savings=('storage_cost_usd', 'sum'),
+        count=('storage_cost_usd', 'size')
+    ).sort_index()
+    location_type = str(location_df['location_type'].iloc[0])
+    return {
+        'monthly_savings': {
+            'kind': 'monthly_savings',
+            'location_type': location_type,
+            'months': monthly.index.tolist(),
+            'values': monthly['savings'].tolist()
+        },
+        'recommendation_trend': {
+            'kind': 'recommendation_trend',
+            'series': [[location_type, monthly.index.tolist(), monthly['count'].tolist()]]
+        }
+    }
+
+def spec_hash(spec: dict) -> str:
+    """Content hash of a chart's input data."""
+    payload = json.dumps(spec, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+def render_chart_png(spec: dict) -> bytes:
+    """Render one chart spec to PNG bytes."""
+    renderer = _RENDERERS[spec['kind']]
+    fig = renderer(spec)
+    FigureCanvasAgg(fig)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+def render_charts(specs: dict, max_workers: int = None) -> dict:
+    """Render chart specs to PNG bytes, reusing cached images and rendering misses in parallel.
+
+    Returns a dict mapping chart name to PNG bytes.
+    """
+    images = {}
+    misses = {}
+    with _cache_lock:
+        for name, spec in specs.items():
+            key = spec_hash(spec)
+            if key in _image_cache:
+                _image_cache.move_to_end(key)
+                images[name] = _image_cache[key]
+            else:
+                misses[name] = (key, spec)
+
+    if not misses:
+        return images
+
+    if max_workers == 1 or len(misses) == 1:
+        rendered = {name: render_chart_png(spec) for name, (_, spec) in misses.items()}
+    else:
+        executor = get_executor(max_workers)
+        futures = {name: executor.submit(render_chart_png, spec) for name, (_, spec) in misses.items()}
+        rendered = {name: future.result() for name, future in futures.items()}
+
+    with _cache_lock:
+        for name, png in rendered.items():
+            _image_cache[misses[name][0]] = png
+            while len(_image_cache) > MAX_CACHED_IMAGES:
+                _image_cache.popitem(last=False)
+    images.update(rendered)
+    return images
+
+def clear_image_cache():
+    with _cache_lock:
+        _image_cache.clear()
+
+def shutdown_executor():
+    """Stop the shared worker pool (used by benchmarks and tests)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+def get_executor(max_workers=None):
+    """Process pool shared by chart and report rendering, created on first use.
+
+    Asking for a different `max_workers` replaces the pool; work already
+    submitted to the old one still completes.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None and max_workers and _executor._max_workers != max_workers:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            _executor = SpawnPool(max_workers=max_workers or min(4, os.cpu_count() or 1),
+                                  initializer=_init_worker)
+        return _executor
+
+def _init_worker():
+    matplotlib.use('Agg')
+
+def _savings_bar(spec):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.add_subplot()
+    for loc_type, locations, values in spec['series']:
+        ax.bar(locations, values, label=loc_type, color=LOCATION_TYPE_COLORS.get(loc_type))
+    ax.set_title("Estimated Cost Savings by Location")
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.legend(title="Location Type")
+    fig.tight_layout()
+    return fig
+
+def _savings_pies(spec):
+    fig = Figure(figsize=(15, 7))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Data Centers pie
+    labels, values = spec['dc']
+    if labels:
+        greens = matplotlib.colormaps['Greens']
+        ax1.pie(values, labels=labels, autopct="%1.1f%%",
+                colors=[greens(i) for i in np.linspace(0.4, 0.8, len(labels))])
+        ax1.set_title("Data Centers Share of Savings")
+
+    # Business Domains pie
+    labels, values = spec['bd']
+    if labels:
+        blues = matplotlib.colormaps['Blues']
+        ax2.pie(values, labels=labels, autopct="%1.1f%%",
+                colors=[blues(i) for i in np.linspace(0.4, 0.8, len(labels))])
+        ax2.set_title("Business Domains Share of Savings")
+
+    fig.tight_layout()
+    return fig
+
+def _recommendation_trend(spec):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.add_subplot()
+    for loc_type, months, counts in spec['series']:
+        ax.plot(months, counts, marker="o", label=loc_type, color=LOCATION_TYPE_COLORS.get(loc_type))
+    ax.set_title("Monthly Trend of Recommendations by Location Type")
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.legend(title="Location Type")
+    fig.subplots_adjust(**MONTHLY_MARGINS)
+    return fig
+
+def _monthly_savings(spec):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.add_subplot()
+    ax.bar(spec['months'], spec['values'], color=LOCATION_TYPE_COLORS.get(spec['location_type']))
+    ax.set_title("Estimated Cost Savings by Month")
+    ax.set_ylabel("USD")
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.subplots_adjust(**MONTHLY_MARGINS)
+    return fig
+
+_RENDERERS = {
+    'savings_bar': _savings_bar,
+    'savings_pies': _savings_pies,
+    'recommendation_trend': _recommendation_trend,
+    'monthly_savings': _monthly_savings,
+}
@@ -1,6 +1,129 @@
+import os
+import sqlite3
 import streamlit as st
-from views.helpers import load_processed_data
+from views.helpers import SELECTED_DATASET_KEY, datasets_in_use, load_processed_data, processed_version_file
+from views.dataset_index import recount_dataset
+from views.processing import PROCESSED_ARROW
+from views.sql_engine import (SQL_NAME, TABLE_NAME, DEFAULT_ROW_LIMIT, QUERY_TIMEOUT_SECONDS, EXPORT_TIMEOUT_SECONDS,
+                              ensure_sqlite, run_query, iter_query_chunks)
+from views.explorer_grid import sort_index, ordered_positions, render_pagination, page_frame
+from views.pdf_tables import format_number
+from views.filter_index import get_filter_index
+from views.search_index import get_search_index, rank_positions, NO_MATCH
+from views.top_n import RANK_COLUMNS, top_n_positions, get_group_rankings
+from views.exports import iter_chunks, render_export
 import pandas as pd
+import numpy as np
+
+# Columns shown in the grid, in display order
+DISPLAY_COLUMNS = [
+    'name', 'file_name', 'inferred_location', 'location_type', 'file_size_(gb)',
+    'storage_cost_usd', 'storage_cost_aed', 'carbon_savings',
+    'confidence_score', 'created_date'
+]
+
+COLUMN_NAMES = {
+    'name': 'File Name',
+    'file_name': 'Path',
+    'inferred_location': 'Location',
+    'location_type': 'Type',
+    'file_size_(gb)': 'Size',
+    'storage_cost_usd': 'Cost (USD)',
+    'storage_cost_aed': 'Cost (AED)',
+    'carbon_savings': 'Carbon Savings',
+    'confidence_score': 'Confidence',
+    'created_date': 'Created Date',
+    'roi_score': 'ROI Score',
+    'rank': 'Rank'
+}
+
+# Display formats applied by the grid at render time; the frame itself stays numeric
+COLUMN_CONFIG = {
+    'name': st.column_config.TextColumn(COLUMN_NAMES['name']),
+    'file_name': st.column_config.TextColumn(COLUMN_NAMES['file_name']),
+    'inferred_location': st.column_config.TextColumn(COLUMN_NAMES['inferred_location']),
+    'location_type': st.column_config.TextColumn(COLUMN_NAMES['location_type']),
+    'file_size_(gb)': st.column_config.NumberColumn(COLUMN_NAMES['file_size_(gb)'], format="%,.2f GB"),
+    'storage_cost_usd': st.column_config.NumberColumn(COLUMN_NAMES['storage_cost_usd'], format="$%,.2f"),
+    'storage_cost_aed': st.column_config.NumberColumn(COLUMN_NAMES['storage_cost_aed'], format="AED %,.2f"),
+    'carbon_savings': st.column_config.NumberColumn(COLUMN_NAMES['carbon_savings'], format="%,.2f kg"),
+    'confidence_score': st.column_config.NumberColumn(COLUMN_NAMES['confidence_score'], format="percent"),
+    'created_date': st.column_config.DateColumn(COLUMN_NAMES['created_date'], format="YYYY-MM-DD"),
+    'roi_score': st.column_config.NumberColumn(COLUMN_NAMES['roi_score'], format="%,.2f"),
+    'rank': st.column_config.NumberColumn(COLUMN_NAMES['rank'], format="%d")
+}
+
+# The same formats for the formatted CSV export, applied a column at a time
+EXPORT_FORMATS = {
+    'file_size_(gb)': {'decimals': 2, 'suffix': " GB"},
+    'storage_cost_usd': {'decimals': 2, 'prefix': "$"},
+    'storage_cost_aed': {'decimals': 2, 'prefix': "AED "},
+    'carbon_savings': {'decimals': 2, 'suffix': " kg"}
+}
+
+DEFAULT_SQL = f"""SELECT location_type, inferred_location, COUNT(*) AS actions,
+       SUM("file_size_(gb)") AS storage_gb, SUM(storage_cost_usd) AS cost_usd
+FROM {TABLE_NAME}
+GROUP BY location_type, inferred_location
+ORDER BY storage_gb DESC"""
+ROW_LIMITS = [100, DEFAULT_ROW_LIMIT, 10_000]
+
+def format_for_export(frame):
+    """Formatted copy of `frame` for the CSV export, using vectorized column formatting."""
+    display_df = frame.copy()
+    for col, fmt in EXPORT_FORMATS.items():
+        if col in display_df.columns:
+            display_df[col] = format_number(display_df[col].to_numpy(), **fmt)
+    if 'confidence_score' in display_df.columns:
+        display_df['confidence_score'] = format_number(display_df['confidence_score'].to_numpy() * 100, decimals=1, suffix="%")
+    if 'created_date' in display_df.columns:
+        days = pd.to_datetime(display_df['created_date'], errors='coerce').to_numpy().astype('datetime64[D]')
+        display_df['created_date'] = np.where(np.isnat(days), "", np.datetime_as_string(days))
+    display_df.columns = [COLUMN_NAMES.get(col, col) for col in display_df.columns]
+    return display_df
+
+def render_sql_query(columns):
+    """Read-only SQL over the dataset version, with timing, a row limit and a full export."""
+    sql_path = processed_version_file(SQL_NAME)
+    if sql_path is None:
+        return
+    st.caption(f"Read-only SQLite over the `{TABLE_NAME}` table. Queries stop after {QUERY_TIMEOUT_SECONDS}s "
+               f"(exports after {EXPORT_TIMEOUT_SECONDS}s); "
+               "quote names like \"file_size_(gb)\".")
+    st.caption("Columns: " + ", ".join(f"`{col}`" for col in columns))
+    sql = st.text_area("SQL", value=DEFAULT_SQL, height=140, key="explorer_sql", label_visibility="collapsed").strip()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        limit = st.selectbox("Row limit", ROW_LIMITS, index=ROW_LIMITS.index(DEFAULT_ROW_LIMIT), key="explorer_sql_limit")
+    with col2:
+        st.markdown("<div style='height: 1.7rem'></div>", unsafe_allow_html=True)
+        run_clicked = st.button("▶️ Run Query", key="explorer_sql_run", disabled=not sql)
+
+    if run_clicked:
+        st.session_state.pop('explorer_sql_result', None)
+        try:
+            if not os.path.exists(sql_path):
+                with st.spinner("Preparing this dataset version for SQL (first query only)..."):
+                    ensure_sqlite(sql_path, processed_version_file(PROCESSED_ARROW))
+                    # The copy is stored with the version, so it counts towards the dataset quota
+                    recount_dataset(st.session_state[SELECTED_DATASET_KEY], keep=datasets_in_use())
+            result = run_query(sql_path, sql, limit)
+            st.session_state['explorer_sql_result'] = {'request': (sql_path, sql, limit), **result}
+        except (sqlite3.Error, TimeoutError) as e:
+            st.error(f"Query failed: {str(e)}")
+
+    # The last result stays until another query runs or the session reads another version
+    result = st.session_state.get('explorer_sql_result')
+    if result is None or result['request'][0] != sql_path:
+        return
+    frame = result['frame']
+    more = f" · stopped at the {result['request'][2]:,}-row limit; the export has every row" if result['truncated'] else ""
+    st.caption(f"{len(frame):,} rows in {result['seconds'] * 1000:,.0f} ms{more}")
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+    query = result['request'][1]
+    render_export("explorer_sql", {
+        "Query result": ("query_result", lambda: iter_query_chunks(sql_path, query, timeout=EXPORT_TIMEOUT_SECONDS))
+    }, state=result['request'])
 
 def render():
     st.title("📋 ROI Explorer")
@@ -9,15 +132,26 @@ def render():
     if df is None:
         return
 
+    # Option lists and filter bitmaps come from indexes built once per dataset
+    index = get_filter_index(df)
+
     # Create two columns for the main layout
     main_col1, main_col2 = st.columns([1, 3])
 
     with main_col1:
         st.markdown("### 🔍 Filters")
+
+        # Substring search over file names and paths
+        st.markdown("#### Search")
+        search_query = st.text_input(
+            "Search name or path",
+            placeholder="Name or path contains...",
+            label_visibility="collapsed"
+        ).strip()
         
         # Location Type filter with custom styling
         st.markdown("#### Location Type")
-        location_type_options = ['All'] + sorted(df['location_type'].unique().tolist())
+        location_type_options = ['All'] + index.options('location_type')
         selected_type = st.selectbox(
             "Select location type",
             options=location_type_options,
@@ -26,7 +160,7 @@ def render():
 
         # Location filter with custom styling
         st.markdown("#### Location")
-        location_options = df["inferred_location"].dropna().unique().tolist()
+        location_options = index.options('inferred_location')
         selected_locations = st.multiselect(
             "Select locations",
             options=location_options,
@@ -35,123 +169,124 @@ def render():
         )
 
         # Date Range filter
-        if "created_date" in df.columns and not df["created_date"].isnull().all():
+        date_mask, date_range = None, None
+        date_bounds = index.date_bounds()
+        if date_bounds is not None:
             st.markdown("#### Date Range")
-            df["created_date"] = pd.to_datetime(df["created_date"], errors="coerce")
-            min_date = df["created_date"].min()
-            max_date = df["created_date"].max()
+            min_date, max_date = date_bounds
             date_range = st.date_input(
                 "Select date range",
                 [min_date, max_date],
                 label_visibility="collapsed"
             )
             if len(date_range) == 2:
-                start_date = pd.to_datetime(date_range[0])
-                end_date = pd.to_datetime(date_range[1])
-                df = df[(df["created_date"] >= start_date) & (df["created_date"] <= end_date)]
-
-        # Sorting options
-        st.markdown("#### Sort Options")
-        sort_col = st.selectbox(
-            "Sort by",
-            options=[col for col in df.columns if col not in ['location_type', 'inferred_location']],
-            label_visibility="collapsed"
-        )
-        sort_order = st.radio(
-            "Sort order",
-            options=["Descending", "Ascending"],
+                date_mask = index.date_mask(date_range[0], date_range[1])
+
+        # Either every matching row, or the top N by a ranking metric
+        st.markdown("#### View")
+        rank_options = [col for col in RANK_COLUMNS if col in df.columns]
+        view_mode = st.radio(
+            "View",
+            options=["All rows", "Top N"] if rank_options else ["All rows"],
             horizontal=True,
             label_visibility="collapsed"
         )
 
+        if view_mode == "Top N":
+            rank_col = st.selectbox("Rank by", options=rank_options, format_func=lambda col: COLUMN_NAMES.get(col, col))
+            top_n = int(st.number_input("Top N", min_value=1, max_value=1000, value=100, step=10))
+            top_scope = st.radio("Scope", options=["Per location", "Overall"], horizontal=True)
+            sort_col, ascending = None, False
+        else:
+            rank_col, top_n, top_scope = None, None, None
+
+            # Sorting options
+            st.markdown("#### Sort Options")
+            sort_col = st.selectbox(
+                "Sort by",
+                options=[col for col in df.columns if col not in ['location_type', 'inferred_location']],
+                label_visibility="collapsed"
+            )
+            sort_order = st.radio(
+                "Sort order",
+                options=["Descending", "Ascending"],
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+            ascending = sort_order == "Ascending"
+
     with main_col2:
-        # Apply filters
-        filtered_df = df.copy()
+        # Filters resolve to row bitmaps from the filter index; rows are only materialized for the visible page
+        mask = index.value_mask('inferred_location', selected_locations)
+        if date_mask is not None:
+            mask &= date_mask
         if selected_type != 'All':
-            filtered_df = filtered_df[filtered_df['location_type'] == selected_type]
-        filtered_df = filtered_df[filtered_df["inferred_location"].isin(selected_locations)]
-
-        # Sort the dataframe
-        filtered_df = filtered_df.sort_values(by=sort_col, ascending=(sort_order == "Ascending"))
-
-        # Optimize columns for display
-        display_columns = [
-            'name', 'inferred_location', 'location_type', 'file_size_(gb)',
-            'storage_cost_usd', 'storage_cost_aed', 'carbon_savings',
-            'confidence_score', 'created_date'
-        ]
-        display_columns = [col for col in display_columns if col in filtered_df.columns]
-        
-        # Prepare display DataFrame with formatted columns
-        display_df = filtered_df[display_columns].copy()
-        
-        # Format numeric columns
-        numeric_cols = display_df.select_dtypes(include=['float64', 'int64']).columns
-        for col in numeric_cols:
-            if 'cost' in col.lower() or 'savings' in col.lower():
-                display_df[col] = display_df[col].round(2).apply(lambda x: f"${x:,.2f}" if 'usd' in col.lower() else f"AED {x:,.2f}")
-            elif 'gb' in col.lower():
-                display_df[col] = display_df[col].round(2).apply(lambda x: f"{x:,.2f} GB")
-            elif 'score' in col.lower():
-                display_df[col] = display_df[col].apply(lambda x: f"{x*100:.1f}%")
+            type_mask = np.zeros(len(df), dtype=bool)
+            type_mask[index.value_positions('location_type', selected_type)] = True
+            mask &= type_mask
+
+        # The search index is built the first time a query is entered for this dataset
+        search_tiers = None
+        if search_query:
+            with st.spinner("Searching..."):
+                search_tiers = get_search_index(df).search(search_query)
+            mask &= search_tiers < NO_MATCH
+
+        ranks = None
+        if view_mode == "Top N":
+            # Partial selection: only the top rows are ever ordered, never the whole filtered set
+            if top_scope == "Per location":
+                positions, ranks = get_group_rankings(df).top_n(rank_col, mask, top_n)
             else:
-                display_df[col] = display_df[col].round(2)
-
-        # Format date columns
-        if 'created_date' in display_df.columns:
-            display_df['created_date'] = pd.to_datetime(display_df['created_date']).dt.strftime('%Y-%m-%d')
-
-        # Rename columns for better display
-        column_names = {
-            'name': 'File Name',
-            'inferred_location': 'Location',
-            'location_type': 'Type',
-            'file_size_(gb)': 'Size',
-            'storage_cost_usd': 'Cost (USD)',
-            'storage_cost_aed': 'Cost (AED)',
-            'carbon_savings': 'Carbon Savings',
-            'confidence_score': 'Confidence',
-            'created_date': 'Created Date'
-        }
-        display_df.columns = [column_names.get(col, col) for col in display_df.columns]
+                positions = top_n_positions(df[rank_col].to_numpy(dtype=float), mask, top_n)
+                ranks = np.arange(1, len(positions) + 1)
+        else:
+            # Sorting reuses a cached order of the whole dataset
+            positions = ordered_positions(mask, sort_index(df, sort_col, ascending))
+            if search_tiers is not None:
+                # Exact and prefix matches first, each tier still in the chosen sort order
+                positions = rank_positions(positions, search_tiers)
+        display_columns = [col for col in DISPLAY_COLUMNS if col in df.columns]
+        if rank_col is not None and rank_col not in display_columns:
+            display_columns.insert(1, rank_col)
 
         # Display summary metrics
         st.markdown("### 📊 Summary")
         metric_col1, metric_col2, metric_col3 = st.columns(3)
         with metric_col1:
-            st.metric("Total Records", f"{len(filtered_df):,}")
+            st.metric("Total Records", f"{len(positions):,}")
         with metric_col2:
-            st.metric("Total Size", f"{filtered_df['file_size_(gb)'].sum():,.2f} GB")
+            st.metric("Total Size", f"{df['file_size_(gb)'].to_numpy()[positions].sum():,.2f} GB")
         with metric_col3:
-            st.metric("Avg. Confidence", f"{(filtered_df['confidence_score'].mean() * 100):.1f}%")
+            st.metric("Avg. Confidence", f"{(np.nanmean(df['confidence_score'].to_numpy()[positions]) * 100 if len(positions) else 0):.1f}%")
 
         # Display the grid
         st.markdown("### 🧾 Filtered Recommendations")
+        grid_state = (search_query, selected_type, tuple(selected_locations), str(date_range), sort_col, ascending,
+                      rank_col, top_n, top_scope)
+        start, stop = render_pagination(len(positions), key="explorer", reset_on=grid_state)
+        page_df = page_frame(df, positions, start, stop, display_columns)
+        if 'created_date' in page_df.columns:
+            page_df['created_date'] = pd.to_datetime(page_df['created_date'], errors='coerce')
+        if ranks is not None:
+            page_df.insert(0, 'rank', ranks[start:stop])
         st.dataframe(
-            display_df,
+            page_df,
+            column_config=COLUMN_CONFIG,
             use_container_width=True,
             hide_index=True,
             height=400
         )
 
-        # Export options
+        # Export options: files are generated in chunks, only when requested
         st.markdown("### 📥 Export Options")
-        export_col1, export_col2 = st.columns(2)
-        
-        with export_col1:
-            csv = filtered_df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Download Raw Data (CSV)",
-                data=csv,
-                file_name="raw_recommendations.csv",
-                mime="text/csv"
-            )
-            
-        with export_col2:
-            formatted_csv = display_df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Download Formatted Data (CSV)",
-                data=formatted_csv,
-                file_name="formatted_recommendations.csv",
-                mime="text/csv"
-            )
+        st.caption(f"Exports all {len(positions):,} rows of the current view.")
+        render_export("explorer", {
+            "Raw data": ("raw_recommendations", lambda: iter_chunks(df, positions)),
+            "Formatted data": ("formatted_recommendations",
+                               lambda: iter_chunks(df, positions, display_columns, transform=format_for_export))
+        }, state=grid_state)
+
+        # Ad-hoc SQL for power users
+        with st.expander("🧮 SQL Query"):
+            render_sql_query(list(df.columns))
@@ -0,0 +1,327 @@
+# Business ROI showback PDF building blocks. Streamlit is not imported so the
+# batch generator can build per-location reports in worker processes.
+import copy
+import os
+import re
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+import pandas as pd
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+from PIL import Image
+
+from views import report_charts
+from views.pdf_tables import draw_table, format_table, top_n_with_other, totals_row
+
+FONT_REGULAR = "assets/NotoSans-Regular.ttf"
+FONT_BOLD = "assets/NotoSans-Bold.ttf"
+LOGO_PATH = "assets/logo.png"
+# 40 mm wide on the cover, roughly 250 dpi
+LOGO_MAX_PX = 400
+
+METHODOLOGY_TEXT = (
+    "This ROI report summarizes storage optimization recommendations generated by IBM Turbonomic.\n\n"
+    "Key Steps:\n"
+    "1. Source data was collected from Turbonomic's recommendation engine.\n"
+    "2. Recommendations were classified by location type (Data Centers and Business Domains).\n"
+    "3. Estimated cost savings were computed using:\n"
+    "   Cost Savings (USD) = File Size (GB) × Unit Cost (configured)\n\n"
+    "Carbon savings (kg CO2) were estimated using industry conversion factors for data center cooling impact.\n\n"
+    "This report includes summaries, breakdowns, visualizations, and total estimated business value."
+)
+
+# Summary table layout: column -> (header, width in mm, alignment)
+LOCATION_TABLE_LAYOUT = {
+    "Location": ("Location", 48, "L"),
+    "Location Type": ("Type", 30, "L"),
+    "Total Reclaimable Storage (GB)": ("Storage (GB)", 26, "R"),
+    "Estimated Cost Savings (USD)": ("Savings (USD)", 28, "R"),
+    "Estimated Cost Savings (AED)": ("Savings (AED)", 32, "R"),
+    "Carbon Offset (kg CO₂)": ("Carbon (kg CO2)", 26, "R")
+}
+LOCATION_TABLE_FORMATS = {
+    "Total Reclaimable Storage (GB)": {'decimals': 2},
+    "Estimated Cost Savings (USD)": {'decimals': 2, 'prefix': "$"},
+    "Estimated Cost Savings (AED)": {'decimals': 2, 'prefix': "AED "},
+    "Carbon Offset (kg CO₂)": {'decimals': 2}
+}
+# Rows shown per location type on the summary page before rolling up into "Other"
+SUMMARY_TOP_N = 10
+
+# Columns a per-location worker needs
+LOCATION_REPORT_COLUMNS = [
+    'inferred_location', 'location_type', 'file_size_(gb)', 'storage_cost_usd',
+    'storage_cost_aed', 'carbon_savings', 'roi_month', 'created_date'
+]
+
+def summarize_by_location(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-location showback summary with report column names."""
+    summary_df = df.groupby(['location_type', 'inferred_location'])[[
+        "file_size_(gb)",
+        "storage_cost_usd",
+        "storage_cost_aed",
+        "carbon_savings"
+    ]].sum().reset_index()
+
+    summary_df.columns = [
+        "Location Type",
+        "Location",
+        "Total Reclaimable Storage (GB)",
+        "Estimated Cost Savings (USD)",
+        "Estimated Cost Savings (AED)",
+        "Carbon Offset (kg CO₂)"
+    ]
+    return summary_df
+
+def summary_totals(df: pd.DataFrame, summary_df: pd.DataFrame) -> dict:
+    return {
+        'total_count': len(df),
+        'total_storage': summary_df['Total Reclaimable Storage (GB)'].sum(),
+        'total_savings_usd': summary_df['Estimated Cost Savings (USD)'].sum(),
+        'total_savings_aed': summary_df['Estimated Cost Savings (AED)'].sum(),
+        'total_carbon': summary_df['Carbon Offset (kg CO₂)'].sum()
+    }
+
+@lru_cache(maxsize=1)
+def load_static_assets() -> dict:
+    """Read static report assets once per process (each batch worker keeps its own copy).
+
+    The logo is downscaled to its printed size so FPDF does not recompress the
+    full-resolution image for every report.
+    """
+    logo = None
+    if os.path.exists(LOGO_PATH):
+        with Image.open(LOGO_PATH) as img:
+            img.thumbnail((LOGO_MAX_PX, LOGO_MAX_PX))
+            buffer = BytesIO()
+            img.save(buffer, format="PNG", optimize=True)
+            logo = buffer.getvalue()
+    return {'logo': logo}
+
+@lru_cache(maxsize=None)
+def _parsed_font(path: str, style: str) -> tuple:
+    """A report font parsed once per process (glyph widths and cmap), with its file bytes."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return TTFFont(FPDF(), path, f"noto{style}", style), data
+
+class ROIReportPDF(FPDF):
+    def __init__(self):
+        super().__init__()
+        self.add_cached_font(FONT_REGULAR, "")
+        self.add_cached_font(FONT_BOLD, "B")
+        self.set_font("Noto", "", 12)
+
+    def add_cached_font(self, path: str, style: str):
+        """Same as add_font("Noto", style, path), reusing the font parsed by this process.
+
+        Embedding subsets the font's tables in place, so each PDF gets a fresh
+        lazily read copy of them along with its own glyph subset.
+        """
+        template, data = _parsed_font(path, style)
+        font = copy.copy(template)
+        font.i = len(self.fonts) + 1
+        font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False, lazy=True)
+        font.subset = SubsetMap(font)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font._hbfont = None
+        self.fonts[font.fontkey] = font
+
+    def header(self): pass
+    def footer(self):
+        if self.page_no() == 1: return
+        self.set_y(-15)
+        self.set_font("Noto", "", 8)
+        self.set_text_color(100)
+        self.cell(0, 10, f"Generated by Automation Analytics Engine • Page {self.page_no()}", align="C")
+
+    def add_cover(self, subtitle: str = None):
+        assets = load_static_assets()
+        self.add_page()
+        self.set_font("Noto", "B", 20)
+        self.cell(0, 80, "📄 Business ROI Showback Report", ln=True, align="C")
+        if subtitle:
+            self.set_font("Noto", "B", 15)
+            self.cell(0, 12, subtitle, ln=True, align="C")
+        self.set_font("Noto", "", 13)
+        self.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d')}", ln=True, align="C")
+        self.cell(0, 10, "Prepared by: Automation Analytics Engine", ln=True, align="C")
+        if assets['logo'] is not None:
+            self.image(BytesIO(assets['logo']), x=90, w=40)
+
+    def add_methodology(self):
+        self.add_page()
+        self.set_font("Noto", "B", 14)
+        self.cell(0, 10, "📘 Methodology & Approach", ln=True)
+        self.ln(5)
+        self.set_font("Noto", "", 11)
+        self.multi_cell(0, 7, METHODOLOGY_TEXT)
+
+    def add_summary_metrics(self, summary_df: pd.DataFrame, totals: dict):
+        self.add_page()
+        self.set_font("Noto", "B", 14)
+        self.cell(0, 10, "📊 Summary Insights", ln=True)
+        self.ln(8)
+        self.set_font("Noto", "", 12)
+        self.cell(0, 10, f"📦 Total Recommendations: {totals['total_count']:,}", ln=True)
+        self.cell(0, 10, f"💾 Total Reclaimable Storage: {totals['total_storage']:,.2f} GB", ln=True)
+        self.cell(0, 10, f"💰 Total Estimated Savings: ${totals['total_savings_usd']:,.2f} USD / AED {totals['total_savings_aed']:,.2f}", ln=True)
+        self.cell(0, 10, f"🌿 Carbon Offset Potential: {totals['total_carbon']:,.2f} kg CO2", ln=True)
+        self.ln(8)
+
+        # Data Centers Summary
+        self.set_font("Noto", "B", 12)
+        self.cell(0, 10, "🏢 Data Centers Impact:", ln=True)
+        dc_summary = summary_df[summary_df['Location Type'] == 'Data Center']
+        self.add_location_table(top_n_with_other(dc_summary, "Estimated Cost Savings (USD)", SUMMARY_TOP_N, "Location"))
+
+        self.ln(5)
+        # Business Domains Summary
+        self.set_font("Noto", "B", 12)
+        self.cell(0, 10, "🏬 Top Business Domains by Savings:", ln=True)
+        bd_summary = summary_df[summary_df['Location Type'] == 'Business Domain']
+        self.add_location_table(top_n_with_other(bd_summary, "Estimated Cost Savings (USD)", SUMMARY_TOP_N, "Location"))
+
+    def add_location_appendix(self, summary_df: pd.DataFrame):
+        """Every location, sorted by savings, with a totals row; spans as many pages as needed."""
+        self.add_page()
+        self.set_font("Noto", "B", 14)
+        self.cell(0, 10, "🗂 Savings by Location", ln=True)
+        self.ln(3)
+        table = summary_df.sort_values("Estimated Cost Savings (USD)", ascending=False)
+        self.add_location_table(table, totals=totals_row(table, "Location"))
+
+    def add_location_table(self, table: pd.DataFrame, totals: pd.DataFrame = None):
+        columns = list(LOCATION_TABLE_LAYOUT)
+        formatted = format_table(table[columns], LOCATION_TABLE_FORMATS)
+        # Keep long location names inside their column
+        formatted["Location"] = formatted["Location"].str.slice(0, 28)
+        draw_table(
+            self,
+            formatted.set_axis([LOCATION_TABLE_LAYOUT[c][0] for c in columns], axis=1),
+            widths=[LOCATION_TABLE_LAYOUT[c][1] for c in columns],
+            aligns=[LOCATION_TABLE_LAYOUT[c][2] for c in columns],
+            totals=None if totals is None else format_table(totals[columns], LOCATION_TABLE_FORMATS)
+        )
+
+    def add_location_summary(self, totals: dict, context: dict):
+        self.add_page()
+        self.set_font("Noto", "B", 14)
+        self.cell(0, 10, f"📊 {context['location']} ({context['location_type']})", ln=True)
+        self.ln(8)
+        self.set_font("Noto", "", 12)
+        self.cell(0, 10, f"📦 Recommendations: {totals['total_count']:,}", ln=True)
+        self.cell(0, 10, f"💾 Reclaimable Storage: {totals['total_storage']:,.2f} GB", ln=True)
+        self.cell(0, 10, f"💰 Estimated Savings: ${totals['total_savings_usd']:,.2f} USD / AED {totals['total_savings_aed']:,.2f}", ln=True)
+        self.cell(0, 10, f"🌿 Carbon Offset Potential: {totals['total_carbon']:,.2f} kg CO2", ln=True)
+        self.ln(8)
+        self.cell(0, 10, f"Share of total estimated savings: {context['share']*100:.1f}%", ln=True)
+        self.cell(0, 10, f"Rank among {context['location_type']} locations: {context['rank']} of {context['peers']}", ln=True)
+
+    def add_visual(self, title: str, png: bytes):
+        self.add_page()
+        self.set_font("Noto", "B", 12)
+        self.cell(0, 10, title, ln=True)
+        self.image(BytesIO(png), x=10, w=self.w - 20)
+
+def generate_business_roi_pdf(df: pd.DataFrame, charts: dict = None) -> bytes:
+    """Build the Business ROI PDF in memory and return its bytes.
+
+    `charts` maps chart name to PNG bytes; they are rendered when not supplied.
+    """
+    # Summary with location types - using correct column names
+    summary_df = summarize_by_location(df)
+    totals = summary_totals(df, summary_df)
+
+    # Charts are rendered from plain data in worker processes and cached by content hash
+    if charts is None:
+        charts = report_charts.render_charts(report_charts.build_chart_specs(df, summary_df))
+
+    pdf = ROIReportPDF()
+    pdf.add_cover()
+    pdf.add_methodology()
+    pdf.add_summary_metrics(summary_df, totals)
+    pdf.add_visual("📊 Estimated Cost Savings by Location", charts["savings_bar_chart"])
+    pdf.add_visual("📈 Share of Total Savings by Location Type", charts["savings_pie_chart"])
+    if "recommendation_trend" in charts:
+        pdf.add_visual("📉 Monthly Trend of Recommendations", charts["recommendation_trend"])
+    pdf.add_location_appendix(summary_df)
+    return bytes(pdf.output())
+
+def location_report_filename(location) -> str:
+    return f"business_roi_{re.sub(r'[^A-Za-z0-9_-]+', '_', str(location)).strip('_') or 'unknown'}.pdf"
+
+def generate_location_report(task: tuple) -> tuple:
+    """Build one location's showback PDF. Runs inside a worker process.
+
+    `task` is (location_df, context) and the result is (filename, PDF bytes).
+    """
+    location_df, context = task
+    summary_df = summarize_by_location(location_df)
+    totals = summary_totals(location_df, summary_df)
+    specs = report_charts.build_location_chart_specs(location_df)
+
+    pdf = ROIReportPDF()
+    pdf.add_cover(subtitle=f"{context['location']} · {context['location_type']}")
+    pdf.add_methodology()
+    pdf.add_location_summary(totals, context)
+    if 'monthly_savings' in specs:
+        pdf.add_visual("📊 Estimated Cost Savings by Month", report_charts.render_chart_png(specs['monthly_savings']))
+    if 'recommendation_trend' in specs:
+        pdf.add_visual("📉 Monthly Trend of Recommendations", report_charts.render_chart_png(specs['recommendation_trend']))
+    return location_report_filename(context['location']), bytes(pdf.output())
+
+def location_report_tasks(df: pd.DataFrame) -> list:
+    """Split the dataset into one picklable task per location."""
+    columns = [c for c in LOCATION_REPORT_COLUMNS if c in df.columns]
+    summary_df = summarize_by_location(df)
+    savings = summary_df['Estimated Cost Savings (USD)']
+    total_savings = savings.sum()
+    ranks = savings.groupby(summary_df['Location Type']).rank(ascending=False, method='min').astype(int)
+    peers = summary_df.groupby('Location Type')['Location'].transform('size')
+
+    groups = dict(tuple(df[columns].groupby(['location_type', 'inferred_location'])))
+    tasks = []
+    for location_type, location, location_savings, rank, peer_count in zip(
+            summary_df['Location Type'], summary_df['Location'], savings, ranks, peers):
+        context = {
+            'location': location,
+            'location_type': location_type,
+            'share': location_savings / total_savings if total_savings else 0.0,
+            'rank': int(rank),
+            'peers': int(peer_count)
+        }
+        tasks.append((groups[(location_type, location)], context))
+    return tasks
+
+def generate_location_reports(df: pd.DataFrame, max_workers: int = None, progress=None) -> bytes:
+    """Build one showback PDF per location in worker processes and return them as a single ZIP.
+
+    `progress`, if given, is called with (done, total) as reports complete.
+    """
+    tasks = location_report_tasks(df)
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        if max_workers == 1 or len(tasks) <= 1:
+            results = map(generate_location_report, tasks)
+        else:
+            # Batch several locations per round trip to keep IPC overhead low
+            results = report_charts.get_executor(max_workers).map(
+                generate_location_report, tasks, chunksize=max(1, len(tasks) // 32))
+        used = set()
+        for done, (filename, pdf_bytes) in enumerate(results, start=1):
+            # Locations that sanitize to the same name get a numeric suffix
+            name, suffix = filename, 2
+            while name in used:
+                name = f"{filename[:-4]}_{suffix}.pdf"
+                suffix += 1
+            used.add(name)
+            zipf.writestr(name, pdf_bytes)
+            if progress is not None:
+                progress(done, len(tasks))
+    return zip_buffer.getvalue()
@@ -4,8 +4,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 from views.helpers import load_processed_data
+from views.figure_cache import cached_figure, render_cache_stats
 import json
 
+# Settings that feed calculate_metrics and therefore the summary charts
+METRIC_SETTINGS_KEYS = (
+    'cost_per_gb', 'implementation_months', 'min_minutes', 'min_rate_aed', 'conversion_rate',
+    'turbo_pct', 'turbo_unit_cost_usd', 'aap_unit_cost_usd', 'energy_kwh', 'cooling', 'co2_rate'
+)
+
 def render():
     # Custom title with consistent styling
     st.markdown('<div class="page-title">📊 ROI Summary</div>', unsafe_allow_html=True)
@@ -124,31 +131,26 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    # Check if data exists either in session state or in outputs directory
-    if 'processed_df' not in st.session_state:
-        df = load_processed_data()
-        if df is not None:
-            st.session_state['processed_df'] = df
-            st.success("✅ Loaded previously processed data from outputs directory.")
-        else:
-            st.warning("""
-            ⚠️ No data available for ROI Summary.
-            
-            To view the ROI Summary:
-            1. Go to the **Upload & Process** tab
-            2. Upload your Turbonomic Excel file
-            3. Process the data
-            4. Return to this tab
-            """)
-            # Navigation button to upload page
-            st.button("Go to Upload & Process", 
-                     type="primary", 
-                     key="go_to_upload", 
-                     on_click=navigate_to, 
-                     args=('upload_process',))
-            return
+    # The shared dataset from the registry; sessions keep a view, not a copy
+    df = load_processed_data()
+    if df is None:
+        st.warning("""
+        ⚠️ No data available for ROI Summary.
+        
+        To view the ROI Summary:
+        1. Go to the **Upload & Process** tab
+        2. Upload your Turbonomic Excel file
+        3. Process the data
+        4. Return to this tab
+        """)
+        # Navigation button to upload page
+        st.button("Go to Upload & Process", 
+                 type="primary", 
+                 key="go_to_upload", 
+                 on_click=navigate_to, 
+                 args=('upload_process',))
+        return
 
-    df = st.session_state['processed_df']
     settings = st.session_state.settings
 
     # Define color scheme
@@ -216,52 +218,62 @@ def render():
     
     with col1:
         # Financial Impact Breakdown with distinct colors
-        fig_financial = go.Figure(data=[
-            go.Bar(name='Storage Cost Reduction', y=[metrics['first_year_storage_savings']], marker_color='#27ae60'),  # Darker green
-            go.Bar(name='Labor Cost Avoidance', y=[metrics['first_year_labor_savings']], marker_color='#3498db'),  # Blue
-            go.Bar(name='Automation Investment', y=[-metrics['first_year_automation_cost']], marker_color='#e74c3c')  # Red
-        ])
-        fig_financial.update_layout(
-            title='Financial ROI Components',
-            barmode='relative',
-            showlegend=True,
-            height=400,
-            xaxis_title="ROI Component",
-            yaxis_title="Amount (USD)",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=20, r=20, t=40, b=20),
-            font=dict(color='#546E7A')
-        )
-        # Add hover template with currency formatting
-        fig_financial.update_traces(
-            hovertemplate='<b>%{y:$,.2f}</b><extra></extra>'
-        )
+        def build_financial_figure():
+            fig_financial = go.Figure(data=[
+                go.Bar(name='Storage Cost Reduction', y=[metrics['first_year_storage_savings']], marker_color='#27ae60'),  # Darker green
+                go.Bar(name='Labor Cost Avoidance', y=[metrics['first_year_labor_savings']], marker_color='#3498db'),  # Blue
+                go.Bar(name='Automation Investment', y=[-metrics['first_year_automation_cost']], marker_color='#e74c3c')  # Red
+            ])
+            fig_financial.update_layout(
+                title='Financial ROI Components',
+                barmode='relative',
+                showlegend=True,
+                height=400,
+                xaxis_title="ROI Component",
+                yaxis_title="Amount (USD)",
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                margin=dict(l=20, r=20, t=40, b=20),
+                font=dict(color='#546E7A')
+            )
+            # Add hover template with currency formatting
+            fig_financial.update_traces(
+                hovertemplate='<b>%{y:$,.2f}</b><extra></extra>'
+            )
+            return fig_financial
+
+        fig_financial = cached_figure(df, 'roi_summary.financial', build_financial_figure,
+                                      settings=settings, settings_keys=METRIC_SETTINGS_KEYS)
         st.plotly_chart(fig_financial, use_container_width=True)
     
     with col2:
         # Environmental Impact Breakdown with more distinct colors
-        fig_environmental = go.Figure(data=[
-            go.Bar(name='Direct Energy Savings', y=[metrics['first_year_energy_savings']], marker_color='#3498db'),  # Blue
-            go.Bar(name='Cooling Energy Reduction', y=[metrics['first_year_cooling_savings']], marker_color='#8e44ad'),  # Purple
-            go.Bar(name='Carbon Footprint Reduction', y=[metrics['first_year_carbon_savings']], marker_color='#16a085')  # Teal
-        ])
-        fig_environmental.update_layout(
-            title='Environmental Sustainability Metrics',
-            barmode='group',
-            showlegend=True,
-            height=400,
-            xaxis_title="Environment Component",
-            yaxis_title="Amount (kWh / kg CO₂)",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=20, r=20, t=40, b=20),
-            font=dict(color='#546E7A')
-        )
-        # Add hover template with appropriate units
-        fig_environmental.update_traces(
-            hovertemplate='<b>%{y:,.2f}</b><extra></extra>'
-        )
+        def build_environmental_figure():
+            fig_environmental = go.Figure(data=[
+                go.Bar(name='Direct Energy Savings', y=[metrics['first_year_energy_savings']], marker_color='#3498db'),  # Blue
+                go.Bar(name='Cooling Energy Reduction', y=[metrics['first_year_cooling_savings']], marker_color='#8e44ad'),  # Purple
+                go.Bar(name='Carbon Footprint Reduction', y=[metrics['first_year_carbon_savings']], marker_color='#16a085')  # Teal
+            ])
+            fig_environmental.update_layout(
+                title='Environmental Sustainability Metrics',
+                barmode='group',
+                showlegend=True,
+                height=400,
+                xaxis_title="Environment Component",
+                yaxis_title="Amount (kWh / kg CO₂)",
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                margin=dict(l=20, r=20, t=40, b=20),
+                font=dict(color='#546E7A')
+            )
+            # Add hover template with appropriate units
+            fig_environmental.update_traces(
+                hovertemplate='<b>%{y:,.2f}</b><extra></extra>'
+            )
+            return fig_environmental
+
+        fig_environmental = cached_figure(df, 'roi_summary.environmental', build_environmental_figure,
+                                          settings=settings, settings_keys=METRIC_SETTINGS_KEYS)
         st.plotly_chart(fig_environmental, use_container_width=True)
 
     # Implementation Notes in a consistent format
@@ -311,6 +323,8 @@ def render():
     # Close the summary container
     st.markdown("</div>", unsafe_allow_html=True)
 
+    render_cache_stats()
+
 # Callback function for navigation
 def navigate_to(page):
     st.session_state['current_view'] = page
@@ -0,0 +1,224 @@
+# History of every processing run in an SQLite file: each run's totals, monthly
+# metrics and per-location summary, appended when its dataset version is published.
+# Streamlit is not imported, so worker processes record their own runs.
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+HISTORY_PATH = 'outputs/run_history.sqlite'
+
+# totals / monthly_metrics keys -> column names
+TOTAL_COLUMNS = {
+    'storage_savings_usd': 'storage_savings_usd',
+    'storage_savings_aed': 'storage_savings_aed',
+    'energy_savings_kwh': 'energy_savings_kwh',
+    'cooling_savings_kwh': 'cooling_savings_kwh',
+    'carbon_savings_kg': 'carbon_savings_kg',
+    'labor_savings_usd': 'labor_savings_usd',
+    'automation_cost_usd': 'automation_cost_usd',
+    'net_savings_usd': 'net_savings_usd'
+}
+MONTHLY_COLUMNS = {
+    'file_size_(gb)': 'storage_gb',
+    'storage_cost_usd': 'storage_cost_usd',
+    'storage_cost_aed': 'storage_cost_aed',
+    'energy_savings': 'energy_savings_kwh',
+    'cooling_savings': 'cooling_savings_kwh',
+    'carbon_savings': 'carbon_savings_kg',
+    'labor_cost_usd': 'labor_cost_usd',
+    'automation_cost_usd': 'automation_cost_usd',
+    'net_savings_usd': 'net_savings_usd'
+}
+LOCATION_COLUMNS = {
+    'file_size_(gb)': 'storage_gb',
+    'storage_cost_usd': 'storage_cost_usd',
+    'storage_cost_aed': 'storage_cost_aed',
+    'carbon_savings': 'carbon_savings_kg',
+    'net_savings_usd': 'net_savings_usd'
+}
+
+def _real_columns(columns):
+    return ''.join(f",\n    {name} REAL" for name in columns.values())
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_at TEXT NOT NULL,
+    owner TEXT,
+    dataset_id TEXT,
+    dataset_name TEXT,
+    version INTEGER,
+    source TEXT,
+    settings TEXT,
+    total_actions INTEGER,
+    total_storage_gb REAL{_real_columns(TOTAL_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS runs_run_at ON runs (run_at);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs (dataset_id, run_at);
+CREATE TABLE IF NOT EXISTS run_months (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    roi_month TEXT{_real_columns(MONTHLY_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS run_months_run ON run_months (run_id);
+CREATE TABLE IF NOT EXISTS run_locations (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    location TEXT,
+    location_type TEXT,
+    actions INTEGER{_real_columns(LOCATION_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS run_locations_location ON run_locations (location, run_id);
+CREATE INDEX IF NOT EXISTS run_locations_run ON run_locations (run_id);
+"""
+
+# Calendar quarter of an ISO timestamp, e.g. 2025-Q3
+QUARTER_SQL = "substr(run_at, 1, 4) || '-Q' || ((CAST(substr(run_at, 6, 2) AS INTEGER) + 2) / 3)"
+
+# History files whose schema this process has already created
+_initialized = set()
+
+@contextmanager
+def connect(path=HISTORY_PATH):
+    """Connection to the history, created on first use; commits on success."""
+    with closing(sqlite3.connect(path, timeout=30)) as conn:
+        conn.execute('PRAGMA foreign_keys=ON')
+        if path not in _initialized:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # WAL lets the History view read while a worker appends a run
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            _initialized.add(path)
+        with conn:
+            yield conn
+
+def summarize_locations(df):
+    """Per-location actions and sums of a processed frame, with history column names."""
+    columns = [col for col in LOCATION_COLUMNS if col in df.columns]
+    grouped = df.groupby(['inferred_location', 'location_type'], dropna=False)
+    summary = grouped[columns].sum()
+    summary['actions'] = grouped.size()
+    summary = summary.reset_index().rename(columns={'inferred_location': 'location', **LOCATION_COLUMNS})
+    summary['location'] = summary['location'].astype(object).where(summary['location'].notna(), 'Unknown')
+    return summary
+
+def record_run(dataset, version, metrics, totals, monthly_metrics, locations, settings=None,
+               source=None, run_at=None, path=HISTORY_PATH):
+    """Append a run; returns its id. `locations` is a summarize_locations() frame."""
+    run = {
+        'run_at': run_at or datetime.now().isoformat(timespec='seconds'),
+        'owner': dataset['owner'],
+        'dataset_id': dataset['id'],
+        'dataset_name': dataset['name'],
+        'version': version['version'],
+        'source': source,
+        'settings': json.dumps(settings, sort_keys=True, default=str) if settings is not None else None,
+        'total_actions': int(metrics.get('total_actions', 0)),
+        'total_storage_gb': float(metrics.get('total_storage_gb', 0)),
+        **{column: float(totals.get(key, 0)) for key, column in TOTAL_COLUMNS.items()}
+    }
+    months = monthly_metrics.rename(columns=MONTHLY_COLUMNS)
+    month_columns = ['roi_month'] + [col for col in MONTHLY_COLUMNS.values() if col in months.columns]
+    location_columns = ['location', 'location_type', 'actions'] + [
+        col for col in LOCATION_COLUMNS.values() if col in locations.columns
+    ]
+
+    with connect(path) as conn:
+        run_id = conn.execute(
+            f"INSERT INTO runs ({', '.join(run)}) VALUES ({', '.join('?' * len(run))})", list(run.values())
+        ).lastrowid
+        conn.executemany(
+            f"INSERT INTO run_months (run_id, {', '.join(month_columns)}) VALUES (?{', ?' * len(month_columns)})",
+            ((run_id, *row) for row in months[month_columns].astype(object).itertuples(index=False))
+        )
+        conn.executemany(
+            f"INSERT INTO run_locations (run_id, {', '.join(location_columns)}) VALUES (?{', ?' * len(location_columns)})",
+            ((run_id, *row) for row in locations[location_columns].astype(object).itertuples(index=False))
+        )
+    return run_id
+
+def _dataset_filter(dataset_id, column='dataset_id'):
+    if dataset_id is None:
+        return '', []
+    return f"AND {column} = ?", [dataset_id]
+
+def list_runs(dataset_id=None, limit=500, path=HISTORY_PATH):
+    """Most recent runs first."""
+    where, params = _dataset_filter(dataset_id)
+    with connect(path) as conn:
+        return pd.read_sql_query(
+            f"SELECT * FROM runs WHERE 1 = 1 {where} ORDER BY run_at DESC, id DESC LIMIT ?",
+            conn, params=params + [limit]
+        )
+
+def list_datasets(path=HISTORY_PATH):
+    """Datasets with recorded runs: id, name, owner, number of runs."""
+    with connect(path) as conn:
+        return pd.read_sql_query(
+            "SELECT dataset_id, dataset_name, owner, COUNT(*) AS runs FROM runs "
+            "GROUP BY dataset_id ORDER BY MAX(run_at) DESC", conn
+        )
+
+def list_locations(dataset_id=None, path=HISTORY_PATH):
+    where, params = _dataset_filter(dataset_id, 'r.dataset_id')
+    with connect(path) as conn:
+        if dataset_id is None:
+            # Hop from one location to the next through the location index instead of scanning every row
+            rows = conn.execute("""
+                WITH RECURSIVE locations (location) AS (
+                    SELECT MIN(location) FROM run_locations
+                    UNION ALL
+                    SELECT (SELECT MIN(location) FROM run_locations WHERE location > locations.location)
+                    FROM locations WHERE location IS NOT NULL
+                )
+                SELECT location FROM locations WHERE location IS NOT NULL
+            """).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT DISTINCT l.location FROM runs r JOIN run_locations l ON l.run_id = r.id "
+                f"WHERE 1 = 1 {where} ORDER BY l.location", params
+            ).fetchall()
+    return [row[0] for row in rows]
+
+def quarterly_trend(dataset_id=None, path=HISTORY_PATH):
+    """Per quarter: runs, and totals of each dataset's latest run in the quarter.
+
+    Every run is a full snapshot of a dataset, so a quarter is summarized by
+    its last run per dataset rather than a sum over runs.
+    """
+    where, params = _dataset_filter(dataset_id)
+    with connect(path) as conn:
+        return pd.read_sql_query(f"""
+            WITH quarters AS (
+                SELECT *, {QUARTER_SQL} AS quarter FROM runs WHERE 1 = 1 {where}
+            ), ranked AS (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY quarter, dataset_id ORDER BY run_at DESC, id DESC) AS rank,
+                       COUNT(*) OVER (PARTITION BY quarter) AS runs
+                FROM quarters
+            )
+            SELECT quarter, MAX(runs) AS runs, COUNT(*) AS datasets,
+                   SUM(total_actions) AS total_actions, SUM(total_storage_gb) AS total_storage_gb,
+                   SUM(storage_savings_usd) AS storage_savings_usd, SUM(carbon_savings_kg) AS carbon_savings_kg,
+                   SUM(net_savings_usd) AS net_savings_usd
+            FROM ranked WHERE rank = 1 GROUP BY quarter ORDER BY quarter
+        """, conn, params=params)
+
+def location_trend(location, dataset_id=None, path=HISTORY_PATH):
+    """A location's totals in every run that includes it, oldest first."""
+    where, params = _dataset_filter(dataset_id, 'r.dataset_id')
+    sums = ', '.join(f"SUM(l.{col}) AS {col}" for col in ['actions', *LOCATION_COLUMNS.values()])
+    with connect(path) as conn:
+        return pd.read_sql_query(f"""
+            SELECT r.id AS run_id, r.run_at, r.dataset_name, r.version,
+                   GROUP_CONCAT(DISTINCT l.location_type) AS location_types, {sums}
+            FROM run_locations l JOIN runs r ON r.id = l.run_id
+            WHERE l.location = ? {where} GROUP BY r.id ORDER BY r.run_at, r.id
+        """, conn, params=[location] + params)
+
+def run_months(run_id, path=HISTORY_PATH):
+    with connect(path) as conn:
+        return pd.read_sql_query(
+            "SELECT * FROM run_months WHERE run_id = ? ORDER BY roi_month", conn, params=[run_id]
+        ).drop(columns='run_id')
@@ -0,0 +1,156 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import threading
+from collections import OrderedDict
+from views.helpers import dataset_fingerprint
+
+# Columns searched by the explorer search box; both are shown in its grid
+SEARCH_COLUMNS = ['name', 'file_name']
+
+# Relevance tiers; lower is better
+EXACT, PREFIX, SUBSTRING, NO_MATCH = 0, 1, 2, 3
+
+# Stop intersecting posting lists once this few candidates remain; they are verified directly
+CANDIDATE_CUTOFF = 2048
+BUILD_CHUNK = 200_000
+MAX_CACHED_QUERIES = 16
+
+class TrigramIndex:
+    """Trigram index over the distinct lower-cased values of one text column.
+
+    Each distinct value is a document. Postings are stored in one sorted
+    uint64 array of (trigram << 32 | document) keys, so a trigram's documents
+    are a contiguous, ascending slice found by binary search.
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values).astype(str).str.lower(), use_na_sentinel=True)
+        encoded = [value.encode('utf-8') for value in uniques]
+        self.codes = codes
+        # Fixed-width bytes: padded to the longest value, but an order of magnitude
+        # faster to gather and search than variable-width strings
+        self.docs = np.array(encoded, dtype=bytes) if encoded else np.empty(0, dtype='S1')
+        keys = self._build_postings(encoded)
+        self.trigrams = (keys >> np.uint64(32)).astype(np.uint32)
+        self.postings = (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    @staticmethod
+    def _build_postings(encoded):
+        parts = []
+        for start in range(0, len(encoded), BUILD_CHUNK):
+            chunk = encoded[start:start + BUILD_CHUNK]
+            lengths = np.fromiter((len(b) for b in chunk), dtype=np.int64, count=len(chunk))
+            buf = np.frombuffer(b'\0'.join(chunk) + b'\0\0\0', dtype=np.uint8).astype(np.uint64)
+            doc = np.repeat(np.arange(start, start + len(chunk), dtype=np.uint64), lengths + 1)
+            n = len(doc)
+
+            # A trigram starts at every byte whose next two bytes belong to the same value
+            valid = (buf[:n] != 0) & (buf[1:n + 1] != 0) & (buf[2:n + 2] != 0)
+            trigram = (buf[:n] << np.uint64(16)) | (buf[1:n + 1] << np.uint64(8)) | buf[2:n + 2]
+            keys = np.sort((trigram[valid] << np.uint64(32)) | doc[valid])
+            # Drop repeated trigrams within a value; sorting then comparing neighbours beats np.unique here
+            parts.append(keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys)
+        if not parts:
+            return np.empty(0, dtype=np.uint64)
+        keys = np.concatenate(parts)
+        del parts
+        keys.sort()
+        return keys
+
+    def _posting(self, trigram):
+        lo = np.searchsorted(self.trigrams, trigram, side='left')
+        hi = np.searchsorted(self.trigrams, trigram, side='right')
+        return self.postings[lo:hi]
+
+    def candidates(self, raw):
+        """Documents containing every trigram of the UTF-8 query `raw` (a superset of the true matches)."""
+        if len(raw) < 3:
+            return None
+        grams = np.unique([(raw[i] << 16) | (raw[i + 1] << 8) | raw[i + 2] for i in range(len(raw) - 2)])
+        # Intersect from the rarest trigram; an empty posting list sorts first and ends the loop
+        postings = sorted((self._posting(np.uint32(g)) for g in grams), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if len(result) <= CANDIDATE_CUTOFF:
+                break
+            present = np.zeros(len(self.docs), dtype=bool)
+            present[posting] = True
+            result = result[present[result]]
+        return result
+
+    def match_tiers(self, query):
+        """Relevance tier of every document for `query`: exact, prefix, substring or no match.
+
+        A prefix match starts the value or a path segment (right after '/').
+        """
+        raw = query.encode('utf-8')
+        tiers = np.full(len(self.docs) + 1, NO_MATCH, dtype=np.int8)
+        docs = self.candidates(raw)
+        if docs is None:
+            docs = np.arange(len(self.docs))
+        if len(docs) == 0:
+            return tiers
+        docs = docs.astype(np.int64)
+
+        values = self.docs[docs]
+        found = np.strings.find(values, raw)
+        hit = found >= 0
+        if not hit.all():
+            docs, values, found = docs[hit], values[hit], found[hit]
+
+        # Read the byte before each match straight from the fixed-width buffer
+        chars = values.view(np.uint8).reshape(len(values), values.itemsize)
+        before = chars[np.arange(len(values)), np.maximum(found - 1, 0)]
+        tier = np.where((found == 0) | (before == ord('/')), PREFIX, SUBSTRING)
+        tier[values == raw] = EXACT
+        tiers[docs] = tier
+        return tiers
+
+    def row_tiers(self, query):
+        """Relevance tier per row; rows with a missing value never match."""
+        # Missing values have code -1, which indexes the trailing NO_MATCH slot
+        return self.match_tiers(query)[self.codes]
+
+class SearchIndex:
+    """Substring search over several text columns, with a small cache of recent queries.
+
+    Indexes are shared by every session, so the cache is guarded by a lock.
+    """
+
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.indexes = {col: TrigramIndex(df[col]) for col in columns if col in df.columns}
+        self.n_rows = len(df)
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, query):
+        """Relevance tier per row across all searched columns (best tier wins)."""
+        query = query.strip().lower()
+        with self._lock:
+            if query in self._recent:
+                self._recent.move_to_end(query)
+                return self._recent[query]
+
+        tiers = np.full(self.n_rows, NO_MATCH, dtype=np.int8)
+        for index in self.indexes.values():
+            np.minimum(tiers, index.row_tiers(query), out=tiers)
+        tiers.setflags(write=False)
+
+        with self._lock:
+            self._recent[query] = tiers
+            while len(self._recent) > MAX_CACHED_QUERIES:
+                self._recent.popitem(last=False)
+        return tiers
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_search_index(fingerprint, _df):
+    return SearchIndex(_df)
+
+def get_search_index(df):
+    """Search index for a dataset, built on first use and kept per dataset fingerprint."""
+    return _build_search_index(dataset_fingerprint(df), df)
+
+def rank_positions(positions, tiers):
+    """Reorder `positions` by relevance tier, keeping their current order within a tier."""
+    return positions[np.argsort(tiers[positions], kind='stable')]
@@ -1,5 +1,6 @@
 import streamlit as st
 import json
+from views.dataset_registry import render_memory_usage
 
 def render():
     # Custom title with consistent styling
@@ -34,7 +35,8 @@ def render():
             'turbo_unit_cost_usd': 0.25,  # Cost per action
             'aap_unit_cost_usd': 0.15,    # Cost per action
             'forecast_growth_rate': 0.15,  # 15% growth in recommendations per month
-            'implementation_months': 6      # Number of months to implement all recommendations
+            'implementation_months': 6,     # Number of months to implement all recommendations
+            'chart_point_budget': 2000      # Max points sent to the browser per chart
         }
     else:
         # Ensure all required settings exist in session state
@@ -53,7 +55,8 @@ def render():
             'turbo_unit_cost_usd': 0.25,
             'aap_unit_cost_usd': 0.15,
             'forecast_growth_rate': 0.15,
-            'implementation_months': 6
+            'implementation_months': 6,
+            'chart_point_budget': 2000
         }
         
         # Add any missing settings
@@ -247,6 +250,10 @@ def render():
     # Close the summary container
     st.markdown("</div>", unsafe_allow_html=True)
 
+    # Datasets are shared by all sessions; show what they and this session hold
+    with st.expander("🧠 Memory Usage", expanded=False):
+        render_memory_usage()
+
 def render_cost_energy_settings():
     """Render the Cost & Energy settings section"""
     
@@ -458,4 +465,21 @@ def render_labor_automation_settings():
         )
         
         # Link retention period to implementation period
-        st.session_state.settings['retention'] = st.session_state.settings['implementation_months']
\ No newline at end of file
+        st.session_state.settings['retention'] = st.session_state.settings['implementation_months']
+
+    st.markdown("<hr>", unsafe_allow_html=True)
+
+    # Chart Rendering Section
+    st.markdown('<div class="group-title">Chart Rendering</div>', unsafe_allow_html=True)
+
+    help_text = "Maximum number of points sent to the browser per chart; larger series are binned or downsampled on the server"
+    st.markdown('<div class="input-info">Keeps charts responsive on very large datasets</div>', unsafe_allow_html=True)
+    st.session_state.settings['chart_point_budget'] = st.number_input(
+        '📉 Chart Point Budget',
+        value=st.session_state.settings['chart_point_budget'],
+        min_value=100,
+        max_value=50000,
+        step=100,
+        help=help_text,
+        key="chart_point_budget"
+    )
\ No newline at end of file
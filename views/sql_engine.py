@@ -0,0 +1,118 @@
+# SQLite copy of a processed dataset version for ad-hoc SQL. Versions never
+# change, so the copy is built once, on the first query, next to the version's
+# other files and then only queried read-only, through an authorizer that
+# refuses anything but reads.
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from views.arrow_store import read_arrow
+from views.versioned_store import store_lock
+
+SQL_NAME = 'processed_data.sqlite'
+TABLE_NAME = 'recommendations'
+# Columns most queries filter or group by
+INDEXED_COLUMNS = ['inferred_location', 'location_type', 'roi_month', 'created_date']
+WRITE_CHUNK_ROWS = 50_000
+FETCH_CHUNK_ROWS = 50_000
+DEFAULT_ROW_LIMIT = 1000
+# Queries running longer than this are interrupted; exports stream every row, so get longer
+QUERY_TIMEOUT_SECONDS = 30
+EXPORT_TIMEOUT_SECONDS = 120
+# Statements may only read: ATTACH, PRAGMA and every write are refused when prepared
+ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+def write_sqlite(df, path):
+    """Write `df` as the table of an SQLite file, replacing `path` atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            # A private file until it is renamed into place, so durability can wait for the rename
+            conn.execute('PRAGMA journal_mode=OFF')
+            conn.execute('PRAGMA synchronous=OFF')
+            df.to_sql(TABLE_NAME, conn, index=False, chunksize=WRITE_CHUNK_ROWS)
+            for col in INDEXED_COLUMNS:
+                if col in df.columns:
+                    conn.execute(f'CREATE INDEX "{TABLE_NAME}_{col}" ON {TABLE_NAME} ("{col}")')
+            conn.commit()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def ensure_sqlite(path, arrow_path):
+    """Build the SQLite copy from the version's Arrow file unless it exists; returns `path`."""
+    if not os.path.exists(path):
+        with store_lock(os.path.dirname(path)):
+            if not os.path.exists(path):
+                write_sqlite(read_arrow(arrow_path), path)
+    return path
+
+def _authorize(action, *_):
+    return sqlite3.SQLITE_OK if action in ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+def _connect(path, timeout):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute('PRAGMA query_only=ON')
+    conn.set_authorizer(_authorize)
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        # Returning true interrupts the running statement
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+    return conn
+
+def run_query(path, sql, limit=DEFAULT_ROW_LIMIT, timeout=QUERY_TIMEOUT_SECONDS):
+    """Run one read-only statement and fetch at most `limit` rows.
+
+    Returns {'frame', 'truncated', 'seconds'}; `truncated` is set when the
+    statement has more rows. Raises sqlite3.Error for invalid or
+    interrupted statements and TimeoutError past `timeout` seconds.
+    """
+    start = time.perf_counter()
+    with closing(_connect(path, timeout)) as conn:
+        try:
+            cursor = conn.execute(sql)
+            rows = cursor.fetchmany(limit + 1) if cursor.description else []
+        except sqlite3.OperationalError as e:
+            raise _interrupted(e, timeout) from e
+        columns = [col[0] for col in cursor.description or []]
+    return {
+        'frame': pd.DataFrame(rows[:limit], columns=columns),
+        'truncated': len(rows) > limit,
+        'seconds': time.perf_counter() - start
+    }
+
+def _interrupted(e, timeout):
+    return TimeoutError(f"Query stopped after {timeout}s") if str(e) == 'interrupted' else e
+
+def iter_query_chunks(path, sql, chunk_rows=FETCH_CHUNK_ROWS, timeout=EXPORT_TIMEOUT_SECONDS):
+    """Yield every row of a read-only statement a chunk at a time, e.g. for exports.
+
+    Rows stream from the engine, so only one chunk is in memory at a time;
+    an empty result still yields one empty chunk. Raises TimeoutError once
+    streaming takes longer than `timeout` seconds.
+    """
+    with closing(_connect(path, timeout)) as conn:
+        try:
+            cursor = conn.execute(sql)
+        except sqlite3.OperationalError as e:
+            raise _interrupted(e, timeout) from e
+        columns = [col[0] for col in cursor.description or []]
+        first = True
+        while True:
+            try:
+                rows = cursor.fetchmany(chunk_rows)
+            except sqlite3.OperationalError as e:
+                raise _interrupted(e, timeout) from e
+            if not rows and not first:
+                break
+            yield pd.DataFrame(rows, columns=columns)
+            first = False
+            if len(rows) < chunk_rows:
+                break
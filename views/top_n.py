@@ -0,0 +1,74 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from views.helpers import dataset_fingerprint
+
+# Metrics the explorer can rank by
+RANK_COLUMNS = ['roi_score', 'file_size_(gb)']
+
+def top_n_positions(values, mask, n):
+    """Positions of the `n` largest `values` among rows selected by `mask`, largest first.
+
+    Uses partial selection, so only the `n` winners are sorted. NaN values never rank.
+    """
+    candidates = np.flatnonzero(mask & ~np.isnan(values))
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-values[candidates], n - 1)[:n]]
+    # Largest first; ties keep row order
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+def _first_selected(ranked, mask, n):
+    """The first `n` entries of `ranked` selected by `mask`, scanning only as far as needed."""
+    chunk = max(4 * n, 1024)
+    found, count = [], 0
+    for start in range(0, len(ranked), chunk):
+        part = ranked[start:start + chunk]
+        part = part[mask[part]]
+        found.append(part)
+        count += len(part)
+        if count >= n:
+            break
+    return np.concatenate(found)[:n] if found else ranked[:0]
+
+class GroupRankings:
+    """Per-group rankings, largest first, for each rank column, computed once per dataset.
+
+    Each column keeps one array of row positions ordered by (group, value
+    descending), plus group boundaries, so the per-group top N under any filter
+    is a short scan from the start of each group's slice.
+    """
+
+    def __init__(self, df, group_column='inferred_location', columns=RANK_COLUMNS):
+        codes, groups = pd.factorize(df[group_column], sort=True)
+        self.groups = groups.tolist()
+        self.rankings = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+            # Rows without a group or a value are left out of the rankings
+            keep = np.flatnonzero((codes >= 0) & ~np.isnan(values))
+            order = keep[np.lexsort((-values[keep], codes[keep]))]
+            bounds = np.searchsorted(codes[order], np.arange(len(self.groups) + 1))
+            order.setflags(write=False)
+            self.rankings[col] = (order, bounds)
+
+    def top_n(self, column, mask, n):
+        """Top `n` rows per group among rows selected by `mask`.
+
+        Returns (positions, ranks): positions are grouped in group order and
+        ranks count from 1 within each group.
+        """
+        order, bounds = self.rankings[column]
+        parts = [_first_selected(order[bounds[i]:bounds[i + 1]], mask, n) for i in range(len(self.groups))] or [order[:0]]
+        positions = np.concatenate(parts)
+        ranks = np.concatenate([np.arange(1, len(part) + 1) for part in parts])
+        return positions, ranks
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _build_group_rankings(fingerprint, _df):
+    return GroupRankings(_df)
+
+def get_group_rankings(df):
+    """Per-location rankings for a dataset, built once per dataset fingerprint."""
+    return _build_group_rankings(dataset_fingerprint(df), df)
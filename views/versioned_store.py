@@ -0,0 +1,88 @@
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# A store directory holds immutable version directories plus a manifest:
+#   manifest.json   {"current": 3, "versions": [{"version": 3, "token": ..., "created": ..., ...}, ...]}
+#   v3/...          files of version 3
+# Versions are published by renaming a complete directory into place and then
+# atomically replacing the manifest, so readers only ever see complete versions.
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.lock'
+KEEP_VERSIONS = 5
+
+def _empty_manifest():
+    return {'current': None, 'versions': []}
+
+@contextmanager
+def store_lock(directory):
+    """Exclusive lock on a store, held across threads and processes while the manifest changes."""
+    with open(os.path.join(directory, LOCK_NAME), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def write_json_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def read_manifest(directory):
+    """The store's manifest; an empty one if nothing has been published yet."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return _empty_manifest()
+
+def get_version(directory, number=None):
+    """Manifest entry of version `number`, or of the current version; None if unavailable."""
+    manifest = read_manifest(directory)
+    number = manifest['current'] if number is None else number
+    return next((entry for entry in manifest['versions'] if entry['version'] == number), None)
+
+def version_file(directory, entry, name):
+    """Path of file `name` within a published version."""
+    return os.path.join(directory, f"v{entry['version']}", name)
+
+def version_key(entry):
+    """Cache key identifying a version's content: versions never change once published,
+    and the token tells apart versions with the same number from a recreated store."""
+    return f"v{entry['version']}-{entry['token']}"
+
+def publish(directory, write_files, **metadata):
+    """Publish a new version and make it current; returns its manifest entry.
+
+    `write_files(path)` writes the version's files into a private directory,
+    outside the lock, and may return extra metadata for the manifest entry;
+    only the rename and the manifest update are serialized.
+    Versions beyond the newest KEEP_VERSIONS are removed. Processes that still
+    have their files open or mapped keep reading them until they switch.
+    """
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=directory, prefix='.staging-')
+    try:
+        metadata.update(write_files(staging) or {})
+        with store_lock(directory):
+            manifest = read_manifest(directory)
+            number = max((entry['version'] for entry in manifest['versions']), default=0) + 1
+            os.rename(staging, os.path.join(directory, f"v{number}"))
+            entry = {'version': number, 'token': uuid.uuid4().hex[:8],
+                     'created': datetime.now().isoformat(timespec='seconds'), **metadata}
+            versions = [entry] + manifest['versions']
+            manifest = {'current': number, 'versions': versions[:KEEP_VERSIONS]}
+            write_json_atomic(os.path.join(directory, MANIFEST_NAME), manifest)
+            for old in versions[KEEP_VERSIONS:]:
+                shutil.rmtree(os.path.join(directory, f"v{old['version']}"), ignore_errors=True)
+        return entry
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
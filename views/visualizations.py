@@ -5,9 +5,18 @@ import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
 from views.helpers import load_processed_data, initialize_settings, calculate_financial_metrics
+from views.chart_data import bin_histogram, downsample_series, render_chart
+from views.figure_cache import cached_figure, render_cache_stats
 import json
 from plotly.subplots import make_subplots
 
+# Settings that feed calculate_financial_metrics (and the chart point budget for trend charts)
+FINANCIAL_SETTINGS_KEYS = (
+    'cost_per_gb', 'retention', 'conversion_rate', 'energy_kwh', 'cooling', 'co2_rate',
+    'min_minutes', 'max_minutes', 'min_rate_aed', 'turbo_pct', 'turbo_unit_cost_usd',
+    'aap_unit_cost_usd', 'chart_point_budget'
+)
+
 def render():
     # Custom title with consistent styling
     st.markdown('<div class="page-title">📊 Data Visualizations</div>', unsafe_allow_html=True)
@@ -177,28 +186,22 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    # Check if data exists either in session state or in outputs directory
-    if 'processed_df' not in st.session_state:
-        df = load_processed_data()
-        if df is not None:
-            st.session_state['processed_df'] = df
-            st.success("✅ Loaded previously processed data from outputs directory.")
-        else:
-            st.warning("""
-            ⚠️ No data available for visualizations.
-            
-            To view visualizations:
-            1. Go to the **Upload & Process** tab
-            2. Upload your Turbonomic Excel file
-            3. Process the data
-            4. Return to this tab
-            """)
-            # Navigation button to upload page
-            if st.button("Go to Upload & Process", type="primary"):
-                st.session_state['current_view'] = 'upload_process'
-            return
-
-    df = st.session_state['processed_df']
+    # The shared dataset from the registry; sessions keep a view, not a copy
+    df = load_processed_data()
+    if df is None:
+        st.warning("""
+        ⚠️ No data available for visualizations.
+        
+        To view visualizations:
+        1. Go to the **Upload & Process** tab
+        2. Upload your Turbonomic Excel file
+        3. Process the data
+        4. Return to this tab
+        """)
+        # Navigation button to upload page
+        if st.button("Go to Upload & Process", type="primary"):
+            st.session_state['current_view'] = 'upload_process'
+        return
     
     # Create default location_type and location_label if missing
     if 'location_type' not in df.columns:
@@ -332,6 +335,8 @@ def render():
     
     st.markdown("</div>", unsafe_allow_html=True)
 
+    render_cache_stats()
+
 def render_storage_analytics(df, metrics):
     try:
         # Storage Overview - First Row
@@ -372,111 +377,119 @@ def render_storage_analytics(df, metrics):
         
         with col1:
             # Create treemap data
-            root_data = pd.DataFrame({
-                'location_type': ['Total Storage'],
-                'inferred_location': ['Total Storage'],
-                'file_size_(gb)': [df['file_size_(gb)'].sum()],
-                'parent': [''],
-                'id': ['Total Storage'],
-                'label': ['Total Storage']
-            })
+            def build_treemap_figure():
+                root_data = pd.DataFrame({
+                    'location_type': ['Total Storage'],
+                    'inferred_location': ['Total Storage'],
+                    'file_size_(gb)': [df['file_size_(gb)'].sum()],
+                    'parent': [''],
+                    'id': ['Total Storage'],
+                    'label': ['Total Storage']
+                })
             
-            # Type level aggregation
-            type_data = df.groupby('location_type').agg({
-                'file_size_(gb)': 'sum'
-            }).reset_index()
-            type_data['inferred_location'] = type_data['location_type']
-            type_data['parent'] = 'Total Storage'
-            type_data['id'] = type_data['location_type']
-            type_data['label'] = type_data['location_type']
+                # Type level aggregation
+                type_data = df.groupby('location_type').agg({
+                    'file_size_(gb)': 'sum'
+                }).reset_index()
+                type_data['inferred_location'] = type_data['location_type']
+                type_data['parent'] = 'Total Storage'
+                type_data['id'] = type_data['location_type']
+                type_data['label'] = type_data['location_type']
             
-            # Location level
-            location_data = df.groupby(['location_type', 'inferred_location']).agg({
-                'file_size_(gb)': 'sum'
-            }).reset_index()
-            location_data['parent'] = location_data['location_type']
-            location_data['id'] = location_data['inferred_location']
-            location_data['label'] = location_data['inferred_location']
+                # Location level
+                location_data = df.groupby(['location_type', 'inferred_location']).agg({
+                    'file_size_(gb)': 'sum'
+                }).reset_index()
+                location_data['parent'] = location_data['location_type']
+                location_data['id'] = location_data['inferred_location']
+                location_data['label'] = location_data['inferred_location']
             
-            # Combine all levels
-            treemap_data = pd.concat([root_data, type_data, location_data])
+                # Combine all levels
+                treemap_data = pd.concat([root_data, type_data, location_data])
             
-            fig_treemap = px.treemap(
-                treemap_data,
-                path=['parent', 'id'],
-                values='file_size_(gb)',
-                title='Storage Distribution by Location Type',
-                color='file_size_(gb)',
-                color_continuous_scale='viridis',
-                hover_data=['label']
-            )
-            fig_treemap.update_traces(textinfo="label+value")
-            fig_treemap.update_layout(
-                height=400,
-                margin=dict(l=20, r=20, t=40, b=20),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig_treemap, use_container_width=True, key="storage_treemap")
+                fig_treemap = px.treemap(
+                    treemap_data,
+                    path=['parent', 'id'],
+                    values='file_size_(gb)',
+                    title='Storage Distribution by Location Type',
+                    color='file_size_(gb)',
+                    color_continuous_scale='viridis',
+                    hover_data=['label']
+                )
+                fig_treemap.update_traces(textinfo="label+value")
+                fig_treemap.update_layout(
+                    height=400,
+                    margin=dict(l=20, r=20, t=40, b=20),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                return fig_treemap
+
+            fig_treemap = cached_figure(df, 'visualizations.treemap', build_treemap_figure)
+            render_chart(fig_treemap, key="storage_treemap")
 
         with col2:
             # Create pie charts for DCs and Business Domains
-            fig_pie = make_subplots(
-                rows=1, cols=2,
-                subplot_titles=('Data Centers', 'Business Domains'),
-                specs=[[{"type": "pie"}, {"type": "pie"}]]
-            )
-            
-            # Data Centers pie
-            dc_data = df[df['location_type'] == 'Data Center'].groupby('inferred_location')['file_size_(gb)'].sum()
-            if not dc_data.empty:
-                fig_pie.add_trace(
-                    go.Pie(
-                        values=dc_data.values,
-                        labels=dc_data.index,
-                        name="Data Centers"
-                    ),
-                    row=1, col=1
-                )
-            else:
-                fig_pie.add_trace(
-                    go.Pie(
-                        values=[1],
-                        labels=["No Data Centers"],
-                        name="Data Centers"
-                    ),
-                    row=1, col=1
+            def build_storage_pies_figure():
+                fig_pie = make_subplots(
+                    rows=1, cols=2,
+                    subplot_titles=('Data Centers', 'Business Domains'),
+                    specs=[[{"type": "pie"}, {"type": "pie"}]]
                 )
             
-            # Business Domains pie
-            bd_data = df[df['location_type'] == 'Business Domain'].groupby('inferred_location')['file_size_(gb)'].sum()
-            if not bd_data.empty:
-                fig_pie.add_trace(
-                    go.Pie(
-                        values=bd_data.values,
-                        labels=bd_data.index,
-                        name="Business Domains"
-                    ),
-                    row=1, col=2
-                )
-            else:
-                fig_pie.add_trace(
-                    go.Pie(
-                        values=[1],
-                        labels=["No Business Domains"],
-                        name="Business Domains"
-                    ),
-                    row=1, col=2
-                )
+                # Data Centers pie
+                dc_data = df[df['location_type'] == 'Data Center'].groupby('inferred_location')['file_size_(gb)'].sum()
+                if not dc_data.empty:
+                    fig_pie.add_trace(
+                        go.Pie(
+                            values=dc_data.values,
+                            labels=dc_data.index,
+                            name="Data Centers"
+                        ),
+                        row=1, col=1
+                    )
+                else:
+                    fig_pie.add_trace(
+                        go.Pie(
+                            values=[1],
+                            labels=["No Data Centers"],
+                            name="Data Centers"
+                        ),
+                        row=1, col=1
+                    )
             
-            fig_pie.update_layout(
-                height=400,
-                title='Storage Distribution by Location Type',
-                margin=dict(l=20, r=20, t=40, b=20),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig_pie, use_container_width=True, key="storage_pie_charts")
+                # Business Domains pie
+                bd_data = df[df['location_type'] == 'Business Domain'].groupby('inferred_location')['file_size_(gb)'].sum()
+                if not bd_data.empty:
+                    fig_pie.add_trace(
+                        go.Pie(
+                            values=bd_data.values,
+                            labels=bd_data.index,
+                            name="Business Domains"
+                        ),
+                        row=1, col=2
+                    )
+                else:
+                    fig_pie.add_trace(
+                        go.Pie(
+                            values=[1],
+                            labels=["No Business Domains"],
+                            name="Business Domains"
+                        ),
+                        row=1, col=2
+                    )
+            
+                fig_pie.update_layout(
+                    height=400,
+                    title='Storage Distribution by Location Type',
+                    margin=dict(l=20, r=20, t=40, b=20),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                return fig_pie
+
+            fig_pie = cached_figure(df, 'visualizations.storage_pies', build_storage_pies_figure)
+            render_chart(fig_pie, key="storage_pie_charts")
         
         st.markdown('<hr>', unsafe_allow_html=True)
         
@@ -488,26 +501,31 @@ def render_storage_analytics(df, metrics):
         selected_type = st.selectbox('Filter by Location Type:', location_types)
         
         # Create month-year column if not exists
-        if 'created_year' in df.columns and 'created_month' in df.columns:
-            df['month_year'] = pd.to_datetime(df['created_year'].astype(str) + '-' + 
-                                            df['created_month'].astype(str).str.zfill(2) + '-01')
-        elif 'roi_month' in df.columns:
-            # Use roi_month as fallback
-            current_date = datetime.now()
-            df['month_year'] = pd.to_datetime(current_date.strftime('%Y-%m-01')) - pd.to_timedelta(df['roi_month'] * 30, unit='D')
-        else:
-            # Create dummy date if neither exists
-            df['month_year'] = pd.to_datetime('2024-01-01')
-        
-        if selected_type == 'All':
-            growth_data = df.groupby('month_year')['file_size_(gb)'].sum().reset_index()
-        else:
-            growth_data = df[df['location_type'] == selected_type].groupby('month_year')['file_size_(gb)'].sum().reset_index()
+        if 'month_year' not in df.columns:
+            if 'created_year' in df.columns and 'created_month' in df.columns:
+                df['month_year'] = pd.to_datetime(df['created_year'].astype(str) + '-' +
+                                                df['created_month'].astype(str).str.zfill(2) + '-01')
+            elif 'roi_month' in df.columns:
+                # Use roi_month as fallback
+                current_date = datetime.now()
+                df['month_year'] = pd.to_datetime(current_date.strftime('%Y-%m-01')) - pd.to_timedelta(df['roi_month'] * 30, unit='D')
+            else:
+                # Create dummy date if neither exists
+                df['month_year'] = pd.to_datetime('2024-01-01')
         
-        growth_data = growth_data.sort_values('month_year')
+        def build_growth_figure():
+            if selected_type == 'All':
+                growth_data = df.groupby('month_year')['file_size_(gb)'].sum().reset_index()
+            else:
+                growth_data = df[df['location_type'] == selected_type].groupby('month_year')['file_size_(gb)'].sum().reset_index()
         
-        # Check if we have at least two data points
-        if len(growth_data) >= 2:
+            growth_data = growth_data.sort_values('month_year')
+            growth_data = downsample_series(growth_data, 'month_year', 'file_size_(gb)')
+
+            # Check if we have at least two data points
+            if len(growth_data) < 2:
+                return None
+
             fig_growth = px.line(
                 growth_data,
                 x='month_year',
@@ -529,7 +547,13 @@ def render_storage_analytics(df, metrics):
                     tickvals=growth_data['month_year']
                 )
             )
-            st.plotly_chart(fig_growth, use_container_width=True, key="storage_growth_trend")
+            return fig_growth
+
+        fig_growth = cached_figure(df, 'visualizations.growth', build_growth_figure,
+                                   filters={'selected_type': selected_type},
+                                   settings=st.session_state.settings, settings_keys=('chart_point_budget',))
+        if fig_growth is not None:
+            render_chart(fig_growth, key="storage_growth_trend")
         else:
             st.info("Insufficient time-series data for growth trend visualization. At least two data points are required.")
         
@@ -573,23 +597,28 @@ def render_financial_insights(df, metrics):
         
         with col1:
             # Cost Components Breakdown
-            fig_costs = go.Figure(data=[
-                go.Bar(name='Storage Savings', y=[metrics['totals']['storage_savings_usd']], marker_color='#27ae60'),
-                go.Bar(name='Labor Savings', y=[metrics['totals']['labor_savings_usd']], marker_color='#3498db'),
-                go.Bar(name='Automation Costs', y=[-metrics['totals']['automation_cost_usd']], marker_color='#e74c3c')
-            ])
+            def build_cost_components_figure():
+                fig_costs = go.Figure(data=[
+                    go.Bar(name='Storage Savings', y=[metrics['totals']['storage_savings_usd']], marker_color='#27ae60'),
+                    go.Bar(name='Labor Savings', y=[metrics['totals']['labor_savings_usd']], marker_color='#3498db'),
+                    go.Bar(name='Automation Costs', y=[-metrics['totals']['automation_cost_usd']], marker_color='#e74c3c')
+                ])
             
-            fig_costs.update_layout(
-                title='Cost Components Analysis',
-                barmode='relative',
-                height=400,
-                showlegend=True,
-                yaxis_title='Amount (USD)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-            st.plotly_chart(fig_costs, use_container_width=True, key="financial_cost_components")
+                fig_costs.update_layout(
+                    title='Cost Components Analysis',
+                    barmode='relative',
+                    height=400,
+                    showlegend=True,
+                    yaxis_title='Amount (USD)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+                return fig_costs
+
+            fig_costs = cached_figure(df, 'visualizations.cost_components', build_cost_components_figure,
+                                      settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+            render_chart(fig_costs, key="financial_cost_components")
         
         with col2:
             # Location-based Savings
@@ -599,9 +628,12 @@ def render_financial_insights(df, metrics):
             elif 'net_savings_usd' not in df.columns:
                 df['net_savings_usd'] = metrics['metrics']['first_year_net_savings'] / len(df)
             
-            location_savings = df.groupby(['location_type', 'inferred_location'])['net_savings_usd'].sum().reset_index()
+            def build_location_savings_figure():
+                location_savings = df.groupby(['location_type', 'inferred_location'])['net_savings_usd'].sum().reset_index()
             
-            if not location_savings.empty:
+                if location_savings.empty:
+                    return None
+
                 fig_location = px.bar(
                     location_savings,
                     x='inferred_location',
@@ -625,7 +657,12 @@ def render_financial_insights(df, metrics):
                     paper_bgcolor='rgba(0,0,0,0)',
                     margin=dict(l=20, r=20, t=40, b=20)
                 )
-                st.plotly_chart(fig_location, use_container_width=True, key="financial_location_savings")
+                return fig_location
+
+            fig_location = cached_figure(df, 'visualizations.location_savings', build_location_savings_figure,
+                                         settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+            if fig_location is not None:
+                render_chart(fig_location, key="financial_location_savings")
             else:
                 st.info("No location-based savings data available.")
         
@@ -658,19 +695,26 @@ def render_financial_insights(df, metrics):
         if 'automation_cost_usd' not in df.columns:
             df['automation_cost_usd'] = metrics['metrics']['first_year_automation_cost'] / len(df)
         
-        monthly_metrics = df.groupby('month_year').agg({
-            'storage_cost_usd': 'sum',
-            'labor_cost_usd': 'sum',
-            'automation_cost_usd': 'sum'
-        }).reset_index()
-        
-        monthly_metrics['net_savings_usd'] = monthly_metrics['storage_cost_usd'] + monthly_metrics['labor_cost_usd'] - monthly_metrics['automation_cost_usd']
-        monthly_metrics = monthly_metrics.sort_values('month_year')
+        def build_financial_trends_figure():
+            monthly_metrics = df.groupby('month_year').agg({
+                'storage_cost_usd': 'sum',
+                'labor_cost_usd': 'sum',
+                'automation_cost_usd': 'sum'
+            }).reset_index()
         
-        # Check if we have at least two data points
-        if len(monthly_metrics) >= 2:
+            monthly_metrics['net_savings_usd'] = monthly_metrics['storage_cost_usd'] + monthly_metrics['labor_cost_usd'] - monthly_metrics['automation_cost_usd']
+            monthly_metrics = monthly_metrics.sort_values('month_year')
+            monthly_metrics = downsample_series(
+                monthly_metrics, 'month_year',
+                ['storage_cost_usd', 'labor_cost_usd', 'automation_cost_usd', 'net_savings_usd']
+            )
+
+            # Check if we have at least two data points
+            if len(monthly_metrics) < 2:
+                return None
+
             fig_trends = go.Figure()
-            
+
             # Add traces for different financial metrics
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
@@ -678,28 +722,28 @@ def render_financial_insights(df, metrics):
                 name='Storage Savings',
                 line=dict(color='#27ae60', width=2)
             ))
-            
+        
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
                 y=monthly_metrics['labor_cost_usd'],
                 name='Labor Savings',
                 line=dict(color='#3498db', width=2)
             ))
-            
+        
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
                 y=-monthly_metrics['automation_cost_usd'],
                 name='Automation Costs',
                 line=dict(color='#e74c3c', width=2)
             ))
-            
+        
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
                 y=monthly_metrics['net_savings_usd'],
                 name='Net Savings',
                 line=dict(color='#f1c40f', width=3)
             ))
-            
+        
             fig_trends.update_layout(
                 title='Monthly Financial Metrics',
                 height=400,
@@ -716,7 +760,12 @@ def render_financial_insights(df, metrics):
                     tickvals=monthly_metrics['month_year']
                 )
             )
-            st.plotly_chart(fig_trends, use_container_width=True, key="financial_monthly_trends")
+            return fig_trends
+
+        fig_trends = cached_figure(df, 'visualizations.financial_trends', build_financial_trends_figure,
+                                   settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+        if fig_trends is not None:
+            render_chart(fig_trends, key="financial_monthly_trends")
         else:
             st.info("Insufficient time-series data for financial trend visualization. At least two data points are required.")
         
@@ -780,31 +829,39 @@ def render_sustainability_metrics(df, metrics):
         
         with col1:
             # Energy Breakdown
-            fig_energy = go.Figure(data=[
-                go.Bar(name='Direct Energy', y=['Energy Savings'], x=[metrics['totals']['energy_savings_kwh']], 
-                      orientation='h', marker_color='#27ae60'),
-                go.Bar(name='Cooling Energy', y=['Energy Savings'], x=[metrics['totals']['cooling_savings_kwh']], 
-                      orientation='h', marker_color='#3498db')
-            ])
+            def build_energy_breakdown_figure():
+                fig_energy = go.Figure(data=[
+                    go.Bar(name='Direct Energy', y=['Energy Savings'], x=[metrics['totals']['energy_savings_kwh']], 
+                          orientation='h', marker_color='#27ae60'),
+                    go.Bar(name='Cooling Energy', y=['Energy Savings'], x=[metrics['totals']['cooling_savings_kwh']], 
+                          orientation='h', marker_color='#3498db')
+                ])
             
-            fig_energy.update_layout(
-                title='Energy Savings Breakdown',
-                barmode='stack',
-                height=400,
-                showlegend=True,
-                xaxis_title='Energy (kWh)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-            st.plotly_chart(fig_energy, use_container_width=True, key="sustainability_energy_breakdown")
+                fig_energy.update_layout(
+                    title='Energy Savings Breakdown',
+                    barmode='stack',
+                    height=400,
+                    showlegend=True,
+                    xaxis_title='Energy (kWh)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+                return fig_energy
+
+            fig_energy = cached_figure(df, 'visualizations.energy_breakdown', build_energy_breakdown_figure,
+                                       settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+            render_chart(fig_energy, key="sustainability_energy_breakdown")
         
         with col2:
             # Carbon Savings by Location
             if 'carbon_savings' in df.columns:
-                location_carbon = df.groupby(['location_type', 'inferred_location'])['carbon_savings'].sum().reset_index()
+                def build_carbon_location_figure():
+                    location_carbon = df.groupby(['location_type', 'inferred_location'])['carbon_savings'].sum().reset_index()
                 
-                if not location_carbon.empty:
+                    if location_carbon.empty:
+                        return None
+
                     fig_carbon = px.bar(
                         location_carbon,
                         x='inferred_location',
@@ -828,7 +885,12 @@ def render_sustainability_metrics(df, metrics):
                         paper_bgcolor='rgba(0,0,0,0)',
                         margin=dict(l=20, r=20, t=40, b=20)
                     )
-                    st.plotly_chart(fig_carbon, use_container_width=True, key="sustainability_carbon_location")
+                    return fig_carbon
+
+                fig_carbon = cached_figure(df, 'visualizations.carbon_location', build_carbon_location_figure,
+                                           settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+                if fig_carbon is not None:
+                    render_chart(fig_carbon, key="sustainability_carbon_location")
                 else:
                     st.info("No location-based carbon savings data available.")
             else:
@@ -850,18 +912,24 @@ def render_sustainability_metrics(df, metrics):
             else:
                 df['month_year'] = pd.to_datetime('2024-01-01')
         
-        monthly_metrics = df.groupby('month_year').agg({
-            'energy_savings': 'sum',
-            'cooling_savings': 'sum',
-            'carbon_savings': 'sum'
-        }).reset_index()
-        
-        monthly_metrics = monthly_metrics.sort_values('month_year')
+        def build_sustainability_trends_figure():
+            monthly_metrics = df.groupby('month_year').agg({
+                'energy_savings': 'sum',
+                'cooling_savings': 'sum',
+                'carbon_savings': 'sum'
+            }).reset_index()
         
-        # Check if we have at least two data points
-        if len(monthly_metrics) >= 2:
+            monthly_metrics = monthly_metrics.sort_values('month_year')
+            monthly_metrics = downsample_series(
+                monthly_metrics, 'month_year', ['energy_savings', 'cooling_savings', 'carbon_savings']
+            )
+
+            # Check if we have at least two data points
+            if len(monthly_metrics) < 2:
+                return None
+
             fig_trends = go.Figure()
-            
+
             # Add traces for energy and carbon
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
@@ -869,7 +937,7 @@ def render_sustainability_metrics(df, metrics):
                 name='Total Energy Saved (kWh)',
                 line=dict(color='#27ae60', width=2)
             ))
-            
+        
             fig_trends.add_trace(go.Scatter(
                 x=monthly_metrics['month_year'],
                 y=monthly_metrics['carbon_savings'],
@@ -877,7 +945,7 @@ def render_sustainability_metrics(df, metrics):
                 line=dict(color='#3498db', width=2),
                 yaxis='y2'
             ))
-            
+        
             fig_trends.update_layout(
                 title='Monthly Sustainability Trends',
                 height=400,
@@ -898,7 +966,12 @@ def render_sustainability_metrics(df, metrics):
                     tickvals=monthly_metrics['month_year']
                 )
             )
-            st.plotly_chart(fig_trends, use_container_width=True, key="sustainability_monthly_trends")
+            return fig_trends
+
+        fig_trends = cached_figure(df, 'visualizations.sustainability_trends', build_sustainability_trends_figure,
+                                   settings=st.session_state.settings, settings_keys=FINANCIAL_SETTINGS_KEYS)
+        if fig_trends is not None:
+            render_chart(fig_trends, key="sustainability_monthly_trends")
         else:
             st.info("Insufficient time-series data for sustainability trend visualization. At least two data points are required.")
         
@@ -952,45 +1025,56 @@ def render_operational_analysis(df, metrics):
                 df['risk'] = 'Low'  # Default low risk
                 
             # Risk Distribution
-            risk_dist = df['risk'].value_counts()
-            fig_risk = px.pie(
-                values=risk_dist.values,
-                names=risk_dist.index,
-                title='Action Distribution by Risk Level',
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_risk.update_layout(
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-            st.plotly_chart(fig_risk, use_container_width=True, key="operations_risk_pie")
+            def build_risk_pie_figure():
+                risk_dist = df['risk'].value_counts()
+                fig_risk = px.pie(
+                    values=risk_dist.values,
+                    names=risk_dist.index,
+                    title='Action Distribution by Risk Level',
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                fig_risk.update_layout(
+                    height=400,
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+                return fig_risk
+
+            fig_risk = cached_figure(df, 'visualizations.risk_pie', build_risk_pie_figure)
+            render_chart(fig_risk, key="operations_risk_pie")
         
         with col2:
-            # Confidence Score Distribution
-            fig_conf = px.histogram(
-                df,
-                x='confidence_score',
-                nbins=20,
-                title='Confidence Score Distribution',
-                color_discrete_sequence=['#3498db']
-            )
-            fig_conf.add_vline(
-                x=avg_confidence/100,
-                line_dash="dash",
-                line_color="red",
-                annotation_text="Mean"
-            )
-            fig_conf.update_layout(
-                height=400,
-                xaxis_title="Confidence Score",
-                yaxis_title="Count",
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=40, b=20)
-            )
-            st.plotly_chart(fig_conf, use_container_width=True, key="operations_confidence_histogram")
+            # Confidence Score Distribution - binned on the server so only bin counts are sent
+            def build_confidence_histogram_figure():
+                conf_bins = bin_histogram(df['confidence_score'], nbins=20)
+                fig_conf = go.Figure(go.Bar(
+                    x=conf_bins['bin_center'],
+                    y=conf_bins['count'],
+                    width=conf_bins['bin_end'] - conf_bins['bin_start'],
+                    customdata=conf_bins[['bin_start', 'bin_end']],
+                    hovertemplate='%{customdata[0]:.2f} – %{customdata[1]:.2f}<br>Count: %{y:,}<extra></extra>',
+                    marker_color='#3498db'
+                ))
+                fig_conf.update_layout(title='Confidence Score Distribution', bargap=0)
+                fig_conf.add_vline(
+                    x=avg_confidence/100,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text="Mean"
+                )
+                fig_conf.update_layout(
+                    height=400,
+                    xaxis_title="Confidence Score",
+                    yaxis_title="Count",
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    margin=dict(l=20, r=20, t=40, b=20)
+                )
+                return fig_conf
+
+            fig_conf = cached_figure(df, 'visualizations.confidence_histogram', build_confidence_histogram_figure)
+            render_chart(fig_conf, key="operations_confidence_histogram")
         
         st.markdown('<hr>', unsafe_allow_html=True)
         
@@ -1008,17 +1092,21 @@ def render_operational_analysis(df, metrics):
             else:
                 df['month_year'] = pd.to_datetime('2024-01-01')
         
-        monthly_actions = df.groupby('month_year').agg({
-            'risk': 'count',
-            'confidence_score': 'mean'
-        }).reset_index()
-        
-        monthly_actions = monthly_actions.sort_values('month_year')
+        def build_operations_trends_figure():
+            monthly_actions = df.groupby('month_year').agg({
+                'risk': 'count',
+                'confidence_score': 'mean'
+            }).reset_index()
         
-        # Check if we have at least two data points
-        if len(monthly_actions) >= 2:
+            monthly_actions = monthly_actions.sort_values('month_year')
+            monthly_actions = downsample_series(monthly_actions, 'month_year', ['risk', 'confidence_score'])
+
+            # Check if we have at least two data points
+            if len(monthly_actions) < 2:
+                return None
+
             fig_trends = go.Figure()
-            
+        
             # Add traces for actions and confidence
             fig_trends.add_trace(go.Bar(
                 x=monthly_actions['month_year'],
@@ -1026,7 +1114,7 @@ def render_operational_analysis(df, metrics):
                 name='Number of Actions',
                 marker_color='#3498db'
             ))
-            
+        
             fig_trends.add_trace(go.Scatter(
                 x=monthly_actions['month_year'],
                 y=monthly_actions['confidence_score'] * 100,
@@ -1034,7 +1122,7 @@ def render_operational_analysis(df, metrics):
                 line=dict(color='#e74c3c', width=2),
                 yaxis='y2'
             ))
-            
+        
             fig_trends.update_layout(
                 title='Monthly Actions and Confidence Trends',
                 height=400,
@@ -1056,7 +1144,12 @@ def render_operational_analysis(df, metrics):
                     tickvals=monthly_actions['month_year']
                 )
             )
-            st.plotly_chart(fig_trends, use_container_width=True, key="operations_monthly_trends")
+            return fig_trends
+
+        fig_trends = cached_figure(df, 'visualizations.operations_trends', build_operations_trends_figure,
+                                   settings=st.session_state.settings, settings_keys=('chart_point_budget',))
+        if fig_trends is not None:
+            render_chart(fig_trends, key="operations_monthly_trends")
         else:
             st.info("Insufficient time-series data for operational trend visualization. At least two data points are required.")
         
@@ -0,0 +1,52 @@
+# Process pools for CPU-heavy work started from Streamlit's script threads.
+# Streamlit is not imported, so worker processes stay light.
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import context, popen_spawn_posix, spawn
+
+# Keys of spawn's preparation data that make a new process re-run __main__
+MAIN_KEYS = ('init_main_from_name', 'init_main_from_path')
+# Set while this thread starts a SpawnPool worker
+_launching = threading.local()
+
+def _preparation_data(name, _original=spawn.get_preparation_data):
+    data = _original(name)
+    if getattr(_launching, 'worker', False):
+        for key in MAIN_KEYS:
+            data.pop(key, None)
+    return data
+
+# Installed once per process; other spawned processes get unchanged data
+if not getattr(spawn.get_preparation_data, '_skips_worker_main', False):
+    _preparation_data._skips_worker_main = True
+    spawn.get_preparation_data = _preparation_data
+
+class _WorkerPopen(popen_spawn_posix.Popen):
+    def _launch(self, process_obj):
+        _launching.worker = True
+        try:
+            super()._launch(process_obj)
+        finally:
+            _launching.worker = False
+
+class _WorkerProcess(context.SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        return _WorkerPopen(process_obj)
+
+class _WorkerContext(context.SpawnContext):
+    """Spawn context whose processes never import __main__.
+
+    Streamlit installs the running page script as __main__ (swapping it from
+    any session's thread), and spawn re-executes __main__ in every new process.
+    Workers only run functions of importable modules, so they skip it; the
+    shared __main__ module is never touched.
+    """
+    Process = _WorkerProcess
+
+class SpawnPool(ProcessPoolExecutor):
+    """Pool of spawned worker processes that never re-run the page script."""
+
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        super().__init__(max_workers=max_workers, mp_context=_WorkerContext(),
+                         initializer=initializer, initargs=initargs)